@@ -0,0 +1 @@
+"""Shared modules for Pixel Samurai Duel."""
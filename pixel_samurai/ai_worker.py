@@ -0,0 +1,136 @@
+"""Run AI decisions off the game loop.
+
+An ``AIWorker`` owns one agent built by ``factory()`` on a background thread
+(or process) and feeds it ``WorldState`` snapshots. The game submits a
+snapshot whenever the worker is free and polls for answers without blocking,
+so a slow decision never stretches a frame; the caller keeps playing its
+previous decision until a new one arrives.
+
+The agent only needs a ``decide(world)`` method, e.g. ``LookaheadPlanner``.
+
+Worker processes come from a forkserver (spawn where there is none), never
+a fork of the game: by the time a match starts the game runs several
+threads, and a fork taken while one of them holds a lock leaves the child
+waiting on it forever. The factory is pickled to the worker, so it has to be
+a module level callable or a ``functools.partial`` of one.
+"""
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+import traceback
+from collections import deque
+
+from .settings import FPS
+
+# A decision arriving later than this after its snapshot counts as a miss
+DECISION_DEADLINE = 3 / FPS
+
+MODES = ("off", "thread", "process")
+
+
+class LatencyStats:
+    """Rolling window of decision latencies in seconds plus a deadline miss counter."""
+
+    def __init__(self, window=240):
+        self.samples = deque(maxlen=window)
+        self.decisions = 0
+        self.misses = 0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.decisions += 1
+
+    def percentile(self, p):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def summary(self):
+        """Short text for the debug overlay."""
+        return (f"p50 {self.percentile(50) * 1000:.1f} ms  p95 {self.percentile(95) * 1000:.1f} ms  "
+                f"max {max(self.samples, default=0) * 1000:.1f} ms  misses {self.misses}")
+
+
+def _serve(factory, inbox, outbox):
+    # Worker loop: one snapshot in, one (tick, result, seconds) out, until a None arrives
+    agent = factory()
+    while True:
+        world = inbox.get()
+        if world is None:
+            break
+        started = time.perf_counter()
+        try:
+            result = agent.decide(world)
+        except Exception:
+            traceback.print_exc()
+            result = None
+        outbox.put((world.tick, result, time.perf_counter() - started))
+
+
+def _serve_process(factory, inbox, outbox):
+    # Ctrl+C reaches the whole process group, the game closes the worker itself; make sure SIGTERM still
+    # stops it so multiprocessing can end it at exit
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _serve(factory, inbox, outbox)
+
+
+class AIWorker:
+    def __init__(self, factory, mode="thread", deadline=DECISION_DEADLINE, name="AI"):
+        """``mode`` is "thread" or "process"."""
+        self.mode = mode
+        self.deadline = deadline
+        self.latency = LatencyStats()
+        self.pending = None  # perf_counter time the outstanding snapshot was submitted
+        self.missed = False
+
+        if mode == "process":
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                # The server imports the factory's module once instead of the game's main script, every worker
+                # forked from it starts with the agent code loaded
+                context.set_forkserver_preload([getattr(factory, "func", factory).__module__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            self.inbox = context.Queue()
+            self.outbox = context.Queue()
+            self.worker = context.Process(target=_serve_process, args=(factory, self.inbox, self.outbox),
+                                          name=f"{name} AI", daemon=True)
+        else:
+            self.inbox = queue.Queue()
+            self.outbox = queue.Queue()
+            self.worker = threading.Thread(target=_serve, args=(factory, self.inbox, self.outbox),
+                                           name=f"{name} AI", daemon=True)
+        self.worker.start()
+
+    @property
+    def busy(self):
+        return self.pending is not None
+
+    def submit(self, world):
+        """Hand a snapshot to the worker, ignored while it is still busy with the previous one."""
+        if self.pending is not None:
+            return False
+        self.pending = time.perf_counter()
+        self.missed = False
+        self.inbox.put(world)
+        return True
+
+    def poll(self):
+        """Result of the last snapshot if it is ready, else None."""
+        try:
+            tick, result, seconds = self.outbox.get_nowait()
+        except queue.Empty:
+            if self.pending is not None and not self.missed and time.perf_counter() - self.pending > self.deadline:
+                self.missed = True
+                self.latency.misses += 1
+            return None
+        self.latency.add(time.perf_counter() - self.pending)
+        self.pending = None
+        return result
+
+    def close(self):
+        self.inbox.put(None)
@@ -0,0 +1,192 @@
+"""Assets decoded on worker threads and converted on the main thread.
+
+``images``, ``image`` and ``sound`` only queue a job: a pool of threads reads
+the files, decodes and scales the PNGs and loads the sounds, generating
+placeholders first where the files are missing. Converting to the display
+format needs the display, so that is left to the main thread, which calls
+``poll`` once per frame with a time budget and converts a few surfaces per
+call while a loading screen draws ``progress``.
+
+Assets nobody needs at startup (e.g. character portraits) are queued when a
+screen first shows them and picked up with ``get``, which returns None until
+the worker is done::
+
+    loader.image("portrait", "assets/characters/red_samurai.png", optional=True)
+    portrait = loader.get("portrait")  # None for now, the surface a few frames later
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+WORKERS = 4
+SLICE = 0.004  # Seconds of conversion per poll, a quarter of a frame
+IMAGE_TYPES = (".png", ".jpg")
+
+
+def placeholder_image(size):
+    image = pygame.Surface(size, pygame.SRCALPHA)
+    image.fill((255, 0, 255, 100))
+    return image
+
+
+def image_names(folder):
+    """The image files in ``folder`` in name order, the order ``images`` loads them in."""
+    try:
+        return sorted(name for name in os.listdir(folder) if name.endswith(IMAGE_TYPES))
+    except OSError:
+        return []
+
+
+def _decode(path, size):
+    # SDL reads and decodes the file with the GIL released, so the workers really run side by side
+    image = pygame.image.load(path)
+    if size and image.get_size() != size:
+        image = pygame.transform.scale(image, size)
+    return image
+
+
+class AssetLoader:
+    def __init__(self, workers=WORKERS):
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="Asset loader")
+        self.jobs = {}  # key -> future of the decoded asset
+        self.assets = {}  # key -> asset ready for use
+        self._waiting = []  # Keys not yet handed to the main thread
+        self._converting = deque()  # (key, surfaces, next to convert)
+        self._placeholder_lock = threading.Lock()
+
+    @property
+    def progress(self):
+        """Share of the queued assets that are ready, decoding counts for half."""
+        if not self.jobs:
+            return 1.0
+        decoded = sum(future.done() for future in self.jobs.values())
+        return (decoded + len(self.assets)) / (2 * len(self.jobs))
+
+    @property
+    def finished(self):
+        return len(self.assets) == len(self.jobs)
+
+    def images(self, key, folder, size=None, placeholder=None):
+        """Queue every image in ``folder`` in name order, a list that is never empty.
+
+        ``placeholder()`` is called first when the folder has no images.
+        """
+        self._submit(key, self._load_images, folder, size, placeholder)
+
+    def image(self, key, path, size=None, placeholder=None, optional=False):
+        """Queue one image, None when ``optional`` and the file is missing."""
+        self._submit(key, self._load_image, path, size, placeholder, optional)
+
+    def sound(self, key, path, volume=1.0):
+        """Queue a sound, silent when it cannot be loaded."""
+        self._submit(key, self._load_sound, path, volume)
+
+    def _submit(self, key, job, *args):
+        # Asking again for a queued asset is free, screens can do it every frame
+        if key in self.jobs:
+            return
+        self.jobs[key] = self.pool.submit(job, *args)
+        self._waiting.append(key)
+
+    def _placeholder(self, missing, placeholder):
+        # Generate placeholders one at a time, a second job wanting the same files finds them written
+        if placeholder and missing():
+            with self._placeholder_lock:
+                if missing():
+                    placeholder()
+
+    def _load_images(self, folder, size, placeholder):
+        self._placeholder(lambda: not image_names(folder), placeholder)
+        images = []
+        for name in image_names(folder):
+            try:
+                images.append(_decode(os.path.join(folder, name), size))
+            except (pygame.error, OSError) as e:
+                print(f"Error loading {name}: {e}")
+        return images or [placeholder_image(size or (64, 64))]
+
+    def _load_image(self, path, size, placeholder, optional):
+        self._placeholder(lambda: not os.path.exists(path), placeholder)
+        try:
+            return _decode(path, size)
+        except (pygame.error, OSError):
+            return None if optional else pygame.Surface(size or (32, 32), pygame.SRCALPHA)
+
+    def _load_sound(self, path, volume):
+        try:
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, OSError, FileNotFoundError):
+            sound = pygame.mixer.Sound(buffer=bytearray(24))
+        sound.set_volume(volume)
+        return sound
+
+    def poll(self, budget=SLICE):
+        """Convert decoded images to the display format for up to ``budget`` seconds, main thread only."""
+        deadline = time.perf_counter() + budget
+        for key in [key for key in self._waiting if self.jobs[key].done()]:
+            self._waiting.remove(key)
+            self._converting.append([key, self.jobs[key].result(), 0])
+        while self._converting and time.perf_counter() < deadline:
+            item = self._converting[0]
+            key, asset, index = item
+            if isinstance(asset, list) and index < len(asset):
+                asset[index] = asset[index].convert_alpha()
+                item[2] += 1
+                continue
+            if isinstance(asset, pygame.Surface):
+                asset = asset.convert_alpha()
+            self.assets[key] = asset
+            self._converting.popleft()
+        return self.finished
+
+    def get(self, key, wait=False):
+        """The asset ready for use, None while it is still loading unless ``wait``."""
+        if key in self.assets:
+            return self.assets[key]
+        future = self.jobs[key]
+        if not wait and not future.done():
+            return None
+        # Needed right now: finish it here instead of waiting for its turn in poll
+        asset = future.result()
+        if key in self._waiting:
+            self._waiting.remove(key)
+        for item in self._converting:
+            if item[0] == key:
+                self._converting.remove(item)
+                break
+        if isinstance(asset, list):
+            asset = [image.convert_alpha() for image in asset]
+        elif isinstance(asset, pygame.Surface):
+            asset = asset.convert_alpha()
+        self.assets[key] = asset
+        return asset
+
+    def reload_images(self, key, folder, size=None, names=None):
+        """Decode images of a ready ``images`` asset again, on the calling thread, None while it is not ready.
+
+        Only ``names`` are decoded when given, otherwise the whole folder is. The list is changed in place, so
+        everything holding it shows the new images; a file that fails to decode keeps its old image.
+        """
+        images = self.assets.get(key)
+        if images is None:
+            return None
+        listing = image_names(folder)
+        if names is None or len(listing) != len(images):
+            # Files came or went, the whole folder is decoded again
+            names = listing
+            images[:] = [None] * len(listing)
+        for name in names:
+            try:
+                images[listing.index(name)] = _decode(os.path.join(folder, name), size).convert_alpha()
+            except (pygame.error, OSError, ValueError) as e:
+                print(f"Error loading {name}: {e}")
+        # A new file that failed to decode has no old image to keep
+        images[:] = [image for image in images if image is not None] or [placeholder_image(size or (64, 64))]
+        return images
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,48 @@
+"""Uniform grid broad phase for rect overlap tests.
+
+Items are bucketed by the grid cells their rect covers, so a query only
+looks at items in the same cells instead of testing against everything.
+Rebuild it once per frame with ``clear`` and ``insert``; ``query`` returns
+candidates, the caller still does the exact test (e.g. ``colliderect``).
+"""
+
+# A little larger than a fighter, so one usually spans at most four cells
+CELL_SIZE = 128
+
+
+class SpatialGrid:
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def _cells(self, rect):
+        size = self.cell_size
+        x0, y0 = rect.left // size, rect.top // size
+        x1, y1 = (rect.right - 1) // size, (rect.bottom - 1) // size
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield cx, cy
+
+    def insert(self, item, rect):
+        cells = self.cells
+        for cell in self._cells(rect):
+            bucket = cells.get(cell)
+            if bucket is None:
+                cells[cell] = [item]
+            else:
+                bucket.append(item)
+
+    def query(self, rect):
+        """Items sharing a cell with ``rect``, each once, in insertion order per cell."""
+        found = []
+        cells = self.cells
+        for cell in self._cells(rect):
+            bucket = cells.get(cell)
+            if bucket:
+                for item in bucket:
+                    if item not in found:
+                        found.append(item)
+        return found
@@ -0,0 +1,185 @@
+"""Highlight clips captured without stalling the game loop.
+
+``capture`` scales the frame into one of a few preallocated surfaces and
+hands it to a worker thread; when every surface is still waiting for the
+worker the frame is skipped instead of waiting. The worker compresses the
+pixels with zlib and
+
+* keeps the last ``replay_seconds`` of frames in memory for an instant
+  replay, within ``replay_bytes`` of RAM, which ``save_replay`` writes out;
+* while ``recording`` (``toggle_recording``), also appends every frame to
+  a clip file.
+
+Clips are ``.psc`` files: a header and the compressed frames as they are,
+so saving never encodes again. Turn one into a PNG sequence with::
+
+    python -m pixel_samurai.capture clips/clip.psc frames/
+"""
+import argparse
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+
+import pygame
+
+from .settings import FPS
+
+CAPTURE_EVERY = 2  # Capture every other frame, 30 clip frames per second
+CAPTURE_SCALE = 0.5
+SLOTS = 4  # Preallocated surfaces in flight between the game and the worker
+REPLAY_SECONDS = 30
+REPLAY_BYTES = 256 * 1024 * 1024
+COMPRESSION = 1  # zlib level, fast beats small here
+
+MAGIC = b"PSCL"
+_HEADER = struct.Struct("<4sHHH")  # magic, width, height, frames per second
+_FRAME = struct.Struct("<I")  # compressed length, the frame follows
+
+
+class ClipRecorder:
+    def __init__(self, canvas_size, folder="clips", replay_seconds=REPLAY_SECONDS, replay_bytes=REPLAY_BYTES,
+                 every=CAPTURE_EVERY, scale=CAPTURE_SCALE):
+        self.folder = folder
+        self.every = every
+        self.size = (int(canvas_size[0] * scale), int(canvas_size[1] * scale))
+        self.fps = FPS // every
+        self.replay_frames = replay_seconds * self.fps
+        self.replay_bytes = replay_bytes
+
+        self.slots = [pygame.Surface(self.size) for _ in range(SLOTS)]
+        self.free = deque(range(SLOTS))
+        self.frame = 0
+        self.skipped = 0  # Frames dropped because the worker was behind
+
+        self.replay = deque()  # Compressed frames of the instant replay
+        self.replay_size = 0
+        self.clip = None  # Open clip file while recording
+        self.clip_path = None
+
+        self.jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="Clip recorder", daemon=True)
+        self._worker.start()
+
+    @property
+    def recording(self):
+        return self.clip_path is not None
+
+    @property
+    def active(self):
+        return self.replay_frames > 0 or self.recording
+
+    def capture(self, surface):
+        """Queue a copy of ``surface`` (the logical canvas), never waits."""
+        self.frame += 1
+        if not self.active or self.frame % self.every:
+            return
+        try:
+            slot = self.free.popleft()
+        except IndexError:
+            self.skipped += 1
+            return
+        pygame.transform.scale(surface, self.size, self.slots[slot])
+        self.jobs.put(("frame", slot))
+
+    def toggle_recording(self):
+        """Start or stop writing every captured frame to a new clip, returns True while recording."""
+        if not self.recording:
+            self.clip_path = self._new_path("clip")
+            self.jobs.put(("record", self.clip_path))
+            return True
+        self.jobs.put(("record", None))
+        self.clip_path = None
+        return False
+
+    def save_replay(self):
+        """Write the instant replay to a new clip in the background, returns its path."""
+        path = self._new_path("replay")
+        self.jobs.put(("save", path))
+        return path
+
+    def close(self):
+        self.jobs.put(("record", None))
+        self.jobs.put(None)
+        self._worker.join()
+
+    def _new_path(self, kind):
+        os.makedirs(self.folder, exist_ok=True)
+        return os.path.join(self.folder, f"{time.strftime('%Y%m%d-%H%M%S')}-{kind}.psc")
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            kind, value = job
+            if kind == "frame":
+                pixels = pygame.image.tobytes(self.slots[value], "RGB")
+                self.free.append(value)
+                self._add(zlib.compress(pixels, COMPRESSION))
+            elif kind == "record":
+                if self.clip:
+                    self.clip.close()
+                self.clip = open_clip(value, self.size, self.fps) if value else None
+            elif kind == "save":
+                # Write a snapshot of the replay on its own thread, capturing goes on meanwhile
+                threading.Thread(target=write_clip, args=(value, self.size, self.fps, list(self.replay)),
+                                 name="Clip writer").start()
+
+    def _add(self, frame):
+        if self.clip:
+            self.clip.write(_FRAME.pack(len(frame)) + frame)
+        if not self.replay_frames:
+            return
+        self.replay.append(frame)
+        self.replay_size += len(frame)
+        while len(self.replay) > self.replay_frames or self.replay_size > self.replay_bytes:
+            self.replay_size -= len(self.replay.popleft())
+
+
+def open_clip(path, size, fps):
+    clip = open(path, "wb")
+    clip.write(_HEADER.pack(MAGIC, size[0], size[1], fps))
+    return clip
+
+
+def write_clip(path, size, fps, frames):
+    with open_clip(path, size, fps) as clip:
+        for frame in frames:
+            clip.write(_FRAME.pack(len(frame)) + frame)
+
+
+def read_clip(path):
+    """Size and frame rate of a clip, and a generator of its frames as Surfaces."""
+    file = open(path, "rb")
+    magic, width, height, fps = _HEADER.unpack(file.read(_HEADER.size))
+    if magic != MAGIC:
+        file.close()
+        raise ValueError(f"{path} is not a clip")
+
+    def frames():
+        with file:
+            while True:
+                header = file.read(_FRAME.size)
+                if len(header) < _FRAME.size:
+                    return
+                length, = _FRAME.unpack(header)
+                yield pygame.image.frombytes(zlib.decompress(file.read(length)), (width, height), "RGB")
+
+    return (width, height), fps, frames()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Write the frames of a clip as numbered PNG files')
+    parser.add_argument('clip', help='Clip file (.psc)')
+    parser.add_argument('out', help='Output folder')
+    args = parser.parse_args()
+    os.makedirs(args.out, exist_ok=True)
+    size, fps, frames = read_clip(args.clip)
+    count = 0
+    for count, frame in enumerate(frames, 1):
+        pygame.image.save(frame, os.path.join(args.out, f"frame_{count:05d}.png"))
+    print(f"{count} frames of {size[0]}x{size[1]} at {fps} FPS")
@@ -0,0 +1,57 @@
+"""Pixel-accurate collision from masks built once per animation frame.
+
+``animation_frames`` makes a ``HitFrame`` for every image of an animation in
+both facings and caches them with the animation, so nothing is built while
+playing. ``overlap`` rejects on the opaque bounding boxes first and only
+compares masks when those touch.
+"""
+import pygame
+
+# Alpha a pixel needs to count as solid, low enough for the translucent special shot glow
+MASK_THRESHOLD = 50
+
+
+class HitFrame:
+    """One image in one facing: the image, its mask and the box of its opaque pixels."""
+
+    def __init__(self, image):
+        self.image = image
+        self.mask = pygame.mask.from_surface(image, MASK_THRESHOLD)
+        rects = self.mask.get_bounding_rects()
+        # Relative to the image's top left, empty for a fully transparent image
+        self.bounds = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+
+    def box(self, topleft):
+        """Opaque bounds of the image drawn at ``topleft``."""
+        return self.bounds.move(topleft)
+
+
+_animations = {}
+
+
+def animation_frames(images):
+    """(facing right, facing left) HitFrames for every image, built on first use."""
+    entry = _animations.get(id(images))
+    if entry is None or entry[0] is not images:
+        frames = [(HitFrame(image), HitFrame(pygame.transform.flip(image, True, False))) for image in images]
+        # Keep the list alive with its frames, so its id cannot be reused by another animation
+        entry = _animations[id(images)] = (images, frames)
+    return entry[1]
+
+
+def forget_animation(images):
+    """Drop the frames built for ``images``, after its images changed in place."""
+    _animations.pop(id(images), None)
+
+
+def cached_images():
+    """Every image the animation cache holds, both facings, for memory accounting."""
+    return [frame.image for images, frames in _animations.values() for pair in frames for frame in pair]
+
+
+def overlap(frame_a, topleft_a, frame_b, topleft_b):
+    """Do two frames drawn at these positions share a solid pixel?"""
+    if not frame_a.box(topleft_a).colliderect(frame_b.box(topleft_b)):
+        return False
+    offset = (topleft_b[0] - topleft_a[0], topleft_b[1] - topleft_a[1])
+    return frame_a.mask.overlap(frame_b.mask, offset) is not None
@@ -0,0 +1,87 @@
+"""Short visual effects (flashes, explosions, shield sparks) from a fixed pool.
+
+Each kind of effect is registered once with its images and animation speed
+and turned into a frame table: the image to show on every tick of its life,
+so playing one back is an integer step instead of float index math. The
+pool preallocates its slots; spawning takes a free slot, and a finished
+effect gives its slot back instead of being killed and collected. When all
+slots are busy the oldest effect is cut short for the new one, so a long
+exchange of blows allocates nothing here.
+"""
+from .render_queue import EFFECTS
+
+POOL_SIZE = 64
+
+
+def frame_table(images, animation_speed):
+    """The image for every tick: tick t shows images[int(t * animation_speed)]."""
+    table = []
+    tick = 0
+    while tick * animation_speed < len(images):
+        table.append(images[int(tick * animation_speed)])
+        tick += 1
+    return tuple(table)
+
+
+class EffectSlot:
+    __slots__ = ("frames", "tick", "image", "position")
+
+    def __init__(self):
+        self.frames = ()
+        self.tick = 0
+        self.image = None
+        self.position = (0, 0)  # Top left
+
+
+class EffectPool:
+    def __init__(self, size=POOL_SIZE):
+        self.slots = [EffectSlot() for _ in range(size)]
+        self.free = list(self.slots)
+        self.active = []  # Oldest first
+        self.kinds = {}  # name -> frame table
+        self.recycled = 0  # Effects cut short because every slot was busy
+
+    def register(self, kind, images, animation_speed):
+        self.kinds[kind] = frame_table(images, animation_speed)
+
+    def spawn(self, kind, x, y):
+        """Start a ``kind`` effect centred on (x, y)."""
+        frames = self.kinds[kind]
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = self.active.pop(0)
+            self.recycled += 1
+        slot.frames = frames
+        slot.tick = 0
+        slot.image = frames[0]
+        width, height = slot.image.get_size()
+        slot.position = (x - width // 2, y - height // 2)
+        self.active.append(slot)
+
+    def update(self, scroll):
+        # Finished slots go back to the free list, the rest keep their order
+        kept = 0
+        active = self.active
+        for slot in active:
+            slot.tick += 1
+            if slot.tick >= len(slot.frames):
+                self.free.append(slot)
+                continue
+            slot.image = slot.frames[slot.tick]
+            if scroll:
+                slot.position = (slot.position[0] - scroll, slot.position[1])
+            active[kept] = slot
+            kept += 1
+        del active[kept:]
+
+    def submit(self, queue):
+        for slot in self.active:
+            queue.submit(slot.image, slot.position, EFFECTS)
+
+    def clear(self):
+        self.free.extend(self.active)
+        self.active.clear()
+
+    def __len__(self):
+        return len(self.active)
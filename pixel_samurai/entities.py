@@ -0,0 +1,248 @@
+"""The stage and the things flying around it: platforms, powerups, projectiles and particles.
+
+Each takes the ``World`` it lives in (see pixel_samurai.world) for the
+particles it throws and the quality level that scales them, nothing here
+reads the game module. Images are drawn when an entity is made and need no
+window; the drawn frames shared between entities are kept in small caches.
+"""
+import random
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+from .collision import HitFrame
+from .render_queue import STAGE, POWERUPS, PROJECTILES, PARTICLES
+from .settings import WIDTH, PROJECTILE_SPEED
+
+GREEN = (50, 255, 50)
+
+
+class Platform(pygame.sprite.Sprite):
+    def __init__(self, world, x, y, width, height, platform_type="normal"):
+        super().__init__()
+        self.world = world
+        self.image = pygame.Surface((width, height))
+        self.platform_type = platform_type
+
+        if platform_type == "normal":
+            base_color = GREEN
+            detail_color = (0, 200, 0)
+            border_color = (0, 100, 0)
+        elif platform_type == "stone":
+            base_color = (120, 120, 120)
+            detail_color = (150, 150, 150)
+            border_color = (80, 80, 80)
+        elif platform_type == "ice":
+            base_color = (200, 240, 255)
+            detail_color = (220, 250, 255)
+            border_color = (180, 210, 230)
+        elif platform_type == "lava":
+            base_color = (200, 80, 10)
+            detail_color = (255, 100, 20)
+            border_color = (100, 40, 0)
+        else:
+            base_color = GREEN
+            detail_color = (0, 200, 0)
+            border_color = (0, 100, 0)
+
+        self.image.fill(base_color)
+
+        # Add pixel art texture to platforms
+        for px in range(0, width, 8):
+            for py in range(0, height, 8):
+                if random.random() > 0.5:
+                    pygame.draw.rect(self.image, detail_color, (px, py, 4, 4))
+
+        pygame.draw.rect(self.image, border_color, (0, 0, width, height), 3)
+        self.rect = self.image.get_rect(topleft=(x, y))
+
+        # Special platform properties
+        self.is_damaging = platform_type == "lava"
+        self.damage = 1 if self.is_damaging else 0
+        self.is_slippery = platform_type == "ice"
+        self.slip_factor = 0.95 if self.is_slippery else 0.8
+
+    def update(self, scroll):
+        self.rect.x -= scroll
+
+        # Add effects for special platforms
+        if self.is_damaging and random.random() < 0.1 * self.world.quality.particles:
+            x = random.randint(self.rect.left, self.rect.right)
+            y = self.rect.top - 5
+            self.world.particles.append(Particle(x, y, (255, 100, 0), speed=2))
+
+    def submit(self, queue):
+        queue.submit(self.image, self.rect.topleft, STAGE, self)
+
+
+class PowerUp(pygame.sprite.Sprite):
+    def __init__(self, world, x, y, powerup_type):
+        super().__init__()
+        self.world = world
+        self.powerup_type = powerup_type
+        self.image = pygame.Surface((30, 30), pygame.SRCALPHA)
+
+        # Different visuals based on powerup type
+        if powerup_type == "health":
+            color = (255, 50, 50)  # Red
+            pygame.draw.rect(self.image, color, (5, 5, 20, 20))
+            pygame.draw.rect(self.image, (255, 255, 255), (12, 8, 6, 14))
+            pygame.draw.rect(self.image, (255, 255, 255), (8, 12, 14, 6))
+        elif powerup_type == "shield":
+            color = (50, 150, 255)  # Blue
+            pygame.draw.circle(self.image, color, (15, 15), 12)
+            pygame.draw.circle(self.image, (255, 255, 255), (15, 15), 8, 3)
+        elif powerup_type == "speed":
+            color = (50, 255, 50)  # Green
+            pygame.draw.polygon(self.image, color, [(5, 20), (15, 5), (25, 20)])
+            pygame.draw.line(self.image, (255, 255, 255), (15, 8), (15, 25), 3)
+        else:  # "special"
+            color = (255, 215, 0)  # Gold
+            pygame.draw.circle(self.image, color, (15, 15), 12)
+            pygame.draw.circle(self.image, (255, 255, 255), (15, 15), 6)
+
+        self.rect = self.image.get_rect(center=(x, y))
+        self.float_offset = 0
+        self.float_speed = 0.1
+        self.float_direction = 1
+        self.original_y = y
+
+    def update(self, scroll):
+        # Floating animation
+        self.float_offset += self.float_speed * self.float_direction
+        if abs(self.float_offset) > 5:
+            self.float_direction *= -1
+
+        self.rect.y = self.original_y + self.float_offset
+        self.rect.x -= scroll
+
+        # Create sparkle particles occasionally
+        if random.random() < 0.05 * self.world.quality.particles:
+            x = self.rect.centerx + random.randint(-10, 10)
+            y = self.rect.centery + random.randint(-10, 10)
+            color = (255, 255, 200) if self.powerup_type == "special" else (255, 255, 255)
+            self.world.particles.append(Particle(x, y, color, speed=0.5))
+
+    def submit(self, queue):
+        queue.submit(self.image, self.rect.topleft, POWERUPS, self)
+
+    def apply_effect(self, player):
+        if self.powerup_type == "health":
+            player.health = min(player.max_health, player.health + 20)
+            return "Health +20"
+        elif self.powerup_type == "shield":
+            player.shield_active = True
+            player.shield_time = 300  # 5 seconds at 60 FPS
+            return "Shield Activated"
+        elif self.powerup_type == "speed":
+            player.speed_boost = True
+            player.speed_boost_time = 300  # 5 seconds
+            player.speed = player.base_speed * 1.5
+            return "Speed Boost"
+        elif self.powerup_type == "special":
+            player.special_meter = player.max_special
+            player.special_ready = True
+            return "Special Attack Ready!"
+
+
+# Projectiles of a style all look the same, so they share one collision frame. A roster reload replaces the
+# styles, their frames go with them and projectiles in flight keep theirs
+projectile_frames = weakref.WeakKeyDictionary()
+
+
+def projectile_frame(style):
+    """Image and collision mask of a ProjectileStyle, drawn once and shared by every projectile of it"""
+    frame = projectile_frames.get(style)
+    if frame is None:
+        image = pygame.Surface(style.size, pygame.SRCALPHA)
+        width, height = style.size
+        pygame.draw.ellipse(image, style.color, (0, 0, width, height))
+        if style.core:
+            pygame.draw.ellipse(image, style.core, (2, 2, width - 4, height - 4))
+        frame = projectile_frames[style] = HitFrame(image)
+    return frame
+
+
+class Projectile(pygame.sprite.Sprite):
+    def __init__(self, world, x, y, facing_right, owner, power=1.0, projectile_type="normal"):
+        super().__init__()
+        self.world = world
+        self.projectile_type = projectile_type
+        style = world.projectile_styles[projectile_type]
+        self.hit_frame = projectile_frame(style)
+        self.image = self.hit_frame.image
+        self.trail_color = style.trail
+
+        self.rect = self.image.get_rect(center=(x, y))
+        self.facing_right = facing_right
+        self.speed = PROJECTILE_SPEED * style.speed
+        self.original_x = x
+        self.owner = owner  # To track who fired the projectile
+        self.damage = int(style.damage * power)
+
+        # Trail effect variables
+        self.trail_timer = 0
+
+    def update(self, scroll):
+        self.rect.x += self.speed if self.facing_right else -self.speed
+        self.rect.x -= scroll
+
+        # Create trail particles
+        self.trail_timer += 1
+        if self.trail_timer >= 3:  # Create trail every few frames
+            self.trail_timer = 0
+            if random.random() < self.world.quality.particles:
+                self.world.particles.append(Particle(self.rect.centerx, self.rect.centery, self.trail_color,
+                                                     speed=0.5))
+
+        if abs(self.rect.x - self.original_x) > WIDTH:
+            self.kill()
+
+    def submit(self, queue):
+        queue.submit(self.image, self.rect.topleft, PROJECTILES, self)
+
+
+# Particle system for visual effects
+class Particle:
+    def __init__(self, x, y, color, speed=1):
+        self.x = x
+        self.y = y
+        self.color = color
+        self.size = random.randint(2, 6)
+        self.life = random.randint(20, 60)
+        self.max_life = self.life
+        self.vel_x = random.uniform(-2, 2) * speed
+        self.vel_y = random.uniform(-4, -1) * speed
+
+    def update(self):
+        self.x += self.vel_x
+        self.y += self.vel_y
+        self.vel_y += 0.1  # Gravity
+        self.life -= 1
+        self.size = max(1, self.size * (self.life / self.max_life))
+
+    def submit(self, queue):
+        alpha = int(255 * (self.life / self.max_life))
+        size = int(self.size)
+        queue.submit(particle_dot(self.color, size, alpha), (int(self.x - size), int(self.y - size)), PARTICLES)
+
+
+# Particles fade and shrink every frame, their dots are drawn once per colour, size and fade step.
+# Menus throw random colours, so like render_text the cache keeps the recently used ones
+particle_dots = OrderedDict()
+PARTICLE_ALPHA_STEP = 17
+PARTICLE_DOT_CACHE = 1024
+
+
+def particle_dot(color, size, alpha):
+    key = (color, size, alpha - alpha % PARTICLE_ALPHA_STEP)
+    dot = particle_dots.get(key)
+    if dot is None:
+        dot = particle_dots[key] = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(dot, (color[0], color[1], color[2], key[2]), (size, size), size)
+        if len(particle_dots) > PARTICLE_DOT_CACHE:
+            particle_dots.popitem(last=False)
+    else:
+        particle_dots.move_to_end(key)
+    return dot
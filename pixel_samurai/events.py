@@ -0,0 +1,84 @@
+"""Gameplay event log written off the game thread.
+
+``emit`` only appends a tuple to a bounded deque (atomic under the GIL, no
+lock taken), so it is cheap enough to call from anywhere in a frame. A
+background thread drains the deque a few times a second and writes each
+batch as JSON lines with a single write, rotating the file once it grows
+past ``max_bytes``. When the writer cannot keep up the oldest events are
+dropped and counted, the game never waits for it.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+CAPACITY = 16384  # Events buffered between flushes
+FLUSH_INTERVAL = 0.5  # Seconds
+MAX_BYTES = 16 * 1024 * 1024
+BACKUPS = 5  # Rotated files kept as path.1 ... path.N
+
+
+class EventLog:
+    def __init__(self, path, capacity=CAPACITY, flush_interval=FLUSH_INTERVAL, max_bytes=MAX_BYTES,
+                 backups=BACKUPS):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.buffer = deque(maxlen=capacity)
+        self.emitted = 0
+        self.written = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="Event log", daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped(self):
+        # Events pushed out of the full buffer before the writer got to them
+        return self.emitted - self.written - len(self.buffer)
+
+    def emit(self, kind, tick, **fields):
+        """Queue one event, ``fields`` must be JSON serialisable."""
+        self.emitted += 1
+        self.buffer.append((time.time(), tick, kind, fields))
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._flush()
+        self._flush()
+
+    def _flush(self):
+        buffer = self.buffer
+        lines = []
+        while buffer:
+            try:
+                stamp, tick, kind, fields = buffer.popleft()
+            except IndexError:
+                break
+            lines.append(json.dumps({"time": round(stamp, 3), "tick": tick, "event": kind, **fields}))
+        if not lines:
+            return
+        data = ("\n".join(lines) + "\n").encode()
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "ab") as file:
+                file.write(data)
+        except OSError as e:
+            print(f"Event log: {e}")
+            return
+        self.written += len(lines)
+
+    def _rotate(self):
+        for number in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{number}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{number + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def close(self):
+        """Write out whatever is still buffered and stop the writer."""
+        self._stop.set()
+        self._thread.join()
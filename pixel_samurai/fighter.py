@@ -0,0 +1,744 @@
+"""The samurai: movement, attacks, the computer opponents and the label drawn over each fighter.
+
+A ``Samurai`` is made with the ``World`` of its match (see pixel_samurai.world)
+and reaches the stage, the other sprites, the sounds and the screen effects
+through it, so nothing here reads the game module.
+"""
+import random
+import time
+from enum import Enum
+from functools import partial
+
+import pygame
+
+from .ai_worker import AIWorker, LatencyStats
+from .collision import animation_frames
+from .entities import Projectile
+from .lookahead import LookaheadPlanner, FRAME_BUDGET as MASTER_FRAME_BUDGET
+from .render_queue import FIGHTERS, LABELS
+from .settings import (WIDTH, HEIGHT, GRAVITY, JUMP_POWER, MAX_FALL_SPEED, ATTACK_COOLDOWN, MAX_SPECIAL,
+                       SPECIAL_CHARGE_RATE, SPECIAL_HIT_BONUS, CONTROL_ACTIONS)
+from .simulation import capture_world, LEFT, RIGHT, JUMP, ATTACK, SPECIAL
+from .widgets import render_text, default_font
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+BLUE = (50, 50, 255)
+GOLD = (255, 215, 0)
+
+
+# AI Difficulty enum
+class AIDifficulty(Enum):
+    EASY = 0
+    MEDIUM = 1
+    HARD = 2
+    MASTER = 3  # Searches ahead on a simulated copy of the duel
+
+
+# Shield bubbles and speed ghosts are made once per size or frame and reused every frame after
+shield_images = {}
+ghost_images = {}
+GHOST_ALPHA_STEP = 25
+
+
+def shield_image(size):
+    image = shield_images.get(size)
+    if image is None:
+        width, height = size
+        image = shield_images[size] = pygame.Surface((width + 20, height + 20), pygame.SRCALPHA)
+        pygame.draw.ellipse(image, (100, 200, 255, 100), image.get_rect())
+    return image
+
+
+def ghost_image(image, alpha):
+    """``image`` faded to about ``alpha``, the animation frames are shared so there are few of these"""
+    key = (image, alpha - alpha % GHOST_ALPHA_STEP)
+    ghost = ghost_images.get(key)
+    if ghost is None:
+        ghost = ghost_images[key] = image.copy()
+        ghost.set_alpha(key[1])
+    return ghost
+
+
+class Samurai(pygame.sprite.Sprite):
+    def __init__(self, world, x, y, controls, character, player_name=None, is_ai=False,
+                 ai_difficulty=AIDifficulty.MEDIUM):
+        super().__init__()
+        self.world = world
+        self.x = x
+        self.y = y
+        self.vel_x = 0
+        self.vel_y = 0
+        self.character = character
+        self.base_speed = character.speed
+        self.speed = self.base_speed
+        self.max_health = character.health
+        self.health = self.max_health
+        self.power = character.damage_scale
+        self.projectile_type = character.projectile
+        self.special_projectile_type = character.special_projectile
+        self.score = 0
+        self.controls = controls
+        self.player_name = player_name or character.name
+
+        # Animations are shared with every other fighter of the same character
+        sprites = world.sprites(character)
+        self.idle_imgs = sprites['idle']
+        self.run_imgs = sprites['run']
+        self.attack_imgs = sprites['attack']
+        self.jump_imgs = sprites['jump']
+        self.hurt_imgs = sprites['hurt']
+        self.current_imgs = self.idle_imgs
+        self.index = 0
+        self.hit_frame = animation_frames(self.current_imgs)[0][0]
+        self.image = self.hit_frame.image
+        self.rect = self.image.get_rect(topleft=(self.x, self.y))
+
+        # Character state
+        self.attacking = False
+        self.is_attacking = False
+        self.facing_right = True
+        self.on_ground = False
+        self.jump_power = JUMP_POWER
+        self.is_jumping = False
+        self.is_hurting = False
+        self.hurt_timer = 0
+        self.attack_cooldown = ATTACK_COOLDOWN
+        self.current_attack_cooldown = 0
+        self.projectiles = pygame.sprite.Group()
+        self.special_meter = 0
+        self.max_special = MAX_SPECIAL
+        self.special_ready = False
+        self.combo_count = 0
+        self.last_hit_time = 0
+
+        # Powerup effects
+        self.shield_active = False
+        self.shield_time = 0
+        self.speed_boost = False
+        self.speed_boost_time = 0
+
+        # AI variables
+        self.is_ai = is_ai
+        self.ai_timer = 0
+        self.ai_action_time = 0
+        self.ai_target = None
+        self.ai_difficulty = ai_difficulty
+        self.ai_state = "idle"
+        self.ai_jump_timer = 0
+        self.ai_platform_awareness = 0.5  # How well AI avoids falling
+        self.ai_nav_mode = "chase"  # chase, flank or escape along the navigation graph
+        self.ai_nav_timer = 0
+        self.ai_nav_edge = None
+        self.ai_planner = None  # LookaheadPlanner for the master AI, created on first use
+        self.ai_frame = 0
+        self.ai_worker = None  # AIWorker running the planner when the world's ai_async is on
+        self.ai_plan = None
+        self.ai_plan_tick = 0
+        self.ai_buttons = (False,) * len(CONTROL_ACTIONS)
+        self.ai_latency = LatencyStats()  # Time spent deciding in the frame
+        self.performed = 0  # Jump/attack/special bits of this frame, for replays
+
+        # Name label, rendered again only when the name changes
+        self.name_text = None
+        self.name_text_for = None
+        self.label_surface = None  # Name, bars and combo over the sprite, see label()
+        self.label_look = None
+        self.hud_surface = None  # Panel on the HUD, see hud_panel()
+        self.hud_look = None
+
+        # Set AI difficulty factors
+        if self.is_ai:
+            if ai_difficulty == AIDifficulty.EASY:
+                self.ai_platform_awareness = 0.3
+                self.ai_reaction_time = 1.5  # Slower
+                self.ai_accuracy = 0.6  # Less accurate
+                self.ai_aggression = 0.4  # Less aggressive
+            elif ai_difficulty == AIDifficulty.MEDIUM:
+                self.ai_platform_awareness = 0.7
+                self.ai_reaction_time = 1.0  # Normal
+                self.ai_accuracy = 0.8  # Moderately accurate
+                self.ai_aggression = 0.7  # Moderately aggressive
+            else:  # HARD and MASTER
+                self.ai_platform_awareness = 0.9
+                self.ai_reaction_time = 0.5  # Fast reactions
+                self.ai_accuracy = 0.95  # Very accurate
+                self.ai_aggression = 0.9  # Very aggressive
+
+        # Animation speeds
+        self.animation_speed = dict(character.animation_speed)
+
+        # Stats tracking
+        self.hits_landed = 0
+        self.damage_dealt = 0
+        self.jumps_made = 0
+        self.specials_used = 0
+
+    def handle_keys(self, keys):
+        if self.health <= 0:
+            return
+
+        self.vel_x = 0
+        if not self.is_attacking and not self.is_hurting:
+            if keys[self.controls['left']]:
+                self.vel_x = -self.speed
+                self.facing_right = False
+                self.current_imgs = self.run_imgs
+                self.current_animation_speed = self.animation_speed['run']
+            elif keys[self.controls['right']]:
+                self.vel_x = self.speed
+                self.facing_right = True
+                self.current_imgs = self.run_imgs
+                self.current_animation_speed = self.animation_speed['run']
+            else:
+                self.current_imgs = self.idle_imgs
+                self.current_animation_speed = self.animation_speed['idle']
+
+            if keys[self.controls['jump']] and self.on_ground and not self.is_jumping:
+                self.jump()
+
+            if keys[self.controls['attack']] and self.current_attack_cooldown == 0:
+                self.attack()
+
+            # Special attack logic
+            if keys[self.controls['special']] and self.special_meter >= self.max_special:
+                self.special_attack()
+
+    def jump(self):
+        self.vel_y = self.jump_power
+        self.is_jumping = True
+        self.on_ground = False
+        self.current_imgs = self.jump_imgs
+        self.current_animation_speed = self.animation_speed['jump']
+        self.jumps_made += 1
+        self.performed |= 1 << JUMP
+        self.world.event("jump", fighter=self.world.fighter_number(self))
+        self.world.play("jump")
+
+    def attack(self):
+        self.attacking = True
+        self.is_attacking = True
+        self.current_imgs = self.attack_imgs
+        self.current_animation_speed = self.animation_speed['attack']
+        self.index = 0
+        self.current_attack_cooldown = self.attack_cooldown
+        self.performed |= 1 << ATTACK
+        self.world.event("attack", fighter=self.world.fighter_number(self))
+
+        # Regular attack
+        projectile_x = self.rect.centerx + (40 if self.facing_right else -40)
+        projectile_y = self.rect.centery
+        projectile = Projectile(self.world, projectile_x, projectile_y, self.facing_right, self, power=self.power,
+                                projectile_type=self.projectile_type)
+        self.projectiles.add(projectile)
+        self.world.all_sprites.add(projectile)
+        self.world.play("attack")
+
+        # Add small flash effect at projectile spawn point
+        self.world.spawn_effect("attack", projectile_x, projectile_y)
+
+    def special_attack(self):
+        self.attacking = True
+        self.is_attacking = True
+        self.current_imgs = self.attack_imgs
+        self.current_animation_speed = self.animation_speed['attack'] * 1.5
+        self.index = 0
+        self.special_meter = 0
+        self.special_ready = False
+        self.specials_used += 1
+        self.performed |= 1 << SPECIAL
+        self.world.event("special", fighter=self.world.fighter_number(self))
+
+        # Triple projectile special attack
+        for i in range(-1, 2):
+            projectile_x = self.rect.centerx + (40 if self.facing_right else -40)
+            projectile_y = self.rect.centery + i * 20
+            projectile = Projectile(self.world, projectile_x, projectile_y, self.facing_right, self,
+                                    power=1.5 * self.power, projectile_type=self.special_projectile_type)
+            self.projectiles.add(projectile)
+            self.world.all_sprites.add(projectile)
+
+        # Add large flash effect for special attack
+        self.world.spawn_effect("special", self.rect.centerx + (50 if self.facing_right else -50), self.rect.centery)
+        self.world.shake()
+        self.world.play("attack")
+
+    def ai_action(self, target):
+        """AI control logic for CPU opponent"""
+        if self.health <= 0 or not self.ai_target:
+            return
+
+        if self.ai_difficulty == AIDifficulty.MASTER:
+            self.ai_search(target)
+            return
+
+        self.ai_timer += 1
+
+        # Hard AI re-plans its route across the platforms every frame
+        navigating = self.ai_difficulty == AIDifficulty.HARD and self.ai_navigate(target)
+
+        reaction_time = int(60 * self.ai_reaction_time)  # How often AI makes decisions
+
+        # Only make decisions periodically to simulate human reaction time
+        if self.ai_timer >= reaction_time:
+            self.ai_timer = 0
+            self.ai_action_time = random.randint(10, 20)
+
+            # Determine relative position to target
+            target_distance = abs(self.rect.centerx - target.rect.centerx)
+            target_on_left = target.rect.centerx < self.rect.centerx
+
+            if navigating:
+                # The route decides movement, only take shots that line up
+                if (self.current_attack_cooldown == 0 and target_on_left != self.facing_right and
+                        abs(self.rect.centery - target.rect.centery) < 50):
+                    self.ai_state = "attacking"
+                    self.attack()
+                return
+
+            # Check if about to fall off platform
+            about_to_fall = True
+            for platform in self.world.platforms:
+                # Check if there's a platform below and ahead in the direction we're moving
+                look_ahead = 50 * (-1 if target_on_left else 1)
+                test_point = (self.rect.centerx + look_ahead, self.rect.bottom + 10)
+
+                if platform.rect.collidepoint(test_point):
+                    about_to_fall = False
+                    break
+
+            # AI awareness check - harder difficulties are more aware of platforms
+            if about_to_fall and random.random() < self.ai_platform_awareness:
+                # If about to fall off and aware, reverse direction briefly
+                self.vel_x = self.speed * (1 if target_on_left else -1)
+                self.facing_right = target_on_left
+                self.ai_state = "evading"
+                self.current_imgs = self.run_imgs
+                self.current_animation_speed = self.animation_speed['run']
+                return
+
+            # Simple state machine for AI behavior based on distance and aggression
+            if target_distance > 300:
+                # Far away - move toward player
+                self.ai_state = "approaching"
+                self.vel_x = -self.speed if target_on_left else self.speed
+                self.facing_right = not target_on_left
+                self.current_imgs = self.run_imgs
+                self.current_animation_speed = self.animation_speed['run']
+
+                # Occasionally jump to traverse platforms
+                if random.random() < 0.1 * self.ai_aggression and self.on_ground:
+                    self.jump()
+
+                # Hard AI sometimes circles around behind the target instead
+                if self.ai_difficulty == AIDifficulty.HARD and random.random() < 0.3:
+                    self.ai_nav_mode = "flank"
+                    self.ai_nav_timer = 90
+
+            elif target_distance > 150:
+                # Medium distance - attack or move based on aggression
+                if random.random() < 0.6 * self.ai_aggression and self.current_attack_cooldown == 0:
+                    self.ai_state = "attacking"
+                    self.attack()
+                else:
+                    self.ai_state = "positioning"
+                    # Move toward player
+                    self.vel_x = -self.speed if target_on_left else self.speed
+                    self.facing_right = not target_on_left
+                    self.current_imgs = self.run_imgs
+                    self.current_animation_speed = self.animation_speed['run']
+            else:
+                # Close range - attack, use special, or dodge based on situation
+                dodge_chance = 0.3 * (1 - self.ai_aggression)  # Less aggressive AI dodges more
+
+                if random.random() < dodge_chance:
+                    self.ai_state = "dodging"
+                    # Dodge (move away)
+                    self.vel_x = self.speed if target_on_left else -self.speed
+                    self.facing_right = target_on_left
+
+                    # Maybe jump while dodging
+                    if random.random() < 0.4 and self.on_ground:
+                        self.jump()
+
+                    # Hard AI retreats to the platform it can reach well before the target
+                    if self.ai_difficulty == AIDifficulty.HARD:
+                        self.ai_nav_mode = "escape"
+                        self.ai_nav_timer = 60
+
+                elif self.special_meter >= self.max_special and random.random() < 0.8 * self.ai_accuracy:
+                    self.ai_state = "special_attack"
+                    # Use special attack if available
+                    self.special_attack()
+
+                elif self.current_attack_cooldown == 0 and random.random() < 0.7 * self.ai_accuracy:
+                    self.ai_state = "attacking"
+                    # Regular attack
+                    self.attack()
+                else:
+                    # Just move or idle
+                    if random.random() < 0.5:
+                        self.ai_state = "repositioning"
+                        # Move randomly
+                        direction = 1 if random.random() < 0.5 else -1
+                        self.vel_x = self.speed * direction
+                        self.facing_right = direction > 0
+                        self.current_imgs = self.run_imgs
+                        self.current_animation_speed = self.animation_speed['run']
+
+    def ai_search(self, target):
+        """Master AI: play the best plan found by simulating candidate action sequences ahead"""
+        self.ai_frame += 1
+        world = capture_world([self, target], self.world.platform_data, self.ai_frame,
+                              self.world.projectile_styles)
+        if self.world.ai_async == "off":
+            if self.ai_planner is None:
+                # Several master AIs in one match share the frame budget
+                budget = MASTER_FRAME_BUDGET / max(1, self.world.master_ai_count)
+                self.ai_planner = LookaheadPlanner(self.world.nav_graph, budget=budget)
+            buttons = self.ai_planner.act(world)
+            self.ai_state = self.ai_planner.intent
+        else:
+            buttons = self.ai_async_buttons(world)
+        self.handle_keys({self.controls[name]: pressed for name, pressed in zip(CONTROL_ACTIONS, buttons)})
+
+    def ai_async_buttons(self, world):
+        """Buttons from the plan the worker sent last, submitting a new snapshot whenever it is free"""
+        if self.ai_worker is None:
+            self.ai_worker = AIWorker(partial(LookaheadPlanner, self.world.nav_graph), self.world.ai_async,
+                                      name=self.player_name)
+        result = self.ai_worker.poll()
+        if result is not None:
+            self.ai_plan, self.ai_plan_tick, self.ai_state = result
+        self.ai_worker.submit(world)
+
+        # Past the end of the plan, or while a late decision is still out, repeat the previous buttons
+        step = self.ai_frame - self.ai_plan_tick
+        if self.ai_plan is not None and 0 <= step < len(self.ai_plan):
+            self.ai_buttons = tuple(self.ai_plan[step])
+        return self.ai_buttons
+
+    def stop_ai(self):
+        if self.ai_worker:
+            self.ai_worker.close()
+            self.ai_worker = None
+
+    def ai_navigate(self, target):
+        """Steer along the navigation graph to chase, flank or escape the target, True while in control"""
+        if self.is_attacking or self.is_hurting:
+            return False
+
+        if self.ai_nav_timer > 0:
+            self.ai_nav_timer -= 1
+        else:
+            self.ai_nav_mode = "chase"
+
+        nav_graph = self.world.nav_graph
+        my_node = nav_graph.locate(self.rect.centerx, self.rect.bottom)
+        target_node = nav_graph.locate(target.rect.centerx, target.rect.bottom)
+        if my_node is None or target_node is None:
+            return False
+
+        # In the air, keep steering onto the platform the last edge was aiming for
+        if self.rect.bottom < nav_graph.nodes[my_node].top - 4:
+            if self.ai_nav_edge is None:
+                return False
+            self.ai_move(nav_graph.air_steer(self.ai_nav_edge, self.rect.centerx))
+            return True
+
+        goal_node = target_node
+        goal_x = None
+        if self.ai_nav_mode == "escape":
+            goal_node = nav_graph.escape_node(my_node, target_node)
+        elif self.ai_nav_mode == "flank":
+            goal_x = nav_graph.flank_x(target_node, target.rect.centerx, target.facing_right)
+
+        self.ai_nav_edge = nav_graph.next_edge(my_node, goal_node)
+        if self.ai_nav_edge is None and goal_x is None:
+            return False
+
+        direction, jump = nav_graph.steer(my_node, goal_node, self.rect.centerx, goal_x)
+        self.ai_state = "navigating" if self.ai_nav_mode == "chase" else self.ai_nav_mode + "ing"
+        self.ai_move(direction)
+        if jump and self.on_ground and not self.is_jumping:
+            self.jump()
+        return True
+
+    def ai_move(self, direction):
+        if direction == 0:
+            self.vel_x = 0
+            return
+        self.vel_x = self.speed * direction
+        self.facing_right = direction > 0
+        self.current_imgs = self.run_imgs
+        self.current_animation_speed = self.animation_speed['run']
+
+    def input_bits(self):
+        """This frame's actions as CONTROL_ACTIONS bits, AIs act without pressing keys so it goes by what happened"""
+        bits = self.performed
+        self.performed = 0
+        if self.vel_x < 0:
+            bits |= 1 << LEFT
+        elif self.vel_x > 0:
+            bits |= 1 << RIGHT
+        return bits
+
+    def apply_gravity(self):
+        self.vel_y += GRAVITY
+        if self.vel_y > MAX_FALL_SPEED:
+            self.vel_y = MAX_FALL_SPEED
+
+    def update(self, scroll):
+        # AI logic if this is a CPU player
+        if self.is_ai and self.ai_target:
+            started = time.perf_counter()
+            self.ai_action(self.ai_target)
+            self.ai_latency.add(time.perf_counter() - started)
+
+        # Movement and position updates
+        if not self.is_hurting:
+            self.x += self.vel_x
+            self.y += self.vel_y
+
+            # Keep player within screen bounds
+            self.x = max(0, min(self.x, WIDTH - self.rect.width))
+            self.y = max(0, min(self.y, HEIGHT - self.rect.height))
+
+        # Animation handling
+        if hasattr(self, 'current_animation_speed'):
+            self.index += self.current_animation_speed
+        else:
+            self.index += 0.2  # Default animation speed
+
+        if self.is_attacking:
+            if self.index >= len(self.current_imgs):
+                self.index = 0
+                self.is_attacking = False
+                self.attacking = False
+                self.current_imgs = self.idle_imgs
+                self.current_animation_speed = self.animation_speed['idle']
+        elif self.is_jumping:
+            if self.index >= len(self.current_imgs):
+                self.index = 0
+                if self.vel_y > 0:
+                    self.current_imgs = self.idle_imgs
+                    self.current_animation_speed = self.animation_speed['idle']
+                    self.is_jumping = False
+        elif self.is_hurting:
+            if self.index >= len(self.current_imgs):
+                self.index = 0
+                self.is_hurting = False
+                self.current_animation_speed = self.animation_speed['idle']
+
+        if not self.is_attacking and not self.is_jumping and not self.is_hurting:
+            if self.vel_x != 0:
+                self.current_imgs = self.run_imgs
+                self.current_animation_speed = self.animation_speed['run']
+            else:
+                self.current_imgs = self.idle_imgs
+                self.current_animation_speed = self.animation_speed['idle']
+
+        # Decrease attack cooldown
+        if self.current_attack_cooldown > 0:
+            self.current_attack_cooldown -= 1
+
+        # Decrease combo counter over time
+        if self.combo_count > 0 and pygame.time.get_ticks() - self.last_hit_time > 2000:
+            self.combo_count = 0
+
+        # Update powerup timers
+        if self.shield_active:
+            self.shield_time -= 1
+            if self.shield_time <= 0:
+                self.shield_active = False
+
+        if self.speed_boost:
+            self.speed_boost_time -= 1
+            if self.speed_boost_time <= 0:
+                self.speed_boost = False
+                self.speed = self.base_speed
+
+        # Update image based on animation frame
+        if self.current_imgs and len(self.current_imgs) > 0:
+            # Cached frame with the mirrored image and mask for facing left
+            frames = animation_frames(self.current_imgs)
+            self.hit_frame = frames[int(self.index) % len(frames)][0 if self.facing_right else 1]
+            self.image = self.hit_frame.image
+            self.rect = self.image.get_rect(topleft=(int(self.x - scroll), int(self.y)))
+
+        # Update projectiles
+        self.projectiles.update(scroll)
+
+        # Special meter charge - gradually increase over time when not at max
+        if self.special_meter < self.max_special:
+            self.special_meter += SPECIAL_CHARGE_RATE
+            if self.special_meter >= self.max_special and not self.special_ready:
+                self.special_ready = True
+                # Visual indicator when special is ready
+                self.world.spawn_effect("special_ready", self.rect.centerx, self.rect.centery - 30)
+
+    def submit(self, queue):
+        if not queue.first(self):
+            return
+        x, y = self.rect.topleft
+
+        # Draw shield effect if active
+        if self.shield_active:
+            queue.submit(shield_image(self.rect.size), (x - 10, y - 10), FIGHTERS)
+
+        # Draw speed boost effect if active
+        if self.speed_boost:
+            for i in range(self.world.quality.ghosts):
+                offset = random.randint(-5, 5)
+                alpha = random.randint(50, 150)
+                queue.submit(ghost_image(self.image, alpha), (x - 10 + offset, y + offset), FIGHTERS)
+
+        # Draw character
+        queue.submit(self.image, (x, y), FIGHTERS)
+
+        # Name, bars and combo above the character; the projectiles submit themselves from all_sprites
+        label, (dx, dy) = self.label()
+        queue.submit(label, (x + dx, y + dy), LABELS)
+
+    def label(self):
+        """(surface, offset from the sprite's top left) with the name, bars and combo, drawn again when they change"""
+        special_width = int((self.special_meter / self.max_special) * 50)
+        look = (self.player_name, self.health, special_width, self.special_ready, self.combo_count,
+                self.ai_state if self.is_ai and self.world.debug else None)
+        if look != self.label_look:
+            self.label_surface = self.render_label(special_width)
+            self.label_look = look
+        return self.label_surface
+
+    def render_label(self, special_width):
+        # Laid out around the sprite's top left, then moved onto a surface just big enough
+        name_text = self.name_surface()
+        name_rect = name_text.get_rect(center=(self.rect.width // 2, -30))
+        backing = name_rect.inflate(10, 10)
+        area = backing.union((0, -20, 50, 15))
+
+        combo_text = None
+        if self.combo_count > 1:
+            combo_text = render_text(default_font(28), f"{self.combo_count}x Combo!", GOLD)
+            combo_rect = combo_text.get_rect(center=(self.rect.width // 2, -50))
+            area.union_ip(combo_rect)
+
+        ai_text = None
+        if self.is_ai and self.world.debug:
+            ai_text = render_text(default_font(20), f"AI: {self.ai_state}", WHITE)
+            area.union_ip(ai_text.get_rect(topleft=(0, -40)))
+
+        surface = pygame.Surface(area.size, pygame.SRCALPHA)
+        dx, dy = -area.x, -area.y
+
+        # Name behind a dark box
+        pygame.draw.rect(surface, BLACK, backing.move(dx, dy))
+        surface.blit(name_text, name_rect.move(dx, dy))
+
+        # Draw health bar background
+        pygame.draw.rect(surface, BLACK, (dx, dy - 20, 50, 10))
+
+        # Draw health bar with gradient color
+        health_percent = 100 * self.health / self.max_health
+        health_width = max(0, (health_percent / 100) * 50)
+        health_color = (
+            min(255, (100 - health_percent) * 5.1),  # Red component
+            min(255, max(0, health_percent) * 2.55),  # Green component
+            0  # Blue component
+        )
+        pygame.draw.rect(surface, health_color, (dx, dy - 20, health_width, 10))
+
+        # Draw special attack meter below health bar
+        special_color = BLUE if not self.special_ready else GOLD
+        pygame.draw.rect(surface, BLACK, (dx, dy - 10, 50, 5))
+        pygame.draw.rect(surface, special_color, (dx, dy - 10, special_width, 5))
+
+        # Draw combo counter if active
+        if combo_text:
+            surface.blit(combo_text, combo_rect.move(dx, dy))
+
+        # Draw AI state for debugging if this is an AI player
+        if ai_text:
+            surface.blit(ai_text, (dx, dy - 40))
+        return surface, area.topleft
+
+    def name_surface(self):
+        if self.name_text_for != self.player_name:
+            self.name_text = default_font(24).render(self.player_name, True, WHITE)
+            self.name_text_for = self.player_name
+        return self.name_text
+
+    def hurtbox(self):
+        # Opaque pixels of the current frame, the sprite rect has transparent padding around the body
+        return self.hit_frame.box(self.rect.topleft)
+
+    def handle_collision(self):
+        collided = False
+        hurtbox = self.hurtbox()
+        for platform in self.world.platforms:
+            if hurtbox.colliderect(platform.rect):
+                # Check primarily for landing on top of platform
+                if self.vel_y > 0 and hurtbox.bottom > platform.rect.top and hurtbox.top < platform.rect.top:
+                    # Stand the feet, not the bottom of the image, on the platform
+                    self.rect.bottom = platform.rect.top + self.rect.bottom - hurtbox.bottom
+                    self.y = self.rect.y
+                    hurtbox = self.hurtbox()
+                    self.vel_y = 0
+                    self.on_ground = True
+                    self.is_jumping = False
+                    collided = True
+
+                    # Check for damaging platforms
+                    if platform.is_damaging and pygame.time.get_ticks() % 30 == 0:
+                        self.world.event("lava", fighter=self.world.fighter_number(self), damage=platform.damage)
+                        self.take_damage(platform.damage)
+                        self.world.create_particles(self.rect.centerx, self.rect.bottom, 5, (255, 100, 0))
+
+                    # Apply slippery effect
+                    if platform.is_slippery:
+                        # Reduce deceleration on ice
+                        if abs(self.vel_x) > 0:
+                            self.vel_x *= platform.slip_factor
+
+                    # Play landing sound
+                    if not self.is_ai and abs(self.vel_y) > 5:
+                        self.world.play("land")
+
+        if not collided:
+            self.on_ground = False
+
+    def take_damage(self, amount, hit_by=None):
+        # Check for shield protection
+        number, attacker = self.world.fighter_number(self), self.world.fighter_number(hit_by)
+        if self.shield_active:
+            self.world.event("block", fighter=number, attacker=attacker, damage=amount)
+            self.world.play("block")
+            # Create shield impact effect
+            self.world.spawn_effect("block", self.rect.centerx, self.rect.centery)
+            return
+
+        if not self.is_hurting and self.health > 0:
+            dealt = min(amount, self.health)
+            self.health -= dealt
+            self.world.event("hit", fighter=number, attacker=attacker, damage=dealt, health=self.health)
+            if self.world.replay_writer:
+                self.world.replay_writer.damage(number, attacker, dealt)
+            self.is_hurting = True
+            self.hurt_timer = pygame.time.get_ticks()
+            self.index = 0
+            self.current_imgs = self.hurt_imgs
+            self.current_animation_speed = self.animation_speed['hurt']
+            self.world.play("hit")
+
+            # If hit by an opponent, increase their combo and special meter
+            if hit_by and isinstance(hit_by, Samurai):
+                self.world.flash()
+                hit_by.hits_landed += 1
+                hit_by.damage_dealt += amount
+                hit_by.combo_count += 1
+                hit_by.last_hit_time = pygame.time.get_ticks()
+                hit_by.special_meter = min(hit_by.max_special, hit_by.special_meter + SPECIAL_HIT_BONUS)
+
+            # Play defeat sound when health reaches 0
+            if self.health <= 0:
+                self.world.play("defeat")
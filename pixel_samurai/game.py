@@ -0,0 +1,2093 @@
+import pygame
+import os
+import sys
+import random
+import math
+import argparse
+import atexit
+import importlib
+import time
+import tracemalloc
+from enum import Enum
+from functools import partial
+
+from .settings import WIDTH, HEIGHT, FPS, SPAWN_POINTS, PLATFORM_DATA, HARD_PLATFORM_DATA, ASSET_DIR
+from . import settings
+from .ai_worker import MODES as AI_ASYNC_MODES
+from .broadphase import SpatialGrid
+from .simulation import capture_world, spawn_points
+from .render_target import RenderTarget
+from .parallax import build_background
+from .quality import QualityGovernor, PRESET_NAMES as QUALITY_PRESETS
+from .collision import animation_frames, cached_images, forget_animation, overlap
+from .replay import ReplayWriter
+from .events import EventLog
+from .profiles import ProfileStore
+from .capture import ClipRecorder
+from .assets import AssetLoader
+from .roster import load_roster, ANIMATIONS, ROSTER_FILE
+from .widgets import Widget, Button, ToggleButton, render_text, cached_text
+from .scenes import Scene, SceneStack, BACK
+from .inputs import InputPipeline
+from .render_queue import RenderQueue, HUD
+from .postfx import PostFX
+from .effect_pool import EffectPool, EffectSlot
+from .memory import MemoryMonitor, Soak
+from .metrics import Metrics, FRAME_BUCKETS, MATCH_BUCKETS, resident_bytes
+from .hot_reload import FileWatcher
+from .world import World
+from .entities import Platform, PowerUp, Projectile, Particle, projectile_frames, particle_dots
+from .fighter import Samurai, AIDifficulty, ghost_images, shield_images
+
+
+def window_size(text):
+    """argparse type for WIDTHxHEIGHT"""
+    try:
+        width, height = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    return width, height
+
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Pixel Samurai Duel')
+parser.add_argument('--sound', action='store_true', default=True, help='Enable sound')
+parser.add_argument('--no-sound', action='store_false', dest='sound', help='Disable sound')
+parser.add_argument('--difficulty', choices=['easy', 'medium', 'hard', 'master'], default='medium', help='Game difficulty')
+parser.add_argument('--mode', choices=['pvp', 'pvc', 'ffa'], default='pvp',
+                    help='Game mode (pvp, pvc or ffa for a free-for-all)')
+parser.add_argument('--fighters', type=int, default=4, help='Number of fighters in a free-for-all (4-16)')
+parser.add_argument('--humans', type=int, choices=[0, 1, 2], default=1,
+                    help='Keyboard players in a free-for-all, the rest are AI')
+parser.add_argument('--ai-async', choices=AI_ASYNC_MODES, default='off',
+                    help='Run master AI decisions on a worker thread or process')
+parser.add_argument('--window', type=window_size, default=None,
+                    help='Resizable window size such as 1920x1080, the game is scaled to fit')
+parser.add_argument('--fullscreen', action='store_true', help='Scale the game to the whole screen')
+parser.add_argument('--render-scale', type=int, choices=[1, 2], default=1,
+                    help='Draw the match at 1/N of 1280x720 and scale it up by whole factors, '
+                         '2 draws 640x360 and fills 720p, 1080p, 1440p and 4K screens')
+parser.add_argument('--replay-dir', default=None, help='Record every match as a replay file in this folder')
+parser.add_argument('--event-log', default=None, help='Append gameplay events to this JSON lines file')
+parser.add_argument('--profile-db', default=None, help='Keep player ratings and match history in this SQLite file')
+parser.add_argument('--instant-replay', type=int, default=0, metavar='SECONDS',
+                    help='Keep this many seconds of gameplay in memory, F9 saves them as a clip')
+parser.add_argument('--pad-bindings', default='gamepads.json',
+                    help='JSON file of gamepad and arcade stick bindings by device GUID')
+parser.add_argument('--clip-dir', default='clips', help='Folder for clips (F9 instant replay, F10 record)')
+parser.add_argument('--quality', choices=QUALITY_PRESETS, default='auto',
+                    help='Visual quality, auto lowers it while frames run over budget')
+parser.add_argument('--no-post-fx', action='store_false', dest='post_fx',
+                    help='Turn off the screen effects (hit flash, heat, low health, shake, vignette)')
+parser.add_argument('--metrics', default=None, metavar='PATH',
+                    help='Write operational metrics every few seconds: Prometheus text for a .prom file, '
+                         'JSON lines otherwise')
+parser.add_argument('--metrics-port', type=int, default=None,
+                    help='Serve the metrics in Prometheus format at http://<host>:PORT/metrics')
+parser.add_argument('--hot-reload', action='store_true',
+                    help='Dev mode: reload sprites, effects, backgrounds, the roster and the platform layout '
+                         'when their files change')
+parser.add_argument('--soak', type=float, default=None, metavar='HOURS',
+                    help='Play AI-only free-for-all matches back to back for this long, logging memory use')
+parser.add_argument('--soak-log', default='soak.jsonl', help='JSON lines file the soak test samples go to')
+parser.add_argument('--soak-interval', type=float, default=60, metavar='SECONDS',
+                    help='Time between soak test samples')
+# Colors
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+RED = (255, 50, 50)
+GREEN = (50, 255, 50)
+BLUE = (50, 50, 255)
+PURPLE = (147, 0, 211)
+GOLD = (255, 215, 0)
+
+
+# Game Mode enum
+class GameMode(Enum):
+    PLAYER_VS_PLAYER = 0
+    PLAYER_VS_COMPUTER = 1
+    FREE_FOR_ALL = 2
+
+
+def configure(args):
+    """Game settings and background services from the parsed command line, opens no window"""
+    global current_game_mode, ffa_fighter_count, ffa_human_count, ai_difficulty, sound_enabled
+    global replay_dir, event_log, profile_store, clip_recorder, quality, soak_args, metrics, hot_reload
+
+    # Set game mode from command line args
+    if args.mode == 'pvc':
+        current_game_mode = GameMode.PLAYER_VS_COMPUTER
+    elif args.mode == 'ffa':
+        current_game_mode = GameMode.FREE_FOR_ALL
+    else:
+        current_game_mode = GameMode.PLAYER_VS_PLAYER
+
+    # Free-for-all line-up
+    ffa_fighter_count = args.fighters
+    ffa_human_count = args.humans
+
+    # A soak test plays free-for-alls with only AI fighters, main() starts it once everything is loaded
+    soak_args = args if args.soak else None
+    if soak_args:
+        current_game_mode = GameMode.FREE_FOR_ALL
+        ffa_human_count = 0
+
+    # Set AI difficulty from command line args
+    if args.difficulty == 'easy':
+        ai_difficulty = AIDifficulty.EASY
+    elif args.difficulty == 'hard':
+        ai_difficulty = AIDifficulty.HARD
+    elif args.difficulty == 'master':
+        ai_difficulty = AIDifficulty.MASTER
+    else:
+        ai_difficulty = AIDifficulty.MEDIUM
+
+    # Sound enabled flag, the mixer only starts once sound is wanted
+    sound_enabled = args.sound
+    if not sound_enabled:
+        print("Sound disabled")
+
+    # Where master AI decisions run: "off" (in the frame), "thread" or "process"
+    world.ai_async = args.ai_async
+
+    # Folder replays are recorded to, None to not record
+    replay_dir = args.replay_dir
+
+    # Gameplay events for analytics, written by a background thread
+    event_log = EventLog(args.event_log) if args.event_log else None
+    if event_log:
+        atexit.register(event_log.close)  # The menus exit straight from their loops
+
+    # Player ratings and match history, matches are written by a background thread
+    profile_store = ProfileStore(args.profile_db) if args.profile_db else None
+    if profile_store:
+        atexit.register(profile_store.close)
+
+    # Gameplay clips, frames are compressed and written by a background thread
+    clip_recorder = ClipRecorder((WIDTH, HEIGHT), args.clip_dir, args.instant_replay)
+    atexit.register(clip_recorder.close)
+
+    # Visual quality level, stepped by measured frame time with --quality auto
+    quality = world.quality = QualityGovernor(args.quality)
+
+    # Gamepad bindings by device GUID, read when the first pad connects
+    player_inputs.bindings_path = args.pad_bindings
+
+    # Screen effects over the match, each turns itself off for a while when it runs over its budget
+    post_fx.enabled = args.post_fx
+
+    # Frame timing, match throughput and resource use for fleet dashboards, written by a background thread
+    metrics = Metrics(args.metrics, args.metrics_port) if args.metrics or args.metrics_port else None
+    if metrics:
+        declare_metrics()
+        atexit.register(metrics.close)
+
+    # Dev mode for the content team, changed files are picked up between frames, see init_hot_reload()
+    hot_reload = FileWatcher() if args.hot_reload else None
+
+
+def declare_metrics():
+    metrics.histogram("frame_work_seconds", "Time spent on a match frame, without waiting for the next",
+                      FRAME_BUCKETS)
+    metrics.histogram("frame_interval_seconds", "Time between the starts of two match frames", FRAME_BUCKETS)
+    metrics.histogram("tick_seconds", "Time of one simulation tick of a match", FRAME_BUCKETS)
+    metrics.histogram("match_seconds", "Length of a finished match in game time", MATCH_BUCKETS)
+    metrics.counter("late_frames_total", "Match frames whose work took longer than a frame")
+    metrics.counter("matches_total", "Matches played to the end")
+    metrics.gauge("fps", "Frames per second over the last few seconds")
+    metrics.gauge("quality_level", "Visual quality level, 0 is everything on")
+    for name in ("fighters", "projectiles", "particles", "powerups", "effects", "sprites"):
+        metrics.gauge(name, f"Live {name} in the match")
+    metrics.gauge("mixer_channels_busy", "Mixer channels playing a sound")
+    metrics.gauge("mixer_channels", "Mixer channels, 0 while the mixer is off")
+    metrics.gauge("surface_bytes", "Pixel memory of the surfaces the game accounts for")
+    metrics.gauge("resident_bytes", "Process memory in RAM")
+    metrics.gauge("traced_bytes", "Python allocations traced by tracemalloc, while it runs")
+
+
+def init_display(args):
+    """Open the window, everything draws onto the canvas at WIDTH x HEIGHT and present() scales it"""
+    global render_target, screen, frame_buffer, render_scale, clock
+    pygame.display.init()
+    pygame.time.wait(0)  # Starts SDL's timer, pygame.time.get_ticks() counts from here
+    if args.fullscreen:
+        render_target = RenderTarget((WIDTH, HEIGHT), (0, 0), pygame.FULLSCREEN, args.render_scale)
+    elif args.window:
+        render_target = RenderTarget((WIDTH, HEIGHT), args.window, pygame.RESIZABLE, args.render_scale)
+    else:
+        render_target = RenderTarget((WIDTH, HEIGHT), render_scale=args.render_scale)
+    screen = render_target.canvas
+    # The match draws into frame_buffer, render_scale times smaller than the logical coordinates it is played in
+    frame_buffer = render_target.buffer
+    render_scale = args.render_scale
+    post_fx.pixel_size = render_scale
+    pygame.display.set_caption("Pixel Samurai Duel")
+    clock = pygame.time.Clock()
+
+    # Set icon
+    icon_surface = pygame.Surface((32, 32))
+    icon_surface.fill((150, 0, 200))
+    pygame.draw.rect(icon_surface, (255, 50, 50), (8, 8, 16, 16))
+    pygame.display.set_icon(icon_surface)
+
+
+# Notice shown for a while after saving or recording a clip
+clip_message = ""
+clip_message_until = 0
+
+
+def present(surface=None):
+    """Scale the canvas, or the match's frame_buffer, into the window and show the frame"""
+    render_target.present(surface)
+    pygame.display.flip()
+
+
+def match_snapshot():
+    """A copy of the match as last drawn, at WIDTH x HEIGHT for the screens over it"""
+    if frame_buffer is screen:
+        return screen.copy()
+    return pygame.transform.scale(frame_buffer, (WIDTH, HEIGHT))
+
+
+# Assets are decoded by worker threads while the loading screen runs, see pixel_samurai.assets
+asset_loader = AssetLoader()
+atexit.register(asset_loader.close)
+
+SPRITE_SIZE = (96, 96)
+EFFECT_SIZE = (128, 128)
+
+# Asset folders under the game's folder, whatever the working directory
+EFFECTS_DIR = os.path.join(ASSET_DIR, "effects")
+SOUNDS_DIR = os.path.join(ASSET_DIR, "sounds")
+BACKGROUNDS_DIR = os.path.join(ASSET_DIR, "backgrounds")
+UI_DIR = os.path.join(ASSET_DIR, "ui")
+PORTRAITS_DIR = os.path.join(ASSET_DIR, "characters")
+
+# Sound effects: asset name, file in SOUNDS_DIR and volume
+SOUND_FILES = (("jump", "jump.mp3", 0.5), ("attack", "hit.mp3", 0.7), ("hit", "hit.mp3", 0.8),
+               ("menu_select", "menu_select.mp3", 0.6), ("block", "block.mp3", 0.5), ("land", "land.mp3", 0.5),
+               ("defeat", "defeat.mp3", 0.8), ("music", "background_music.mp3", 0.4))
+
+
+def create_asset_folders():
+    # Create asset directories if they don't exist, character sprite folders are made by their placeholders
+    for folder in (EFFECTS_DIR, SOUNDS_DIR, BACKGROUNDS_DIR, UI_DIR):
+        os.makedirs(folder, exist_ok=True)
+
+
+# Create placeholder sprites if assets don't exist
+def create_placeholder_sprite(color, folder, count=4, scale=1.5):
+    os.makedirs(folder, exist_ok=True)
+    for i in range(count):
+        img = pygame.Surface((int(64 * scale), int(64 * scale)), pygame.SRCALPHA)
+        img.fill((0, 0, 0, 0))
+        pygame.draw.rect(img, color, (int(10 * scale), int(10 * scale), int(44 * scale), int(54 * scale)))
+        pygame.draw.circle(img, color, (int(32 * scale), int(20 * scale)), int(12 * scale))
+        pygame.image.save(img, os.path.join(folder, f"frame{i}.png"))
+
+
+# Create placeholder effects
+def create_placeholder_effects():
+    # Explosion effect
+    for i in range(5):
+        img = pygame.Surface((128, 128), pygame.SRCALPHA)
+        radius = 10 + i * 10
+        pygame.draw.circle(img, (255, 200, 0, 200 - i * 40), (64, 64), radius)
+        pygame.draw.circle(img, (255, 100, 0, 150 - i * 30), (64, 64), radius - 5)
+        pygame.image.save(img, os.path.join(EFFECTS_DIR, f"explosion{i}.png"))
+
+    # Shield effect
+    for i in range(3):
+        img = pygame.Surface((128, 128), pygame.SRCALPHA)
+        radius = 40 - i * 3
+        pygame.draw.circle(img, (100, 200, 255, 150 - i * 40), (64, 64), radius)
+        pygame.image.save(img, os.path.join(EFFECTS_DIR, f"shield{i}.png"))
+
+
+# Create placeholder UI elements
+def create_placeholder_ui():
+    sound_on = pygame.Surface((32, 32), pygame.SRCALPHA)
+    pygame.draw.circle(sound_on, (200, 200, 200), (16, 16), 12)
+    pygame.draw.circle(sound_on, (50, 50, 50), (16, 16), 8)
+    pygame.image.save(sound_on, os.path.join(UI_DIR, "sound_on.png"))
+
+    sound_off = pygame.Surface((32, 32), pygame.SRCALPHA)
+    pygame.draw.circle(sound_off, (200, 200, 200), (16, 16), 12)
+    pygame.draw.line(sound_off, (255, 50, 50), (8, 8), (24, 24), 3)
+    pygame.image.save(sound_off, os.path.join(UI_DIR, "sound_off.png"))
+
+
+class SilentSound:
+    """Stands in for the sound effects until the mixer has started"""
+
+    def play(self, *args, **kwargs):
+        pass
+
+
+# Sound effects and the music by asset name, silent until start_music() has loaded them
+sounds = {name: SilentSound() for name, filename, volume in SOUND_FILES}
+
+
+def play_sound(name):
+    if sound_enabled:
+        sounds[name].play()
+
+
+def queue_sounds():
+    """Start the mixer and queue the sound effects, False when there is no audio device"""
+    if not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Sound disabled: {e}")
+            return False
+    for name, filename, volume in SOUND_FILES:
+        asset_loader.sound(f"{name}_sound", os.path.join(SOUNDS_DIR, filename), volume)
+    return True
+
+
+def start_music():
+    """Loop the music, the mixer starts and the sounds load the first time sound is turned on"""
+    global sound_enabled
+    if isinstance(sounds["music"], SilentSound):
+        if not queue_sounds():
+            sound_enabled = False
+            return
+        for name, filename, volume in SOUND_FILES:
+            sounds[name] = asset_loader.get(f"{name}_sound", wait=True)
+    sounds["music"].play(-1)  # Loop indefinitely
+
+
+def init_fonts():
+    global title_font, heading_font, font, small_font, loading_font, loading_small_font
+    pygame.font.init()
+    title_font = pygame.font.Font(None, 80)
+    heading_font = pygame.font.Font(None, 60)
+    font = pygame.font.Font(None, 36)
+    small_font = pygame.font.Font(None, 24)
+    loading_font = pygame.font.Font(None, 60)
+    loading_small_font = pygame.font.Font(None, 24)
+
+
+def draw_loading_screen(progress, frame):
+    """Animated loading screen, drawn every frame while the assets stream in"""
+    screen.fill((20, 10, 30))
+    title = loading_font.render("PIXEL SAMURAI DUEL", True, WHITE)
+    screen.blit(title, title.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100)))
+
+    # Ring of blades, the lit one runs around
+    for i in range(12):
+        angle = i * math.pi / 6
+        x = WIDTH // 2 + int(math.cos(angle) * 40)
+        y = HEIGHT // 2 + int(math.sin(angle) * 40)
+        glow = max(0, 255 - ((frame // 3 - i) % 12) * 30)
+        pygame.draw.circle(screen, (glow, glow * 3 // 4, 255 - glow // 2), (x, y), 5)
+
+    # Progress bar
+    bar = pygame.Rect(WIDTH // 2 - 200, HEIGHT // 2 + 80, 400, 16)
+    pygame.draw.rect(screen, (60, 40, 80), bar)
+    pygame.draw.rect(screen, GOLD, (bar.x, bar.y, int(bar.width * progress), bar.height))
+    text = loading_small_font.render(f"Loading {int(progress * 100)}%", True, (200, 200, 200))
+    screen.blit(text, text.get_rect(center=(WIDTH // 2, bar.bottom + 24)))
+
+
+def load_assets():
+    """Load everything the game starts with behind the loading screen, placeholders fill in missing files"""
+    global roster, projectile_styles, selected_characters
+    global explosion_imgs, shield_imgs, sound_on_img, sound_off_img
+    create_asset_folders()
+
+    # The characters and projectile types, see pixel_samurai.roster
+    roster, projectile_styles = load_roster()
+    world.projectile_styles = projectile_styles
+    selected_characters = roster[:2]
+
+    # Queue the sprites of the two characters the game starts with, the others load when they are picked
+    for character in selected_characters:
+        request_sprites(character)
+    asset_loader.images("effects", EFFECTS_DIR, EFFECT_SIZE, create_placeholder_effects)
+    if render_scale != 1:
+        asset_loader.images("effects buffer", EFFECTS_DIR, buffer_size(EFFECT_SIZE), create_placeholder_effects)
+    asset_loader.image("sound_on", os.path.join(UI_DIR, "sound_on.png"), placeholder=create_placeholder_ui)
+    asset_loader.image("sound_off", os.path.join(UI_DIR, "sound_off.png"), placeholder=create_placeholder_ui)
+
+    # The sounds decode alongside the images when sound is on, they are picked up by start_music()
+    if sound_enabled:
+        queue_sounds()
+
+    # Show the loading screen until everything queued is decoded and converted, a slice of conversion per frame
+    loading_frame = 0
+    while not asset_loader.poll():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+        draw_loading_screen(asset_loader.progress, loading_frame)
+        present()
+        clock.tick(FPS)
+        loading_frame += 1
+
+    explosion_imgs = shield_imgs = asset_loader.get("effects")
+    register_effects()
+    prescale_effects()
+    sound_on_img = asset_loader.get("sound_on")
+    sound_off_img = asset_loader.get("sound_off")
+
+    # Collision masks of the starting characters, built once up front
+    for character in selected_characters:
+        character_sprites(character)
+
+    build_backgrounds()
+    apply_quality()
+
+
+def build_backgrounds():
+    # Pre-rendered parallax layers for the menus, and a copy at the match's render scale
+    global background, arena_background
+    background = build_background(WIDTH, HEIGHT, BACKGROUNDS_DIR)
+    arena_background = background if render_scale == 1 else background.scaled(render_scale)
+
+
+def buffer_size(size):
+    # A logical size on the match's frame_buffer
+    return (size[0] // render_scale, size[1] // render_scale)
+
+
+def request_sprites(character):
+    """Queue the animations of a character, returns animation -> asset key
+
+    The keys go by sprite folder, so characters sharing a folder share one set of images. With a render scale
+    the folder is also decoded at the buffer's size under the key plus " buffer", see prescale_sprites().
+    """
+    keys = {}
+    for animation in ANIMATIONS:
+        folder = os.path.join(character.sprites, animation)
+        count = 1 if animation in ("jump", "hurt") else 4
+        keys[animation] = f"sprites {folder}"
+        placeholder = partial(create_placeholder_sprite, character.placeholder_color, folder, count)
+        asset_loader.images(keys[animation], folder, SPRITE_SIZE, placeholder)
+        if render_scale != 1:
+            asset_loader.images(f"{keys[animation]} buffer", folder, buffer_size(SPRITE_SIZE), placeholder)
+        if hot_reload:
+            hot_reload.watch_folder(folder, partial(reload_sprites, keys[animation], folder))
+    return keys
+
+
+def character_sprites(character):
+    """animation -> images of a character, the same lists for every fighter using it, waits while they load"""
+    sprites = {}
+    for animation, key in request_sprites(character).items():
+        sprites[animation] = asset_loader.get(key, wait=True)
+        # Collision masks of every frame, both facings, built on the first call for each list
+        animation_frames(sprites[animation])
+        if render_scale != 1:
+            prescale_sprites(sprites[animation], asset_loader.get(f"{key} buffer", wait=True))
+    return sprites
+
+
+def prescale_sprites(images, small_images):
+    """Draw an animation on the frame_buffer from ``small_images``, its files decoded at the buffer's size, so the
+    art is resampled once instead of upscaled to SPRITE_SIZE and shrunk again"""
+    for (right, left), small in zip(animation_frames(images), small_images or ()):
+        if right.image in render_queue.prescaled:
+            continue  # A character using the same folder got there first
+        render_queue.prescale(right.image, small)
+        render_queue.prescale(left.image, pygame.transform.flip(small, True, False))
+
+
+def prescale_effects():
+    if render_scale != 1:
+        for image, small in zip(explosion_imgs, asset_loader.get("effects buffer", wait=True)):
+            render_queue.prescale(image, small)
+
+
+def register_effects():
+    # Frame tables of every effect kind: images and animation speed
+    effects.register("attack", explosion_imgs[:3], 0.3)
+    effects.register("special", explosion_imgs, 0.2)
+    effects.register("hit", explosion_imgs, 0.3)
+    effects.register("special_ready", shield_imgs, 0.2)
+    effects.register("block", shield_imgs, 0.2)
+
+
+def init_hot_reload():
+    # Sprite folders are watched as request_sprites() queues them
+    hot_reload.watch_folder(EFFECTS_DIR, reload_effects)
+    hot_reload.watch_folder(BACKGROUNDS_DIR, reload_background)
+    hot_reload.watch_file(ROSTER_FILE, reload_roster)
+    hot_reload.watch_file(settings.__file__, reload_stage)
+
+
+def reload_sprites(key, folder, names):
+    # The animation list changes in place, so every fighter using it shows the new frames on its next update
+    images = asset_loader.reload_images(key, folder, SPRITE_SIZE, names)
+    if images is None:
+        return  # Still loading, it will have the new files
+    forget_animation(images)
+    animation_frames(images)
+    if render_scale != 1:
+        prescale_sprites(images, asset_loader.reload_images(f"{key} buffer", folder, buffer_size(SPRITE_SIZE), names))
+    ghost_images.clear()
+    print(f"Reloaded {folder}")
+
+
+def reload_effects(names):
+    # explosion_imgs and shield_imgs are this list, the frame tables are built from it again
+    asset_loader.reload_images("effects", EFFECTS_DIR, EFFECT_SIZE, names)
+    if render_scale != 1:
+        asset_loader.reload_images("effects buffer", EFFECTS_DIR, buffer_size(EFFECT_SIZE), names)
+    register_effects()
+    prescale_effects()
+    print(f"Reloaded {EFFECTS_DIR}")
+
+
+def reload_background(names):
+    build_backgrounds()
+    apply_quality()
+    print(f"Reloaded {BACKGROUNDS_DIR}")
+
+
+def reload_roster():
+    """Apply the roster file to the loaded characters; stats are read when fighters spawn, so the next match
+    plays with them and the one under way keeps its fighters."""
+    characters, styles = load_roster()
+    projectile_styles.update(styles)  # Drawn with their new sizes and colours, projectiles in flight keep theirs
+    loaded = {character.name: character for character in roster}
+    for character in characters:
+        if character.name in loaded:
+            vars(loaded[character.name]).update(vars(character))
+        else:
+            roster.append(character)
+    print(f"Reloaded {ROSTER_FILE}")
+
+
+def reload_stage():
+    """Rebuild the platforms from the edited settings module, the fighters stay where they are."""
+    global PLATFORM_DATA, HARD_PLATFORM_DATA
+    importlib.reload(settings)
+    PLATFORM_DATA, HARD_PLATFORM_DATA = settings.PLATFORM_DATA, settings.HARD_PLATFORM_DATA
+    for platform in world.platforms:
+        platform.kill()
+    build_stage()
+    # The AI planned on the old navigation graph
+    for fighter in world.fighters:
+        fighter.stop_ai()
+        fighter.ai_planner = None
+        fighter.ai_nav_edge = None
+    print("Reloaded the platform layout")
+
+
+def apply_quality():
+    # The sky and ground always draw, the other layers follow the quality level
+    for layer in {*background.layers, *arena_background.layers}:
+        if layer.name not in ("sky", "ground"):
+            layer.enabled = layer.name in quality.layers
+
+
+# Game States
+MAIN_MENU = 0
+GAME_MODE_SELECT = 1
+CHARACTER_SELECT = 2
+PLAYING = 3
+GAME_OVER = 4
+PAUSE_MENU = 5
+OPTIONS_MENU = 6
+current_game_state = MAIN_MENU
+
+# SceneStack of the screens above, built by init_scenes()
+scenes = None
+
+effects = EffectPool()  # Flashes and explosions, one pool kept for the whole session
+render_queue = RenderQueue()  # The match's sprites, effects and particles, drawn in layers
+post_fx = PostFX()
+memory = MemoryMonitor()  # F7 prints its report, soak tests log its samples
+soak_args = None
+soak = None
+
+# Controls with added special attack button
+controls1 = {
+    'left': pygame.K_a,
+    'right': pygame.K_d,
+    'jump': pygame.K_w,
+    'attack': pygame.K_SPACE,
+    'special': pygame.K_s
+}
+
+controls2 = {
+    'left': pygame.K_LEFT,
+    'right': pygame.K_RIGHT,
+    'jump': pygame.K_UP,
+    'attack': pygame.K_RETURN,
+    'special': pygame.K_DOWN
+}
+
+# Keyboard and gamepad events go into a buffer per player, see pixel_samurai.inputs
+player_inputs = InputPipeline(controls1, controls2)
+
+selected_characters = []  # Characters of player 1 and player 2, picked on the character select screen
+knockout_order = []  # Free-for-all fighters in the order they went down
+
+# Broad phase for projectile and powerup hits, rebuilt from the fighters every frame
+fighter_grid = SpatialGrid()
+match_frame = 0
+
+
+def log_event(kind, **fields):
+    if event_log:
+        event_log.emit(kind, match_frame, **fields)
+
+
+# The match's fighters, stage and sprite groups, and the services its entities use, see pixel_samurai.world.
+# player1 and player2 are the first two of world.fighters, see init_world(); the projectile styles and
+# quality level are filled in by load_assets() and configure()
+world = World(character_sprites, {}, effects, post_fx=post_fx, sound=play_sound, log=log_event)
+
+# AIs switch to the nearest opponent this often in a free-for-all
+RETARGET_INTERVAL = 30
+
+# Name colors for free-for-all fighters, the first two match the duel panels
+FIGHTER_COLORS = [(255, 100, 100), (100, 100, 255), (100, 220, 100), (255, 200, 80),
+                  (200, 100, 255), (80, 220, 220), (255, 140, 200), (180, 180, 180)]
+
+
+def init_world():
+    """The two players and the stage the menus show, reset_game() rebuilds them for every match"""
+    global player1, player2
+
+    # Players
+    player1 = Samurai(world, *SPAWN_POINTS[0], controls1, selected_characters[0])
+    player2 = Samurai(world, *SPAWN_POINTS[1], controls2, selected_characters[1])
+    world.all_sprites.add(player1, player2)
+    world.fighters = [player1, player2]
+
+    build_stage()
+
+
+def build_stage():
+    """The platforms for the difficulty, see World.build_stage()"""
+    # Expanded platform layout with different types
+    platform_data = list(PLATFORM_DATA)
+
+    # Add lava platforms based on difficulty
+    if ai_difficulty in (AIDifficulty.HARD, AIDifficulty.MASTER):
+        platform_data.extend(HARD_PLATFORM_DATA)
+
+    # The navigation graph for the AI is rebuilt with them
+    world.build_stage(platform_data)
+
+
+def draw_text(surface, text, font, x, y, color):
+    text_surface = render_text(font, text, color)
+    text_rect = text_surface.get_rect(center=(x, y))
+    surface.blit(text_surface, text_rect)
+
+
+def draw_pixelated_text(surface, text, font, x, y, color, shadow_color=None):
+    # Create main text
+    text_surface = render_text(font, text, color)
+    text_rect = text_surface.get_rect(center=(x, y))
+
+    # Create shadow if a shadow color is provided
+    if shadow_color:
+        shadow_surface = render_text(font, text, shadow_color)
+        shadow_rect = shadow_surface.get_rect(center=(x + 3, y + 3))
+        surface.blit(shadow_surface, shadow_rect)
+
+    # Draw the main text
+    surface.blit(text_surface, text_rect)
+
+
+def nearest_opponent(fighter):
+    """Closest other fighter still standing, or None"""
+    best = None
+    best_distance = None
+    for other in world.fighters:
+        if other is fighter or other.health <= 0:
+            continue
+        distance = abs(other.x - fighter.x) + abs(other.y - fighter.y)
+        if best_distance is None or distance < best_distance:
+            best, best_distance = other, distance
+    return best
+
+
+def retarget_ai():
+    for fighter in world.fighters:
+        if fighter.is_ai and fighter.health > 0:
+            if (fighter.ai_target is None or fighter.ai_target.health <= 0 or
+                    match_frame % RETARGET_INTERVAL == 0):
+                fighter.ai_target = nearest_opponent(fighter)
+
+
+def knock_out(fighter):
+    """Take a defeated fighter out of a free-for-all"""
+    knockout_order.append(fighter)
+    fighter.stop_ai()
+    for projectile in fighter.projectiles:
+        projectile.kill()
+    fighter.kill()
+    world.create_particles(fighter.rect.centerx, fighter.rect.centery, 30, (200, 200, 200))
+
+
+def hud_panel(fighter, look, render):
+    # Drawn again only when what it shows changes, the fighter keeps the last one like its label
+    if look != fighter.hud_look:
+        fighter.hud_surface = render()
+        fighter.hud_look = look
+    return fighter.hud_surface
+
+
+def duel_panel(fighter, name_color):
+    """Name, health and special bar of a duelist, 250 wide"""
+    special_width = int((fighter.special_meter / fighter.max_special) * 250)
+
+    def render():
+        panel = pygame.Surface((250, 85), pygame.SRCALPHA)
+        pygame.draw.rect(panel, (0, 0, 0), (0, 0, 250, 80), border_radius=5)
+        draw_text(panel, fighter.player_name, font, 125, 15, name_color)
+        draw_text(panel, f"Health: {fighter.health}", font, 125, 45, WHITE)
+        pygame.draw.rect(panel, (50, 50, 80), (0, 70, 250, 15), border_radius=3)
+        special_color = BLUE if not fighter.special_ready else GOLD
+        pygame.draw.rect(panel, special_color, (0, 70, special_width, 15), border_radius=3)
+        return panel
+
+    return hud_panel(fighter, (fighter.player_name, fighter.health, special_width, fighter.special_ready), render)
+
+
+def ffa_panel(fighter, width, color):
+    """Compact name, health and special bars of a free-for-all fighter"""
+    bar_width = width - 20
+    health_width = int(bar_width * max(0, fighter.health) / fighter.max_health)
+    special_width = int(bar_width * fighter.special_meter / fighter.max_special)
+
+    def render():
+        panel = pygame.Surface((width - 6, 40), pygame.SRCALPHA)
+        pygame.draw.rect(panel, (0, 0, 0), (0, 0, width - 6, 40), border_radius=5)
+        pygame.draw.rect(panel, color, (0, 0, 4, 40))
+        panel.blit(fighter.name_surface(), (8, 4))
+        if fighter.health <= 0:
+            draw_text(panel, "KO", small_font, width - 25, 12, RED)
+            return panel
+        pygame.draw.rect(panel, (50, 50, 80), (8, 24, bar_width, 6))
+        pygame.draw.rect(panel, GREEN, (8, 24, health_width, 6))
+        special_color = BLUE if not fighter.special_ready else GOLD
+        pygame.draw.rect(panel, special_color, (8, 32, special_width, 3))
+        return panel
+
+    look = (fighter.player_name, fighter.health > 0, health_width, special_width, fighter.special_ready, width)
+    return hud_panel(fighter, look, render)
+
+
+def submit_duel_hud(queue):
+    queue.submit(duel_panel(player1, (255, 100, 100)), (10, 10), HUD)
+    queue.submit(duel_panel(player2, (100, 100, 255)), (WIDTH - 260, 10), HUD)
+
+
+def submit_ffa_hud(queue):
+    """Compact panel per fighter, up to eight per row"""
+    columns = min(len(world.fighters), 8)
+    panel_width = (WIDTH - 20) // columns
+    for i, fighter in enumerate(world.fighters):
+        x = 10 + (i % 8) * panel_width
+        y = 55 + (i // 8) * 45
+        queue.submit(ffa_panel(fighter, panel_width, FIGHTER_COLORS[i % len(FIGHTER_COLORS)]), (x, y), HUD)
+
+
+def spawn_powerup():
+    # Random chance to spawn a powerup
+    if random.random() < 0.01:  # 1% chance each frame
+        # Choose a random location above platforms
+        x = random.randint(100, WIDTH - 100)
+        y = random.randint(100, HEIGHT - 200)
+
+        # Choose a powerup type
+        powerup_types = ["health", "shield", "speed", "special"]
+        weights = [0.4, 0.3, 0.2, 0.1]  # Weighted probabilities
+        powerup_type = random.choices(powerup_types, weights=weights)[0]
+
+        powerup = PowerUp(world, x, y, powerup_type)
+        world.powerups.add(powerup)
+        world.all_sprites.add(powerup)
+
+
+def play_menu_select():
+    play_sound("menu_select")
+
+
+def read_mouse(events):
+    """Mouse position on the canvas and whether the left button went down this frame"""
+    clicked = any(event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 for event in events)
+    return render_target.mouse_pos(), clicked
+
+
+def quit_game():
+    # The game loop stops on the next frame, like closing the window
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+def submit_particles(queue):
+    # Update particles
+    for particle in world.particles:
+        particle.update()
+    world.particles[:] = [particle for particle in world.particles if particle.life > 0]
+    for particle in world.particles:
+        particle.submit(queue)
+
+
+def draw_particles(surface):
+    submit_particles(render_queue)
+    render_queue.flush(surface)
+
+
+class MainMenuScene(Scene):
+    state = MAIN_MENU
+    ambient = True
+
+    def __init__(self):
+        # Create menu buttons
+        self.start_button = Button(WIDTH // 2 - 150, HEIGHT // 2 - 40, 300, 60, "Start Game", (100, 50, 200),
+                                   (150, 100, 250))
+        self.options_button = Button(WIDTH // 2 - 150, HEIGHT // 2 + 40, 300, 60, "Options", (100, 50, 200),
+                                     (150, 100, 250))
+        self.quit_button = Button(WIDTH // 2 - 150, HEIGHT // 2 + 120, 300, 60, "Quit", (100, 50, 200),
+                                  (150, 100, 250))
+        self.buttons = [self.start_button, self.options_button, self.quit_button]
+
+    def handle(self, events):
+        mouse_pos, mouse_clicked = read_mouse(events)
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                quit_game()
+
+        # Check button interactions
+        for button in self.buttons:
+            button.check_hover(mouse_pos)
+
+        if self.start_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            return GAME_MODE_SELECT
+        if self.options_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            return OPTIONS_MENU
+        if self.quit_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            quit_game()
+
+    def update(self):
+        # Scrolling parallax background
+        background.update()
+
+        # Add visual effects - particles at the bottom
+        if random.random() < 0.1:
+            world.create_particles(random.randint(0, WIDTH), HEIGHT - 10,
+                             color=(random.randint(100, 255), random.randint(50, 150), random.randint(150, 255)))
+
+    def draw(self, surface):
+        background.draw(surface)
+
+        # Draw title with pixel style and shadow
+        draw_pixelated_text(surface, "PIXEL SAMURAI DUEL", title_font, WIDTH // 2, HEIGHT // 4,
+                            (255, 255, 255), (100, 0, 150))
+
+        # Draw subtitle
+        draw_pixelated_text(surface, "A Two-Player Battle for Pixel Glory!", font, WIDTH // 2, HEIGHT // 4 + 70,
+                            (200, 200, 255))
+
+        # Draw buttons
+        for button in self.buttons:
+            button.draw(surface)
+
+        # Draw sound toggle
+        sound_img = sound_on_img if sound_enabled else sound_off_img
+        surface.blit(sound_img, (WIDTH - 50, 30))
+
+        # Draw version and credits
+        draw_text(surface, "v1.0.0", small_font, WIDTH - 50, HEIGHT - 30, (150, 150, 150))
+        draw_text(surface, "© 2023 Pixel Samurai Studios", small_font, WIDTH // 2, HEIGHT - 30, (150, 150, 150))
+
+        draw_particles(surface)
+
+
+class OptionsScene(Scene):
+    state = OPTIONS_MENU
+    overlay = True
+    ambient = True
+
+    DIFFICULTY_DESCRIPTIONS = [
+        "Easy: AI moves slower and attacks less frequently",
+        "Medium: AI has balanced movement and attack patterns",
+        "Hard: AI moves faster, attacks more accurately and aggressively",
+        "Master: AI plans ahead, dodging shots and punishing every opening",
+    ]
+
+    def __init__(self):
+        # Create menu buttons
+        self.back_button = Button(WIDTH // 2 - 100, HEIGHT - 100, 200, 60, "Back", (100, 50, 100), (150, 70, 120))
+
+        # Create toggle buttons
+        self.sound_toggle = ToggleButton(WIDTH // 2 + 100, HEIGHT // 3, 100, 40, "Sound:", sound_enabled)
+
+        # Create difficulty selection, the buttons are in enum order
+        difficulty_options = ["Easy", "Medium", "Hard", "Master"]
+        difficulty_colors = [(100, 255, 100), (255, 255, 100), (255, 100, 100), (200, 100, 255)]
+        difficulty_hover_colors = [(150, 255, 150), (255, 255, 150), (255, 150, 150), (220, 150, 255)]
+        self.difficulty_buttons = []
+        for i, diff in enumerate(difficulty_options):
+            btn_x = WIDTH // 2 - 285 + i * 150
+            btn_y = HEIGHT // 2
+            btn = Button(btn_x, btn_y, 120, 50, diff, difficulty_colors[i], difficulty_hover_colors[i])
+            self.difficulty_buttons.append(btn)
+
+        # Create quality preset selection
+        self.quality_buttons = []
+        for i, preset in enumerate(QUALITY_PRESETS):
+            btn = Button(WIDTH // 2 - 285 + i * 150, HEIGHT // 2 + 170, 120, 50, preset.capitalize(),
+                         (100, 150, 200), (150, 200, 250))
+            self.quality_buttons.append(btn)
+
+        self.backdrop = None
+
+    def enter(self):
+        self.sound_toggle.is_on = sound_enabled
+        if self.backdrop is None:
+            self.backdrop = self.draw_backdrop()
+
+    def draw_backdrop(self):
+        # Everything on this screen that never changes, drawn once
+        backdrop = pygame.Surface((WIDTH, HEIGHT)).convert()
+
+        # Draw background with gradients
+        backdrop.fill((30, 30, 60))
+
+        # Draw decorative elements
+        for y in range(0, HEIGHT, 20):
+            color_value = 40 + (y % 40) // 20 * 20
+            pygame.draw.line(backdrop, (color_value, color_value, color_value + 30), (0, y), (WIDTH, y), 1)
+
+        # Draw title
+        draw_pixelated_text(backdrop, "OPTIONS", heading_font, WIDTH // 2, 100, WHITE, (100, 0, 100))
+
+        # Draw sound toggle section
+        draw_text(backdrop, "Game Settings", font, WIDTH // 2, HEIGHT // 3 - 60, (200, 200, 255))
+        pygame.draw.line(backdrop, (100, 100, 200), (WIDTH // 4, HEIGHT // 3 - 30),
+                         (WIDTH * 3 // 4, HEIGHT // 3 - 30), 2)
+
+        # Draw difficulty section
+        draw_text(backdrop, "AI Difficulty", font, WIDTH // 2, HEIGHT // 2 - 60, (200, 200, 255))
+        pygame.draw.line(backdrop, (100, 100, 200), (WIDTH // 4, HEIGHT // 2 - 30),
+                         (WIDTH * 3 // 4, HEIGHT // 2 - 30), 2)
+
+        # Draw quality section
+        draw_text(backdrop, "Visual Quality", font, WIDTH // 2, HEIGHT // 2 + 125, (200, 200, 255))
+        pygame.draw.line(backdrop, (100, 100, 200), (WIDTH // 4, HEIGHT // 2 + 150),
+                         (WIDTH * 3 // 4, HEIGHT // 2 + 150), 2)
+        return backdrop
+
+    def handle(self, events):
+        global sound_enabled, ai_difficulty
+        mouse_pos, mouse_clicked = read_mouse(events)
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                return BACK
+
+        # Handle button interactions
+        self.back_button.check_hover(mouse_pos)
+        if self.back_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            return BACK
+
+        # Handle sound toggle
+        if self.sound_toggle.is_clicked(mouse_pos, mouse_clicked):
+            sound_enabled = self.sound_toggle.is_on
+            if sound_enabled:
+                start_music()
+            else:
+                pygame.mixer.stop()
+
+        # Handle difficulty buttons
+        for i, btn in enumerate(self.difficulty_buttons):
+            btn.check_hover(mouse_pos)
+            if btn.is_clicked(mouse_pos, mouse_clicked):
+                ai_difficulty = AIDifficulty(i)
+                play_menu_select()
+
+        # Handle quality buttons
+        for preset, btn in zip(QUALITY_PRESETS, self.quality_buttons):
+            btn.check_hover(mouse_pos)
+            if btn.is_clicked(mouse_pos, mouse_clicked):
+                quality.set_preset(preset)
+                apply_quality()
+                play_menu_select()
+
+    def update(self):
+        # Add visual effects
+        if random.random() < 0.05:
+            world.create_particles(random.randint(0, WIDTH), random.randint(0, HEIGHT),
+                             color=(random.randint(100, 200), random.randint(100, 200), random.randint(200, 255)),
+                             speed=0.5)
+
+    def draw(self, surface):
+        surface.blit(self.backdrop, (0, 0))
+
+        # Draw all elements
+        self.sound_toggle.draw(surface)
+        self.back_button.draw(surface)
+
+        # Draw difficulty buttons with highlight for selected one
+        for i, btn in enumerate(self.difficulty_buttons):
+            if i == ai_difficulty.value:
+                highlight_rect = pygame.Rect(btn.rect.x - 5, btn.rect.y - 5, btn.rect.width + 10, btn.rect.height + 10)
+                pygame.draw.rect(surface, (255, 255, 255), highlight_rect, 3, border_radius=5)
+            btn.draw(surface)
+
+        # Draw difficulty description
+        draw_text(surface, self.DIFFICULTY_DESCRIPTIONS[ai_difficulty.value], small_font, WIDTH // 2,
+                  HEIGHT // 2 + 80, (200, 200, 200))
+
+        # Draw quality buttons with highlight for the current preset
+        for preset, btn in zip(QUALITY_PRESETS, self.quality_buttons):
+            if preset == quality.preset:
+                highlight_rect = btn.rect.inflate(10, 10)
+                pygame.draw.rect(surface, (255, 255, 255), highlight_rect, 3, border_radius=5)
+            btn.draw(surface)
+
+        draw_particles(surface)
+
+
+class GameModeScene(Scene):
+    """Screen to select game mode: PvP, PvComputer or a free-for-all"""
+    state = GAME_MODE_SELECT
+    ambient = True
+
+    def __init__(self):
+        self.pvp_button = Button(WIDTH // 2 - 200, HEIGHT // 2 - 110, 400, 70,
+                                 "Player vs Player", (100, 50, 200), (150, 100, 250))
+        self.pvc_button = Button(WIDTH // 2 - 200, HEIGHT // 2 - 30, 400, 70,
+                                 "Player vs Computer", (100, 50, 200), (150, 100, 250))
+        self.ffa_button = Button(WIDTH // 2 - 200, HEIGHT // 2 + 50, 400, 70,
+                                 f"Free For All ({ffa_fighter_count})", (100, 50, 200), (150, 100, 250))
+        self.back_button = Button(WIDTH // 2 - 100, HEIGHT - 100, 200, 50,
+                                  "Back", (150, 50, 50), (200, 100, 100))
+        self.mode_buttons = [self.pvp_button, self.pvc_button, self.ffa_button, self.back_button]
+
+        # AI difficulty selection buttons (only shown when PvC is selected), in enum order
+        self.difficulty_buttons = [
+            Button(WIDTH // 2 - 330, HEIGHT // 2 + 150, 150, 50, "Easy", (50, 150, 50), (100, 200, 100)),
+            Button(WIDTH // 2 - 160, HEIGHT // 2 + 150, 150, 50, "Medium", (150, 150, 50), (200, 200, 100)),
+            Button(WIDTH // 2 + 10, HEIGHT // 2 + 150, 150, 50, "Hard", (150, 50, 50), (200, 100, 100)),
+            Button(WIDTH // 2 + 180, HEIGHT // 2 + 150, 150, 50, "Master", (110, 50, 150), (160, 100, 200)),
+        ]
+        self.difficulty_hints = [
+            ("Easy: Slower AI with less accuracy", (200, 255, 200)),
+            ("Medium: Balanced AI difficulty", (255, 255, 200)),
+            ("Hard: Fast, aggressive AI with high accuracy", (255, 200, 200)),
+            ("Master: Simulates the fight ahead to pick its moves", (230, 200, 255)),
+        ]
+
+    def enter(self):
+        # Animation variables
+        self.title_bounce = 0
+        self.bounce_dir = 1
+        self.show_difficulty = False
+
+    def handle(self, events):
+        global current_game_mode, ai_difficulty
+        mouse_pos, mouse_clicked = read_mouse(events)
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                return MAIN_MENU
+
+        # Check button interactions
+        for button in self.mode_buttons:
+            button.check_hover(mouse_pos)
+
+        if self.show_difficulty:
+            for difficulty, button in zip(AIDifficulty, self.difficulty_buttons):
+                button.check_hover(mouse_pos)
+                if button.is_clicked(mouse_pos, mouse_clicked):
+                    play_menu_select()
+                    ai_difficulty = difficulty
+                    return CHARACTER_SELECT
+
+        if self.pvp_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            current_game_mode = GameMode.PLAYER_VS_PLAYER
+            return CHARACTER_SELECT
+
+        if self.pvc_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            current_game_mode = GameMode.PLAYER_VS_COMPUTER
+            self.show_difficulty = True
+
+        if self.ffa_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            current_game_mode = GameMode.FREE_FOR_ALL
+            self.show_difficulty = True
+
+        if self.back_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            return MAIN_MENU
+
+    def update(self):
+        # Title animation
+        self.title_bounce += 0.1 * self.bounce_dir
+        if abs(self.title_bounce) > 5:
+            self.bounce_dir *= -1
+
+        # Add visual effects
+        if random.random() < 0.05:
+            world.create_particles(random.randint(0, WIDTH), random.randint(0, HEIGHT),
+                             color=(random.randint(100, 200), random.randint(100, 200), random.randint(200, 255)),
+                             speed=0.5)
+
+    def draw(self, surface):
+        # Background
+        surface.fill((20, 30, 60))
+
+        # Animated background elements
+        for i in range(30):
+            y_pos = (i * 25 + pygame.time.get_ticks() // 50) % HEIGHT
+            color_value = 40 + (i % 3) * 20
+            pygame.draw.line(surface, (color_value, color_value, color_value + 40), (0, y_pos), (WIDTH, y_pos), 2)
+
+        # Draw title with bounce effect
+        draw_pixelated_text(surface, "SELECT GAME MODE", heading_font, WIDTH // 2, HEIGHT // 4 + self.title_bounce,
+                            (255, 255, 255), (100, 0, 150))
+
+        # Draw buttons
+        for button in self.mode_buttons:
+            button.draw(surface)
+
+        # Draw difficulty buttons if needed
+        if self.show_difficulty:
+            pygame.draw.rect(surface, (0, 0, 0, 150), (WIDTH // 2 - 345, HEIGHT // 2 + 130, 690, 80),
+                             border_radius=10)
+            draw_text(surface, "Select Difficulty:", font, WIDTH // 2, HEIGHT // 2 + 120, WHITE)
+            for button in self.difficulty_buttons:
+                button.draw(surface)
+
+            # Show difficulty descriptions on hover
+            for button, (hint, color) in zip(self.difficulty_buttons, self.difficulty_hints):
+                if button.hovered:
+                    draw_text(surface, hint, small_font, WIDTH // 2, HEIGHT - 150, color)
+                    break
+        else:
+            # Mode descriptions on hover
+            if self.pvp_button.hovered:
+                draw_text(surface, "Battle against a friend in two-player mode", small_font,
+                          WIDTH // 2, HEIGHT - 150, (200, 200, 255))
+            elif self.pvc_button.hovered:
+                draw_text(surface, "Battle against the computer with adjustable difficulty", small_font,
+                          WIDTH // 2, HEIGHT - 150, (200, 200, 255))
+            elif self.ffa_button.hovered:
+                draw_text(surface, f"Last samurai standing out of {ffa_fighter_count}, "
+                                   f"{ffa_human_count} on the keyboard and the rest AI", small_font,
+                          WIDTH // 2, HEIGHT - 150, (200, 200, 255))
+            else:
+                draw_text(surface, "Choose your game mode", small_font, WIDTH // 2, HEIGHT - 150, (200, 200, 255))
+
+        draw_particles(surface)
+
+
+def request_portrait(character):
+    """Queue the optional portrait of a character from PORTRAITS_DIR, returns its asset key"""
+    key = f"portrait {character.name}"
+    path = os.path.join(PORTRAITS_DIR, character.name.lower().replace(" ", "_") + ".png")
+    asset_loader.image(key, path, (200, 200), optional=True)
+    return key
+
+
+def draw_portrait(surface, character, x):
+    # The colour swatch stands in until the portrait has loaded, or when there is none
+    portrait = asset_loader.get(request_portrait(character))
+    if portrait:
+        surface.blit(portrait, (x - 100, 200))
+    else:
+        pygame.draw.rect(surface, character.color, (x - 100, 200, 200, 200))
+
+
+class CharacterSelectScene(Scene):
+    state = CHARACTER_SELECT
+    ambient = True
+
+    def enter(self):
+        # Player 2 picks a character in PvP, and in a free-for-all with two keyboard players
+        self.two_players = (current_game_mode == GameMode.PLAYER_VS_PLAYER or
+                            (current_game_mode == GameMode.FREE_FOR_ALL and ffa_human_count >= 2))
+
+        # Simple character selection screen, the CPU is always ready
+        self.player1_ready = False
+        self.player2_ready = not self.two_players
+
+        # Portraits load in the background while the screen is up
+        for character in roster:
+            request_portrait(character)
+
+        self.p1_selection = 0
+        self.p2_selection = 1
+
+    def handle(self, events):
+        characters = roster
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_ESCAPE:
+                return GAME_MODE_SELECT
+
+            # Player 1 controls
+            if not self.player1_ready:
+                if event.key == pygame.K_a:  # Left
+                    self.p1_selection = (self.p1_selection - 1) % len(characters)
+                    play_menu_select()
+                elif event.key == pygame.K_d:  # Right
+                    self.p1_selection = (self.p1_selection + 1) % len(characters)
+                    play_menu_select()
+                elif event.key == pygame.K_w:  # Select
+                    self.player1_ready = True
+                    play_menu_select()
+            elif event.key == pygame.K_s:  # Cancel selection
+                self.player1_ready = False
+
+            # Player 2 controls (only in PvP mode)
+            if self.two_players and not self.player2_ready:
+                if event.key == pygame.K_LEFT:
+                    self.p2_selection = (self.p2_selection - 1) % len(characters)
+                    play_menu_select()
+                elif event.key == pygame.K_RIGHT:
+                    self.p2_selection = (self.p2_selection + 1) % len(characters)
+                    play_menu_select()
+                elif event.key == pygame.K_UP:
+                    self.player2_ready = True
+                    play_menu_select()
+            elif event.key == pygame.K_DOWN and self.two_players:
+                self.player2_ready = False
+
+            # Start game when ready
+            if self.player1_ready and self.player2_ready and event.key == pygame.K_SPACE:
+                # reset_game() builds the fighters from the picked characters, player 2 is the AI in PvC mode
+                selected_characters[:] = [characters[self.p1_selection], characters[self.p2_selection]]
+                reset_game()
+                return PLAYING
+
+    def update(self):
+        if not self.two_players:
+            # CPU uses the character after the player's
+            self.p2_selection = (self.p1_selection + 1) % len(roster)
+
+        # The sprites of the characters on show start loading before the match needs them
+        request_sprites(roster[self.p1_selection])
+        request_sprites(roster[self.p2_selection])
+
+        # Add some visual flair - random particles
+        if random.random() < 0.05:
+            p1_side = random.random() < 0.5
+            selection = self.p1_selection if p1_side else self.p2_selection
+            world.create_particles(WIDTH // 4 if p1_side else WIDTH * 3 // 4, 200,
+                             color=roster[selection].color)
+
+    def draw_character(self, surface, character, x):
+        # Character display area
+        pygame.draw.rect(surface, (50, 50, 80), (x - 120, 180, 240, 300))
+        draw_portrait(surface, character, x)
+        draw_text(surface, character.name, font, x, 430, WHITE)
+
+        # Stats
+        draw_text(surface, f"Health: {character.health}", small_font, x, 470, WHITE)
+        draw_text(surface, f"Speed: {character.speed}", small_font, x, 500, WHITE)
+        draw_text(surface, f"Power: {character.power}", small_font, x, 530, WHITE)
+
+    def draw(self, surface):
+        characters = roster
+
+        # Draw background
+        surface.fill((30, 30, 60))
+
+        # Draw title
+        draw_pixelated_text(surface, "CHARACTER SELECT", heading_font, WIDTH // 2, 70, WHITE, (100, 0, 100))
+
+        # Player 1 selection
+        p1_x = WIDTH // 4
+        draw_text(surface, "PLAYER 1", font, p1_x, 150, (255, 100, 100))
+        self.draw_character(surface, characters[self.p1_selection], p1_x)
+
+        # Selection arrows
+        if not self.player1_ready:
+            draw_text(surface, "<", font, p1_x - 140, 300, WHITE)
+            draw_text(surface, ">", font, p1_x + 140, 300, WHITE)
+            draw_text(surface, "Press W to select", small_font, p1_x, 570, (200, 200, 200))
+        else:
+            draw_text(surface, "READY!", font, p1_x, 570, (100, 255, 100))
+
+        p2_x = WIDTH * 3 // 4
+        if self.two_players:
+            # For PvP mode, show Player 2 selection
+            draw_text(surface, "PLAYER 2", font, p2_x, 150, (100, 100, 255))
+            self.draw_character(surface, characters[self.p2_selection], p2_x)
+
+            # Selection arrows
+            if not self.player2_ready:
+                draw_text(surface, "<", font, p2_x - 140, 300, WHITE)
+                draw_text(surface, ">", font, p2_x + 140, 300, WHITE)
+                draw_text(surface, "Press Up Arrow to select", small_font, p2_x, 570, (200, 200, 200))
+            else:
+                draw_text(surface, "READY!", font, p2_x, 570, (100, 255, 100))
+        else:
+            # For PvC mode, show CPU selection
+            draw_text(surface, "COMPUTER", font, p2_x, 150, (100, 100, 255))
+            self.draw_character(surface, characters[self.p2_selection], p2_x)
+
+            # Show AI difficulty
+            draw_text(surface, f"AI Difficulty: {ai_difficulty.name}", small_font, p2_x, 600, (150, 200, 255))
+
+            if current_game_mode == GameMode.FREE_FOR_ALL:
+                cpu_text = f"+{ffa_fighter_count - ffa_human_count} CPU RIVALS"
+            else:
+                cpu_text = "CPU OPPONENT"
+            draw_text(surface, cpu_text, font, p2_x, 570, (100, 180, 255))
+
+        # Bottom instructions
+        if self.player1_ready and self.player2_ready:
+            draw_text(surface, "Press SPACE to start the battle!", font, WIDTH // 2, HEIGHT - 100, (255, 255, 0))
+        elif self.two_players:
+            draw_text(surface, "Both players must select their characters", font, WIDTH // 2, HEIGHT - 100,
+                      (200, 200, 200))
+        else:
+            draw_text(surface, "Select your character", font, WIDTH // 2, HEIGHT - 100, (200, 200, 200))
+
+        draw_particles(surface)
+
+
+def game_stats_panel(player1, player2):
+    """Game statistics at the end of a match"""
+    stats_surface = pygame.Surface((WIDTH - 200, HEIGHT - 200), pygame.SRCALPHA)
+    stats_surface.fill((0, 0, 50, 230))
+
+    stats_rect = stats_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+
+    # Draw border
+    pygame.draw.rect(stats_surface, (100, 100, 255), (0, 0, stats_rect.width, stats_rect.height), 4, border_radius=10)
+
+    # Draw title
+    draw_text(stats_surface, "MATCH STATISTICS", heading_font, stats_rect.width // 2, 40, WHITE)
+
+    # Draw line separator
+    pygame.draw.line(stats_surface, (100, 100, 255), (50, 80), (stats_rect.width - 50, 80), 2)
+
+    # Column headers
+    draw_text(stats_surface, "Stat", font, stats_rect.width // 4, 120, (200, 200, 255))
+    draw_text(stats_surface, player1.player_name, font, stats_rect.width // 2, 120, (255, 100, 100))
+    draw_text(stats_surface, player2.player_name, font, stats_rect.width * 3 // 4, 120, (100, 100, 255))
+
+    # Draw stats rows
+    stats_data = [
+        ("Health Remaining", f"{player1.health}/{player1.max_health}", f"{player2.health}/{player2.max_health}"),
+        ("Hits Landed", str(player1.hits_landed), str(player2.hits_landed)),
+        ("Damage Dealt", str(player1.damage_dealt), str(player2.damage_dealt)),
+        ("Jumps Made", str(player1.jumps_made), str(player2.jumps_made)),
+        ("Special Attacks", str(player1.specials_used), str(player2.specials_used))
+    ]
+
+    for i, (label, p1_val, p2_val) in enumerate(stats_data):
+        y_pos = 170 + i * 50
+        draw_text(stats_surface, label, font, stats_rect.width // 4, y_pos, WHITE)
+        draw_text(stats_surface, p1_val, font, stats_rect.width // 2, y_pos, WHITE)
+        draw_text(stats_surface, p2_val, font, stats_rect.width * 3 // 4, y_pos, WHITE)
+
+    # Draw press any key message
+    draw_text(stats_surface, "Press any key to continue", small_font, stats_rect.width // 2, stats_rect.height - 40,
+              (200, 200, 200))
+    return stats_surface, stats_rect
+
+
+def ffa_placings():
+    """Free-for-all fighters from first to last place"""
+    standing = [fighter for fighter in world.fighters if fighter.health > 0]
+    return standing + knockout_order[::-1]
+
+
+def ffa_stats_panel(placings):
+    """A row of statistics per fighter at the end of a free-for-all"""
+    stats_surface = pygame.Surface((WIDTH - 200, HEIGHT - 120), pygame.SRCALPHA)
+    stats_surface.fill((0, 0, 50, 230))
+    stats_rect = stats_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+    pygame.draw.rect(stats_surface, (100, 100, 255), (0, 0, stats_rect.width, stats_rect.height), 4, border_radius=10)
+
+    draw_text(stats_surface, "MATCH STATISTICS", heading_font, stats_rect.width // 2, 40, WHITE)
+    pygame.draw.line(stats_surface, (100, 100, 255), (50, 80), (stats_rect.width - 50, 80), 2)
+
+    headers = ["Place", "Fighter", "Hits Landed", "Damage Dealt", "Jumps Made", "Special Attacks"]
+    column_x = [stats_rect.width * (2 * i + 1) // (2 * len(headers)) for i in range(len(headers))]
+    for x, header in zip(column_x, headers):
+        draw_text(stats_surface, header, small_font, x, 105, (200, 200, 255))
+
+    for place, fighter in enumerate(placings, 1):
+        y_pos = 105 + place * 26
+        color = GOLD if place == 1 else WHITE
+        values = [str(place), fighter.player_name, str(fighter.hits_landed), str(fighter.damage_dealt),
+                  str(fighter.jumps_made), str(fighter.specials_used)]
+        for x, value in zip(column_x, values):
+            draw_text(stats_surface, value, small_font, x, y_pos, color)
+
+    draw_text(stats_surface, "Press any key to continue", small_font, stats_rect.width // 2, stats_rect.height - 30,
+              (200, 200, 200))
+    return stats_surface, stats_rect
+
+
+class GameOverScene(Scene):
+    """Match statistics until a key is pressed, then the winner with rematch and menu buttons"""
+    state = GAME_OVER
+
+    def __init__(self):
+        # Create buttons
+        self.rematch_button = Button(WIDTH // 2 - 150, HEIGHT // 2, 300, 60, "Rematch", (100, 50, 200),
+                                     (150, 100, 250))
+        self.menu_button = Button(WIDTH // 2 - 150, HEIGHT // 2 + 80, 300, 60, "Main Menu", (100, 50, 200),
+                                  (150, 100, 250))
+        self.quit_button = Button(WIDTH // 2 - 150, HEIGHT // 2 + 160, 300, 60, "Quit", (100, 50, 200),
+                                  (150, 100, 250))
+        self.buttons = [self.rematch_button, self.menu_button, self.quit_button]
+        self.shade = pygame.Surface((WIDTH, HEIGHT))
+        self.shade.fill((0, 0, 0))
+        self.shade.set_alpha(128)
+
+    @property
+    def ambient(self):
+        # The statistics wait for a key, the victory screen has its particles
+        return self.showing_winner
+
+    def enter(self):
+        # The last frame of the match stays behind the statistics
+        self.backdrop = match_snapshot()
+        self.backdrop.blit(self.shade, (0, 0))
+
+        if current_game_mode == GameMode.FREE_FOR_ALL:
+            placings = ffa_placings()
+            self.winner = placings[0].player_name
+            self.winner_name = f"Last samurai standing of {len(world.fighters)}"
+            stats_surface, stats_rect = ffa_stats_panel(placings)
+        else:
+            self.winner = "Player 1" if player2.health <= 0 else "Player 2"
+            self.winner_name = player1.player_name if player2.health <= 0 else player2.player_name
+            stats_surface, stats_rect = game_stats_panel(player1, player2)
+        self.backdrop.blit(stats_surface, stats_rect.topleft)
+        self.showing_winner = False
+
+    def show_winner(self):
+        # Clear screen for victory screen
+        self.backdrop.blit(self.shade, (0, 0))
+
+        # Victory announcement with special effects
+        draw_pixelated_text(self.backdrop, f"{self.winner} Wins!", heading_font, WIDTH // 2, HEIGHT // 3 - 40,
+                            (255, 255, 0), (150, 100, 0))
+        draw_pixelated_text(self.backdrop, self.winner_name, font, WIDTH // 2, HEIGHT // 3 + 20, WHITE)
+
+        # Victory particles
+        for _ in range(50):
+            world.create_particles(random.randint(0, WIDTH), random.randint(0, HEIGHT // 2), color=(255, 215, 0),
+                                   speed=0.5)
+        self.showing_winner = True
+
+    def handle(self, events):
+        if not self.showing_winner:
+            if any(event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN) for event in events):
+                play_menu_select()
+                self.show_winner()
+            return None
+
+        mouse_pos, mouse_clicked = read_mouse(events)
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return MAIN_MENU
+                elif event.key == pygame.K_SPACE:
+                    reset_game()
+                    return PLAYING
+
+        # Check button interactions
+        for button in self.buttons:
+            button.check_hover(mouse_pos)
+
+        if self.rematch_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            reset_game()
+            return PLAYING
+        if self.menu_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            return MAIN_MENU
+        if self.quit_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            quit_game()
+
+    def update(self):
+        # Continue creating victory particles
+        if self.showing_winner and random.random() < 0.1:
+            world.create_particles(random.randint(WIDTH // 3, 2 * WIDTH // 3), HEIGHT // 3, color=(255, 215, 0))
+
+    def draw(self, surface):
+        surface.blit(self.backdrop, (0, 0))
+        if self.showing_winner:
+            for button in self.buttons:
+                button.draw(surface)
+            draw_particles(surface)
+
+
+class PauseScene(Scene):
+    state = PAUSE_MENU
+    overlay = True
+
+    def __init__(self):
+        # Create buttons
+        self.resume_button = Button(WIDTH // 2 - 150, HEIGHT // 2, 300, 60, "Resume", (100, 50, 200),
+                                    (150, 100, 250))
+        self.options_button = Button(WIDTH // 2 - 150, HEIGHT // 2 + 80, 300, 60, "Options", (100, 50, 200),
+                                     (150, 100, 250))
+        self.menu_button = Button(WIDTH // 2 - 150, HEIGHT // 2 + 160, 300, 60, "Main Menu", (100, 50, 200),
+                                  (150, 100, 250))
+        self.buttons = [self.resume_button, self.options_button, self.menu_button]
+
+        # Create sound toggle
+        self.sound_toggle = ToggleButton(WIDTH // 2 + 100, HEIGHT // 2 + 240, 100, 40, "Sound:", sound_enabled)
+
+    def enter(self):
+        # The paused match, darkened, stays behind the menu
+        overlay = pygame.Surface((WIDTH, HEIGHT))
+        overlay.fill((0, 0, 0))
+        overlay.set_alpha(180)
+        self.backdrop = match_snapshot()
+        self.backdrop.blit(overlay, (0, 0))
+        draw_pixelated_text(self.backdrop, "PAUSED", heading_font, WIDTH // 2, HEIGHT // 3, WHITE, (100, 0, 100))
+        self.resume()
+
+    def resume(self):
+        # Options may have changed the sound
+        self.sound_toggle.is_on = sound_enabled
+
+    def handle(self, events):
+        global sound_enabled
+        mouse_pos, mouse_clicked = read_mouse(events)
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_p):
+                return BACK
+
+        # Check button interactions
+        for button in self.buttons:
+            button.check_hover(mouse_pos)
+
+        if self.resume_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            return BACK
+
+        if self.options_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            return OPTIONS_MENU
+
+        if self.menu_button.is_clicked(mouse_pos, mouse_clicked):
+            play_menu_select()
+            return MAIN_MENU
+
+        if self.sound_toggle.is_clicked(mouse_pos, mouse_clicked):
+            sound_enabled = self.sound_toggle.is_on
+            if sound_enabled:
+                start_music()
+            else:
+                pygame.mixer.stop()
+
+    def draw(self, surface):
+        surface.blit(self.backdrop, (0, 0))
+
+        # Draw buttons
+        for button in self.buttons:
+            button.draw(surface)
+        self.sound_toggle.draw(surface)
+
+
+def reset_game():
+    global player1, player2, knockout_order, match_frame
+
+    # The old fighters are dropped, stop their AI workers
+    for fighter in world.fighters:
+        fighter.stop_ai()
+    world.reset()
+
+    # Create players based on game mode
+    if current_game_mode == GameMode.FREE_FOR_ALL:
+        world.fighters = []
+        for i, (x, y) in enumerate(spawn_points(ffa_fighter_count)):
+            # The first fighters are on the keyboard, the AIs just reuse controls2 as button names
+            is_ai = i >= ffa_human_count
+            # The AIs take turns being the two picked characters, sharing their sprites
+            character = selected_characters[i % 2]
+            fighter = Samurai(world, x, y, controls1 if i == 0 else controls2, character,
+                              f"CPU {i + 1}" if is_ai else None, is_ai=is_ai, ai_difficulty=ai_difficulty)
+            world.fighters.append(fighter)
+        player1, player2 = world.fighters[0], world.fighters[1]
+    else:
+        player1 = Samurai(world, *SPAWN_POINTS[0], controls1, selected_characters[0])
+
+        if current_game_mode == GameMode.PLAYER_VS_COMPUTER:
+            player2 = Samurai(world, *SPAWN_POINTS[1], controls2, selected_characters[1], is_ai=True,
+                              ai_difficulty=ai_difficulty)
+            player2.ai_target = player1
+        else:
+            player2 = Samurai(world, *SPAWN_POINTS[1], controls2, selected_characters[1], is_ai=False)
+        world.fighters = [player1, player2]
+
+    world.all_sprites.add(*world.fighters)
+    knockout_order = []
+    match_frame = 0
+    post_fx.reset()
+    world.master_ai_count = sum(1 for f in world.fighters if f.is_ai and f.ai_difficulty == AIDifficulty.MASTER)
+
+    build_stage()
+    retarget_ai()
+    start_replay()
+    log_event("match_start", mode=current_game_mode.name.lower(), difficulty=ai_difficulty.name.lower(),
+              fighters=[fighter.player_name for fighter in world.fighters],
+              ai=[fighter.is_ai for fighter in world.fighters])
+
+
+def start_replay():
+    finish_replay()
+    if replay_dir is None:
+        return
+    os.makedirs(replay_dir, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{current_game_mode.name.lower()}.psr"
+    world.replay_writer = ReplayWriter(os.path.join(replay_dir, name),
+                                 capture_world(world.fighters, world.platform_data, 0, projectile_styles),
+                                 names=[fighter.player_name for fighter in world.fighters],
+                                 meta={"mode": current_game_mode.name.lower(),
+                                       "difficulty": ai_difficulty.name.lower()})
+
+
+def finish_replay():
+    if world.replay_writer:
+        world.replay_writer.close()
+        world.replay_writer = None
+
+
+# Quitting mid-match still leaves a readable replay
+def end_match():
+    # Close the replay and log the placings with every fighter's totals
+    finish_replay()
+    if current_game_mode == GameMode.FREE_FOR_ALL:
+        placings = ffa_placings()
+    else:
+        placings = sorted(world.fighters, key=lambda fighter: fighter.health <= 0)
+    log_event("round_result", winner=world.fighter_number(placings[0]), ticks=match_frame,
+              placings=[world.fighter_number(fighter) for fighter in placings],
+              stats=[{"health": fighter.health, "hits_landed": fighter.hits_landed,
+                      "damage_dealt": fighter.damage_dealt, "jumps_made": fighter.jumps_made,
+                      "specials_used": fighter.specials_used} for fighter in world.fighters])
+
+    if metrics:
+        metrics.inc("matches_total")
+        metrics.observe("match_seconds", match_frame / FPS)
+
+    if profile_store:
+        profile_store.record_match(current_game_mode.name.lower(), ai_difficulty.name.lower(), match_frame, [
+            {"name": profile_name(fighter), "place": place, "health": fighter.health,
+             "hits_landed": fighter.hits_landed, "damage_dealt": fighter.damage_dealt,
+             "jumps_made": fighter.jumps_made, "specials_used": fighter.specials_used}
+            for place, fighter in enumerate(placings, 1)])
+
+
+def profile_name(fighter):
+    # Humans are rated by character, the AI by difficulty
+    if fighter.is_ai:
+        return f"CPU ({fighter.ai_difficulty.name.lower()})"
+    return fighter.player_name
+
+
+class PlayingScene(Scene):
+    state = PLAYING
+    live = True
+    mode_text = None  # What mode_surface shows
+    mode_surface = None
+
+    def enter(self):
+        player_inputs.clear()
+
+    def resume(self):
+        player_inputs.clear()
+
+    def handle(self, events):
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_p):
+                return PAUSE_MENU
+
+    def update(self):
+        if not metrics:
+            return self.tick()
+        started = time.perf_counter()
+        result = self.tick()
+        metrics.observe("tick_seconds", time.perf_counter() - started)
+        return result
+
+    def tick(self):
+        global match_frame
+
+        # Fighters knocked out of a free-for-all have left all_sprites
+        active_fighters = self.active_fighters = [fighter for fighter in world.fighters if fighter.alive()]
+        match_frame += 1
+        retarget_ai()
+
+        # Handle Player Input and Actions
+        for fighter in active_fighters:
+            if not fighter.is_ai:  # AI fighters decide in their update
+                fighter.handle_keys(player_inputs.sample(fighter.controls))
+            fighter.apply_gravity()
+            fighter.handle_collision()
+
+        # Background Scrolling
+        arena_background.update()
+
+        # Random powerup spawning
+        spawn_powerup()
+
+        # Update Sprites
+        world.all_sprites.update(0)
+        effects.update(0)
+        world.powerups.update(0)
+
+        # Broad phase: bucket the fighters once, then each projectile and powerup only
+        # tests the fighters sharing its grid cells
+        fighter_grid.clear()
+        for fighter in active_fighters:
+            fighter_grid.insert(fighter, fighter.rect)
+
+        # Projectile Collisions
+        for owner in world.fighters:
+            for projectile in owner.projectiles:
+                for target in fighter_grid.query(projectile.rect):
+                    if target is not owner and overlap(projectile.hit_frame, projectile.rect.topleft,
+                                                       target.hit_frame, target.rect.topleft):
+                        target.take_damage(projectile.damage, owner)
+                        projectile.kill()
+                        # Create hit effect
+                        effects.spawn("hit", projectile.rect.centerx, projectile.rect.centery)
+                        # Create particles
+                        world.create_particles(projectile.rect.centerx, projectile.rect.centery, 15, (255, 200, 0))
+                        break
+
+        # Powerup collisions
+        for powerup in world.powerups.sprites():
+            for fighter in fighter_grid.query(powerup.rect):
+                if powerup.rect.colliderect(fighter.hurtbox()):
+                    powerup.kill()
+                    message = powerup.apply_effect(fighter)
+                    log_event("powerup", fighter=world.fighter_number(fighter), powerup=powerup.powerup_type)
+                    # Create effect
+                    world.create_particles(powerup.rect.centerx, powerup.rect.centery, 20, (255, 255, 200))
+                    play_sound("menu_select")
+                    break
+
+        # Replay: what every fighter did this tick, a keyframe every few seconds
+        if world.replay_writer:
+            world.replay_writer.record([fighter.input_bits() for fighter in world.fighters],
+                                       lambda tick: capture_world(world.fighters, world.platform_data, tick,
+                                                                  projectile_styles))
+
+        # Check for game over condition
+        if current_game_mode == GameMode.FREE_FOR_ALL:
+            for fighter in active_fighters:
+                if fighter.health <= 0:
+                    knock_out(fighter)
+            over = sum(1 for fighter in world.fighters if fighter.health > 0) <= 1
+        else:
+            over = player1.health <= 0 or player2.health <= 0
+        if over:
+            # The final frame is still drawn, the game over screen starts from it
+            end_match()
+            return GAME_OVER
+
+    def mode_panel(self):
+        # Round/Mode indicator, drawn again when the text changes
+        if current_game_mode == GameMode.PLAYER_VS_PLAYER:
+            mode_text = "PvP Battle"
+        elif current_game_mode == GameMode.FREE_FOR_ALL:
+            mode_text = f"Free For All ({len(world.fighters) - len(knockout_order)} left)"
+        else:
+            mode_text = f"PvC ({ai_difficulty.name})"
+        if mode_text != self.mode_text:
+            self.mode_text = mode_text
+            self.mode_surface = pygame.Surface((200, 40), pygame.SRCALPHA)
+            pygame.draw.rect(self.mode_surface, (0, 0, 0), (0, 0, 200, 40), border_radius=5)
+            draw_text(self.mode_surface, mode_text, font, 100, 20, WHITE)
+        return self.mode_surface
+
+    def draw(self, surface):
+        # surface is frame_buffer, everything below is placed in logical coordinates and scaled by the queue
+        arena_background.draw(surface)
+
+        # Fighters, projectiles, platforms and powerups are all in all_sprites
+        for entity in world.all_sprites:
+            entity.submit(render_queue)
+        effects.submit(render_queue)
+        submit_particles(render_queue)
+
+        # HUD panels, the mode indicator and the sound icon in the corner
+        if current_game_mode == GameMode.FREE_FOR_ALL:
+            submit_ffa_hud(render_queue)
+        else:
+            submit_duel_hud(render_queue)
+        render_queue.submit(self.mode_panel(), (WIDTH // 2 - 100, 10), HUD)
+        render_queue.submit(sound_on_img if sound_enabled else sound_off_img, (WIDTH - 50, HEIGHT - 50), HUD)
+        render_queue.flush(surface, render_scale)
+
+        # Screen effects go into clips too
+        low_health = min((fighter.health / fighter.max_health for fighter in world.fighters
+                          if not fighter.is_ai and fighter.alive()), default=1.0)
+        heat = [pygame.Rect([value // render_scale for value in platform.rect])
+                for platform in world.platforms if platform.is_damaging]
+        post_fx.apply(surface, heat, low_health)
+
+        clip_recorder.capture(surface)
+
+        # Clip notices and debug info are drawn after the capture, they stay out of clips
+        width, height = surface.get_size()
+        if clip_recorder.recording:
+            pygame.draw.circle(surface, RED, (width - 80 // render_scale, height - 34 // render_scale), 8)
+        if pygame.time.get_ticks() < clip_message_until:
+            draw_text(surface, clip_message, small_font, width // 2, height - 30, WHITE)
+
+        # Debug info if enabled
+        if world.debug:
+            debug_text = [
+                f"FPS: {int(clock.get_fps())}",
+                f"P1: {player1.ai_state if player1.is_ai else 'Human'}",
+                f"P2: {player2.ai_state if player2.is_ai else 'Human'}",
+                f"Particles: {len(world.particles)}",
+                f"Powerups: {len(world.powerups)}",
+                f"Effects: {len(effects)}/{len(effects.slots)}  recycled {effects.recycled}",
+                f"Draw: {render_queue.summary()}",
+                f"Post FX: {post_fx.summary()}",
+                f"Quality: {quality.summary()}",
+                f"Input: {player_inputs.latency.summary()}  taps {player_inputs.taps}"
+            ]
+            if len(world.fighters) > 2:
+                debug_text.append(f"Fighters: {len(self.active_fighters)}/{len(world.fighters)}")
+            if player2.ai_planner:
+                debug_text.append(f"P2 search: {player2.ai_planner.search_time * 1000:.1f} ms "
+                                  f"over {player2.ai_planner.search_frames} frames")
+            for name, player in (("P1", player1), ("P2", player2)):
+                if player.is_ai:
+                    debug_text.append(f"{name} AI frame: {player.ai_latency.summary()}")
+                if player.ai_worker:
+                    debug_text.append(f"{name} AI {player.ai_worker.mode}: {player.ai_worker.latency.summary()}")
+
+            for i, text in enumerate(debug_text):
+                debug_surf = small_font.render(text, True, WHITE)
+                surface.blit(debug_surf, (10, height - 20 * (len(debug_text) + 1) + i * 20))
+
+
+def init_gamepads():
+    # SDL then reports every connected pad with JOYDEVICEADDED, player_inputs opens and assigns them
+    pygame.joystick.init()
+
+
+def asset_surfaces():
+    for asset in asset_loader.assets.values():
+        for item in asset if isinstance(asset, list) else (asset,):
+            if isinstance(item, pygame.Surface):
+                yield item
+
+
+def scene_surfaces():
+    # Backdrops and widgets the screens keep between visits
+    for scene in scenes.scenes.values():
+        for value in vars(scene).values():
+            for item in value if isinstance(value, (list, tuple)) else (value,):
+                if isinstance(item, pygame.Surface):
+                    yield item
+                elif isinstance(item, Widget):
+                    yield item.rendered
+
+
+def fighter_surfaces(fighter):
+    # Name, overhead label and HUD panel, the animation frames are shared assets
+    yield fighter.name_text
+    if fighter.label_surface:
+        yield fighter.label_surface[0]
+    yield fighter.hud_surface
+
+
+def sample_metrics():
+    # Gauges are read on the game thread, every flush interval
+    metrics.set("fps", round(clock.get_fps(), 1))
+    metrics.set("quality_level", quality.level)
+    metrics.set("fighters", sum(1 for fighter in world.fighters if fighter.alive()))
+    metrics.set("projectiles", sum(len(fighter.projectiles) for fighter in world.fighters))
+    metrics.set("particles", len(world.particles))
+    metrics.set("powerups", len(world.powerups))
+    metrics.set("effects", len(effects))
+    metrics.set("sprites", len(world.all_sprites))
+    channels = pygame.mixer.get_num_channels() if pygame.mixer.get_init() else 0
+    metrics.set("mixer_channels", channels)
+    metrics.set("mixer_channels_busy", sum(1 for i in range(channels) if pygame.mixer.Channel(i).get_busy()))
+    metrics.set("surface_bytes", sum(size for count, size in memory.surface_usage().values()))
+    resident = resident_bytes()
+    if resident is not None:
+        metrics.set("resident_bytes", resident)
+    if tracemalloc.is_tracing():
+        metrics.set("traced_bytes", tracemalloc.get_traced_memory()[0])
+
+
+def init_memory():
+    """Tell the memory monitor who owns which surfaces and what to count"""
+    memory.surfaces("canvas", lambda: [screen, frame_buffer])
+    memory.surfaces("render scale", lambda: render_queue.reduced.values())
+    memory.surfaces("assets", asset_surfaces)
+    memory.surfaces("flipped frames", cached_images)
+    memory.surfaces("render scale frames", lambda: render_queue.prescaled.values())
+    memory.surfaces("projectile frames", lambda: [frame.image for frame in projectile_frames.values()])
+    memory.surfaces("background", lambda: [layer.image for layer in [*background.layers, *arena_background.layers]])
+    memory.surfaces("text", cached_text)
+    memory.surfaces("particle dots", lambda: particle_dots.values())
+    memory.surfaces("ghosts, shields", lambda: [*ghost_images.values(), *shield_images.values()])
+    memory.surfaces("fighter labels", lambda: [surface for fighter in world.fighters
+                                               for surface in fighter_surfaces(fighter)])
+    memory.surfaces("platforms", lambda: [platform.image for platform in world.platforms])
+    memory.surfaces("powerups", lambda: [powerup.image for powerup in world.powerups])
+    memory.surfaces("projectiles", lambda: [projectile.image for fighter in world.fighters
+                                            for projectile in fighter.projectiles])
+    memory.surfaces("screens", scene_surfaces)
+    memory.surfaces("clip slots", lambda: clip_recorder.slots)
+
+    memory.watch(Samurai, Projectile, PowerUp, Platform, Particle, EffectSlot, pygame.sprite.Group)
+    memory.count("particles", lambda: len(world.particles))
+    memory.count("powerups", lambda: len(world.powerups))
+    memory.count("all_sprites", lambda: len(world.all_sprites))
+    memory.count("projectiles", lambda: sum(len(fighter.projectiles) for fighter in world.fighters))
+    memory.count("effects", lambda: len(effects))
+    memory.count("event backlog", lambda: len(event_log.buffer) if event_log else 0)
+    memory.count("replay bytes", lambda: clip_recorder.replay_size)
+
+
+def init_scenes():
+    """Build every screen once, the menus keep their widgets between visits"""
+    global scenes
+    scenes = SceneStack({
+        MAIN_MENU: MainMenuScene(),
+        OPTIONS_MENU: OptionsScene(),
+        GAME_MODE_SELECT: GameModeScene(),
+        CHARACTER_SELECT: CharacterSelectScene(),
+        PLAYING: PlayingScene(),
+        PAUSE_MENU: PauseScene(),
+        GAME_OVER: GameOverScene(),
+    })
+
+
+def run():
+    """The game loop, returns when the window is closed"""
+    global current_game_state, sound_enabled, clip_message, clip_message_until
+
+    if soak:
+        # Straight into an AI-only match, the next one starts as soon as one ends
+        reset_game()
+        scenes.show(PLAYING)
+    else:
+        scenes.show(MAIN_MENU)
+    running = True
+    previous_frame = None  # Start of the last match frame, for the interval between frames
+    next_sample = 0
+    while running:
+        frame_started = time.perf_counter()
+        current_game_state = scenes.state
+        events = scenes.poll()
+        player_inputs.feed(events)
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN:
+                # Toggle sound with M key
+                if event.key == pygame.K_m:
+                    sound_enabled = not sound_enabled
+                    if sound_enabled:
+                        start_music()
+                    else:
+                        pygame.mixer.stop()
+
+                # Toggle debug mode with F3
+                elif event.key == pygame.K_F3:
+                    world.debug = not world.debug
+
+                # Memory report with F7, from the second press on with the allocations that grew since the last
+                elif event.key == pygame.K_F7:
+                    print("\n".join(memory.report()))
+
+                # Save the instant replay with F9, start or stop recording a clip with F10
+                elif event.key == pygame.K_F9 and clip_recorder.replay_frames:
+                    clip_message = f"Saved {clip_recorder.save_replay()}"
+                    clip_message_until = pygame.time.get_ticks() + 2000
+                elif event.key == pygame.K_F10:
+                    clip_message = "Recording" if clip_recorder.toggle_recording() else "Recording saved"
+                    clip_message_until = pygame.time.get_ticks() + 2000
+        if not running:
+            break
+
+        # Files changed by the content team are swapped in before the frame that shows them
+        if hot_reload:
+            hot_reload.poll()
+
+        # Screens with nothing new to show skip drawing and presenting
+        playing = scenes.top.live
+        drawn_on = frame_buffer if playing else screen
+        if scenes.step(events, drawn_on):
+            present(drawn_on)
+            player_inputs.presented()
+
+        # Only gameplay frames are measured, the menus may wait for input
+        if playing:
+            frame_time = time.perf_counter() - frame_started
+            post_fx.frame_done(frame_time)
+            if quality.record(frame_time):
+                apply_quality()
+            if metrics:
+                metrics.observe("frame_work_seconds", frame_time)
+                if frame_time > 1 / FPS:
+                    metrics.inc("late_frames_total")
+                if previous_frame is not None:
+                    metrics.observe("frame_interval_seconds", frame_started - previous_frame)
+            previous_frame = frame_started
+        else:
+            previous_frame = None
+        if metrics and frame_started >= next_sample:
+            sample_metrics()
+            next_sample = frame_started + metrics.interval
+        if soak:
+            if scenes.state == GAME_OVER:
+                soak.matches += 1
+                reset_game()
+                scenes.show(PLAYING)
+            running = soak.tick()
+        clock.tick(FPS)
+
+
+def main(argv=None):
+    """Start the interactive client: parse the command line, open the window, load the assets and play"""
+    global soak
+    args = parser.parse_args(argv)
+    if not 4 <= args.fighters <= 16:
+        parser.error('--fighters must be between 4 and 16')
+
+    configure(args)
+    init_display(args)
+    init_fonts()
+    load_assets()
+    init_world()
+    init_scenes()
+    init_memory()
+    init_gamepads()
+    if hot_reload:
+        init_hot_reload()
+    atexit.register(finish_replay)
+    if soak_args:
+        soak = Soak(memory, soak_args.soak_log, soak_args.soak, soak_args.soak_interval)
+
+    # Start music loop if sound is enabled
+    if sound_enabled:
+        start_music()
+
+    run()
+    if soak:
+        soak.finish()
+    pygame.quit()
@@ -0,0 +1,93 @@
+"""Dev mode: content files reloaded while the game runs.
+
+``FileWatcher`` polls modification times. Every ``POLL_INTERVAL`` it lists
+the watched folders and stats the watched files, a few hundred system calls
+for the whole asset tree, with nothing outside the standard library and the
+same behaviour on every platform (inotify is Linux only and would need a
+binding). ``poll`` is called by the game loop between frames, so a callback
+can swap images into the live animation lists or rebuild the stage without
+any locking.
+
+A change is reported once the file has held still for a whole poll, so a
+PNG an editor is still writing is not decoded half written. A callback that
+fails prints the error and the game goes on; the next save tries again.
+"""
+import os
+import time
+
+from .assets import IMAGE_TYPES
+
+POLL_INTERVAL = 0.5  # Seconds
+
+
+def _stat(path):
+    # Modification time and size, None for a missing file
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _listing(folder, types):
+    """name -> stat of the files in ``folder`` with one of the ``types`` extensions."""
+    try:
+        names = [name for name in os.listdir(folder) if name.endswith(types)]
+    except OSError:
+        return {}
+    return {name: _stat(os.path.join(folder, name)) for name in names}
+
+
+class FileWatcher:
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self.folders = {}  # folder -> [callback, types, listing reported, listing seen last poll]
+        self.files = {}  # path -> [callback, stat reported, stat seen last poll]
+        self.next_poll = 0
+        self.reloads = 0
+
+    def watch_folder(self, folder, callback, types=IMAGE_TYPES):
+        """Call ``callback(names)`` with the changed file names, None when files came or went; once per folder."""
+        if folder not in self.folders:
+            listing = _listing(folder, types)
+            self.folders[folder] = [callback, types, listing, listing]
+
+    def watch_file(self, path, callback):
+        """Call ``callback()`` when the file changes."""
+        if path not in self.files:
+            stat = _stat(path)
+            self.files[path] = [callback, stat, stat]
+
+    def poll(self):
+        """Check for changes when the interval is up, main thread only."""
+        now = time.perf_counter()
+        if now < self.next_poll:
+            return
+        self.next_poll = now + self.interval
+
+        # Callbacks may watch more folders, e.g. a roster change naming a new sprite folder
+        for folder, entry in list(self.folders.items()):
+            callback, types, reported, seen = entry
+            listing = entry[3] = _listing(folder, types)
+            if listing == reported or listing != seen:
+                continue
+            entry[2] = listing
+            if listing.keys() == reported.keys():
+                self._call(folder, callback, sorted(name for name in listing if listing[name] != reported[name]))
+            else:
+                self._call(folder, callback, None)
+
+        for path, entry in list(self.files.items()):
+            callback, reported, seen = entry
+            stat = entry[2] = _stat(path)
+            if stat == reported or stat != seen or stat is None:
+                continue
+            entry[1] = stat
+            self._call(path, callback)
+
+    def _call(self, path, callback, *args):
+        self.reloads += 1
+        try:
+            callback(*args)
+        except Exception as e:  # A bad save must not end the session, the next one is picked up
+            print(f"Reloading {path} failed: {e}")
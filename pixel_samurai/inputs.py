@@ -0,0 +1,260 @@
+"""Player input from timestamped events instead of a once-per-frame key poll.
+
+Each player has an ``InputBuffer`` fed every KEYDOWN/KEYUP (and gamepad
+event) of the frame with the time it was polled. ``sample`` returns a
+mapping shaped like ``pygame.key.get_pressed()`` for ``handle_keys``: an
+action reads as pressed while its key is held *or* when it went down since
+the last sample, so a tap that starts and ends between two frames still
+counts for one frame instead of being lost.
+
+Presses that the game acted on are remembered until the frame showing them
+is flipped; ``InputPipeline.presented`` then records poll-to-flip latency in
+a ``LatencyStats`` for the debug overlay. pygame events carry no timestamp,
+so the time an event waited in SDL's queue before the poll is not included.
+
+Gamepads and arcade sticks are hot-plugged: SDL reports every device, also
+those connected at startup, with JOYDEVICEADDED, and the pipeline opens it
+and hands it to the first player without one. Its ``PadBinding`` comes from
+a JSON file keyed by device GUID, read once and cached per GUID; devices
+missing from the file get the default layout::
+
+    {"030000005e0400008e02000014010000": {"deadzone": 0.25, "axis": 0, "hat": 0,
+                                          "up": "jump", "buttons": {"0": "jump", "2": "attack", "1": "special"}}}
+
+Pad events are taken like the keyboard's, so a press released before the
+frame still counts. A missed release, though, would leave an action held, and
+two buttons bound to one action would let go of it with either. So once per
+tick ``InputPipeline.feed`` also reads the bound buttons, stick axes and hat
+of each assigned pad and sets the held actions from their state. That costs
+a few SDL calls per pad and catches up with anything an event missed.
+"""
+import json
+import os
+import time
+
+import pygame
+
+from .ai_worker import LatencyStats
+from .settings import FPS, CONTROL_ACTIONS
+
+# An input shown later than this after it was polled counts as a miss
+INPUT_DEADLINE = 2 / FPS
+
+# Default gamepad layout: face buttons and the left stick or d-pad
+PAD_BUTTONS = {0: 'jump', 1: 'special', 2: 'attack', 3: 'attack'}
+PAD_DEADZONE = 0.5
+
+
+class PadBinding:
+    """Which buttons and stick of one kind of device do what."""
+
+    def __init__(self, buttons=None, axis=0, hat=0, deadzone=PAD_DEADZONE, up=None):
+        self.buttons = PAD_BUTTONS if buttons is None else buttons  # button -> action
+        self.axis = axis  # Horizontal stick axis, the vertical one is the next
+        self.hat = hat
+        self.deadzone = deadzone
+        self.up = up  # Action for pushing up, e.g. 'jump' on an arcade stick
+
+    @classmethod
+    def from_json(cls, data):
+        # JSON keys are strings, SDL's button numbers are not
+        buttons = data.get('buttons')
+        if buttons is not None:
+            buttons = {int(button): action for button, action in buttons.items()}
+        return cls(buttons, data.get('axis', 0), data.get('hat', 0), data.get('deadzone', PAD_DEADZONE),
+                   data.get('up'))
+
+
+class InputBuffer:
+    def __init__(self, controls):
+        self.controls = controls  # action -> key, as given to Samurai
+        self.actions = {key: action for action, key in controls.items()}
+        self.joystick = None  # Instance id of the gamepad this player uses, if any
+        self.binding = None
+        self.held = dict.fromkeys(CONTROL_ACTIONS, False)
+        self.pad_held = dict.fromkeys(CONTROL_ACTIONS, False)
+        self.pressed = {}  # action -> poll time of its first press since the last sample
+        self.taps = 0  # Presses released before a frame saw them, a key poll would have missed these
+
+    def feed(self, event, now):
+        """Take one event, returns True when it was this player's."""
+        if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+            action = self.actions.get(event.key)
+            if action is None:
+                return False
+            self._set(self.held, action, event.type == pygame.KEYDOWN, now)
+            return True
+        if self.joystick is None or getattr(event, 'instance_id', None) != self.joystick:
+            return False
+        binding = self.binding
+        if event.type in (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP):
+            action = binding.buttons.get(event.button)
+            if action:
+                self._set(self.pad_held, action, event.type == pygame.JOYBUTTONDOWN, now)
+        elif event.type == pygame.JOYHATMOTION and event.hat == binding.hat:
+            self._set(self.pad_held, 'left', event.value[0] < 0, now)
+            self._set(self.pad_held, 'right', event.value[0] > 0, now)
+            if binding.up:
+                self._set(self.pad_held, binding.up, event.value[1] > 0, now)
+        elif event.type == pygame.JOYAXISMOTION and event.axis == binding.axis:
+            self._set(self.pad_held, 'left', event.value < -binding.deadzone, now)
+            self._set(self.pad_held, 'right', event.value > binding.deadzone, now)
+        elif event.type == pygame.JOYAXISMOTION and event.axis == binding.axis + 1 and binding.up:
+            self._set(self.pad_held, binding.up, event.value < -binding.deadzone, now)
+        else:
+            return False
+        return True
+
+    def poll(self, pad, now):
+        """Set the pad's held actions from the current state of its bound buttons, stick and hat."""
+        binding = self.binding
+        down = dict.fromkeys(CONTROL_ACTIONS, False)
+        buttons = pad.get_numbuttons()
+        for button, action in binding.buttons.items():
+            if button < buttons and pad.get_button(button):
+                down[action] = True
+        if binding.hat < pad.get_numhats():
+            x, y = pad.get_hat(binding.hat)
+            down['left'] |= x < 0
+            down['right'] |= x > 0
+            if binding.up:
+                down[binding.up] |= y > 0
+        axes = pad.get_numaxes()
+        if binding.axis < axes:
+            x = pad.get_axis(binding.axis)
+            down['left'] |= x < -binding.deadzone
+            down['right'] |= x > binding.deadzone
+        if binding.up and binding.axis + 1 < axes:
+            down[binding.up] |= pad.get_axis(binding.axis + 1) < -binding.deadzone
+        for action, pressed in down.items():
+            self._set(self.pad_held, action, pressed, now)
+
+    def _set(self, held, action, down, now):
+        if down and not held[action]:
+            self.pressed.setdefault(action, now)
+        held[action] = down
+
+    def sample(self):
+        """This frame's keys for handle_keys, plus the poll times of the presses in it."""
+        keys = {}
+        for action, key in self.controls.items():
+            held = self.held[action] or self.pad_held[action]
+            if action in self.pressed and not held:
+                self.taps += 1
+            keys[key] = held or action in self.pressed
+        times = list(self.pressed.values())
+        self.pressed.clear()
+        return keys, times
+
+    def release(self, pad_only=False):
+        """Let go of everything, e.g. when the window loses focus and the key-ups go elsewhere."""
+        for held in (self.pad_held,) if pad_only else (self.held, self.pad_held):
+            for action in held:
+                held[action] = False
+        self.pressed.clear()
+
+    def clear(self):
+        # Presses made on a menu must not carry into the match
+        self.pressed.clear()
+
+
+class InputPipeline:
+    def __init__(self, *controls):
+        self.buffers = [InputBuffer(player_controls) for player_controls in controls]
+        self.latency = LatencyStats()
+        self._shown = []  # Poll times of the presses the next flip shows
+        self.pads = {}  # instance id -> open Joystick
+        self.bindings_path = None
+        self._bindings = None  # GUID -> PadBinding, read on the first device
+        self._binding_cache = {}
+
+    def feed(self, events):
+        now = time.perf_counter()
+        for event in events:
+            if event.type == pygame.WINDOWFOCUSLOST:
+                for buffer in self.buffers:
+                    buffer.release()
+            elif event.type == pygame.JOYDEVICEADDED:
+                self.device_added(event.device_index)
+            elif event.type == pygame.JOYDEVICEREMOVED:
+                self.device_removed(event.instance_id)
+            for buffer in self.buffers:
+                if buffer.feed(event, now):
+                    break
+        for buffer in self.buffers:
+            if buffer.joystick is not None:
+                buffer.poll(self.pads[buffer.joystick], now)
+
+    def binding(self, guid):
+        """The binding for a device GUID, from the bindings file or the default layout."""
+        if guid not in self._binding_cache:
+            if self._bindings is None:
+                self._bindings = {}
+                if self.bindings_path and os.path.exists(self.bindings_path):
+                    try:
+                        with open(self.bindings_path) as file:
+                            self._bindings = json.load(file)
+                    except (OSError, ValueError) as e:
+                        print(f"Gamepad bindings: {e}")
+            self._binding_cache[guid] = PadBinding.from_json(self._bindings.get(guid, {}))
+        return self._binding_cache[guid]
+
+    def device_added(self, index):
+        pad = pygame.joystick.Joystick(index)
+        instance_id = pad.get_instance_id()
+        if instance_id in self.pads:
+            return
+        self.pads[instance_id] = pad
+        self._assign()
+
+    def device_removed(self, instance_id):
+        pad = self.pads.pop(instance_id, None)
+        if pad is None:
+            return
+        for buffer in self.buffers:
+            if buffer.joystick == instance_id:
+                buffer.release(pad_only=True)
+                buffer.joystick = buffer.binding = None
+        # A spare pad takes over the freed player
+        self._assign()
+
+    def _assign(self):
+        taken = {buffer.joystick for buffer in self.buffers}
+        spare = [instance_id for instance_id in self.pads if instance_id not in taken]
+        for buffer in self.buffers:
+            if buffer.joystick is None and spare:
+                instance_id = spare.pop(0)
+                buffer.joystick = instance_id
+                buffer.binding = self.binding(self.pads[instance_id].get_guid())
+                print(f"Gamepad {self.pads[instance_id].get_name()} controls player {self.buffers.index(buffer) + 1}")
+
+    def buffer(self, controls):
+        """The buffer of the player using ``controls``."""
+        for buffer in self.buffers:
+            if buffer.controls is controls:
+                return buffer
+        raise KeyError(controls)
+
+    def sample(self, controls):
+        keys, times = self.buffer(controls).sample()
+        self._shown += times
+        return keys
+
+    def clear(self):
+        for buffer in self.buffers:
+            buffer.clear()
+        self._shown.clear()
+
+    def presented(self):
+        """Call right after the flip: records the latency of every press the frame acted on."""
+        now = time.perf_counter()
+        for polled in self._shown:
+            latency = now - polled
+            self.latency.add(latency)
+            if latency > INPUT_DEADLINE:
+                self.latency.misses += 1
+        self._shown.clear()
+
+    @property
+    def taps(self):
+        return sum(buffer.taps for buffer in self.buffers)
@@ -0,0 +1,223 @@
+"""Search-based planner behind the Master AI.
+
+Every search loads a ``WorldState`` of the duel into a ``DuelBatch`` with one
+arena per candidate action sequence (move, jump, attack, special, dodge and
+the previous best plan), steps all of them ``horizon`` frames ahead against a
+model of the opponent, and keeps the best scoring sequence as the plan.
+
+Stepping is spread over as many frames as the per-frame time ``budget``
+needs: ``act`` keeps following the current plan while the next search runs,
+and new candidates start with the frames of the current plan that will have
+been played by the time the search finishes.
+
+``decide`` runs a whole search at once instead, for use on an ``AIWorker``.
+"""
+import math
+import time
+
+import numpy as np
+
+from .settings import FPS, MAX_SPECIAL, SPRITE_SIZE, CONTROL_ACTIONS
+from .simulation import DuelBatch, LEFT, RIGHT, JUMP, ATTACK, SPECIAL
+
+HORIZON = 30  # Frames looked ahead, half a second at 60 FPS
+FRAME_BUDGET = 0.002  # Seconds of search per game frame
+
+# Score weights, damage is in health points
+DISCOUNT = 0.97  # Per frame, sooner hits count more
+KNOCKOUT_BONUS = 100
+TAKEN_WEIGHT = 1.3  # Avoiding damage matters slightly more than dealing it
+ROUTE_WEIGHT = 0.1  # Per frame of route still needed to reach the opponent
+LINED_UP_BONUS = 3  # Facing the opponent at the same height, ready to shoot
+THREAT_PENALTY = 4  # Per hostile projectile still heading at us
+KEEP_PLAN_BONUS = 0.5  # Avoid dithering between equally good plans
+
+# The opponent model walks in until this close, then turns to face and keeps firing
+OPPONENT_RANGE = 250
+
+IDLE = (False,) * len(CONTROL_ACTIONS)
+
+
+def _sequence(horizon, move=0, jump=False, fire=None, fire_from=0, turn_at=None):
+    # One candidate: hold ``move`` (-1/0/1), jump off at the start, press ``fire`` from ``fire_from`` on,
+    # reverse the direction at frame ``turn_at``
+    plan = np.zeros((horizon, len(CONTROL_ACTIONS)), bool)
+    if move:
+        plan[:turn_at, RIGHT if move > 0 else LEFT] = True
+        if turn_at is not None:
+            plan[turn_at:, LEFT if move > 0 else RIGHT] = True
+    if jump:
+        plan[:3, JUMP] = True  # on_ground flickers for a frame or two while standing
+    if fire is not None:
+        plan[fire_from:, fire] = True
+    return plan
+
+
+class LookaheadPlanner:
+    """Plans for fighter 0 of the worlds passed to ``act`` against fighter 1."""
+
+    def __init__(self, nav_graph=None, horizon=HORIZON, budget=FRAME_BUDGET):
+        self.nav_graph = nav_graph
+        self.horizon = horizon
+        self.budget = budget
+        self.names, self.sequences = self._build_sequences()
+
+        self.batch = None
+        self.platforms = None
+        self.plan = np.zeros((horizon, len(CONTROL_ACTIONS)), bool)
+        self.plan_tick = 0
+        self.intent = "idle"
+        self.search = None
+
+        # Stats for the debug overlay
+        self.searches = 0
+        self.search_frames = 1  # Frames the last search was spread over
+        self.search_time = 0.0  # Seconds of stepping the last search took
+
+    def _build_sequences(self):
+        h = self.horizon
+        names = []
+        sequences = []
+
+        def add(name, **kwargs):
+            names.append(name)
+            sequences.append(_sequence(h, **kwargs))
+
+        for move, move_name in ((-1, "left"), (0, "stand"), (1, "right")):
+            for jump in (False, True):
+                for fire, fire_name in ((None, ""), (ATTACK, " attack"), (SPECIAL, " special")):
+                    add(move_name + (" jump" if jump else "") + fire_name, move=move, jump=jump, fire=fire)
+            if move:
+                add(move_name + " then attack", move=move, fire=ATTACK, fire_from=8)
+                add(move_name + " dodge and return", move=move, jump=True, turn_at=12)
+        # Last row is replaced by the previous plan on every search
+        names.append("keep plan")
+        sequences.append(np.zeros((h, len(CONTROL_ACTIONS)), bool))
+        return names, np.stack(sequences)
+
+    def act(self, world):
+        """Buttons (in CONTROL_ACTIONS order) to press on ``world.tick``."""
+        deadline = time.perf_counter() + self.budget
+        if self.search is None:
+            self._begin(world)
+        self._advance(deadline)
+
+        step = world.tick - self.plan_tick
+        if 0 <= step < self.horizon:
+            return tuple(self.plan[step])
+        return IDLE
+
+    def decide(self, world):
+        """Search from ``world`` to the end and return (plan, tick of its first row, intent)."""
+        self._begin(world)
+        self._advance(float("inf"))
+        # Off the game loop the plan starts playing once the answer is back, roughly the search time later
+        self.search_frames = max(1, math.ceil(self.search_time * FPS))
+        return self.plan, self.plan_tick, self.intent
+
+    def _begin(self, world):
+        if self.batch is None or world.platforms != self.platforms:
+            self.platforms = world.platforms
+            self.batch = DuelBatch(len(self.sequences), len(world.fighters), world.platforms)
+            self.actions = np.zeros((len(self.sequences), len(world.fighters), len(CONTROL_ACTIONS)), bool)
+        self.batch.load(world)
+
+        # Whatever the current plan does until the search is expected to finish is already decided
+        start = world.tick - self.plan_tick
+        prefix = min(self.search_frames, self.horizon // 2)
+        previous = self.plan[min(max(start, 0), self.horizon - 1):]
+        previous = np.concatenate([previous, np.repeat(previous[-1:], self.horizon - len(previous), 0)])
+        previous[:, JUMP] &= np.arange(self.horizon) < 3
+        candidates = np.empty_like(self.sequences)
+        candidates[:, :prefix] = previous[:prefix]
+        candidates[:, prefix:] = self.sequences[:, :self.horizon - prefix]
+        candidates[-1] = previous
+        if world.fighters[0].special_meter < MAX_SPECIAL:
+            candidates[:, :, SPECIAL] = False
+
+        discount = DISCOUNT ** np.arange(self.horizon)
+        self.search = {
+            "tick": world.tick,
+            "candidates": candidates,
+            "discount": discount,
+            "step": 0,
+            "frames": 0,
+            "time": 0.0,
+            "dealt": np.zeros(len(candidates)),
+            "taken": np.zeros(len(candidates)),
+        }
+
+    def _advance(self, deadline):
+        search = self.search
+        batch = self.batch
+        actions = self.actions
+        search["frames"] += 1
+        started = time.perf_counter()
+        while search["step"] < self.horizon:
+            step = search["step"]
+            actions[:, 0] = search["candidates"][:, step]
+            self._opponent_actions(actions)
+            batch.step(actions)
+            search["dealt"] += batch.damage_done[:, 0] * search["discount"][step]
+            search["taken"] += batch.damage_taken[:, 0] * search["discount"][step]
+            search["step"] += 1
+            if time.perf_counter() >= deadline:
+                break
+        search["time"] += time.perf_counter() - started
+
+        if search["step"] >= self.horizon:
+            self._finish()
+
+    def _opponent_actions(self, actions):
+        # Walk in from afar, turn to face when close, and fire whenever ready
+        b = self.batch
+        dx = b.x[:, 0] - b.x[:, 1]
+        close = np.abs(dx) <= OPPONENT_RANGE
+        facing_away = (dx > 0) != (b.facing[:, 1] > 0)
+        actions[:, 1:] = False
+        actions[:, 1, LEFT] = (dx < 0) & (~close | facing_away)
+        actions[:, 1, RIGHT] = (dx > 0) & (~close | facing_away)
+        actions[:, 1, ATTACK] = True
+        actions[:, 1, SPECIAL] = True
+
+    def _finish(self):
+        search = self.search
+        scores = self._score(search["dealt"], search["taken"])
+        scores[-1] += KEEP_PLAN_BONUS
+        best = int(np.argmax(scores))
+
+        self.plan = search["candidates"][best]
+        self.plan_tick = search["tick"]
+        if best != len(scores) - 1:
+            self.intent = self.names[best]
+        self.searches += 1
+        self.search_frames = search["frames"]
+        self.search_time = search["time"]
+        self.search = None
+
+    def _score(self, dealt, taken):
+        b = self.batch
+        scores = dealt - TAKEN_WEIGHT * taken
+        scores += np.where(b.health[:, 1] <= 0, KNOCKOUT_BONUS, 0)
+        scores -= np.where(b.health[:, 0] <= 0, KNOCKOUT_BONUS, 0)
+
+        dx = b.x[:, 1] - b.x[:, 0]
+        dy = np.abs(b.y[:, 1] - b.y[:, 0])
+        lined_up = (dy < 50) & ((dx > 0) == (b.facing[:, 0] > 0))
+        scores += np.where(lined_up, LINED_UP_BONUS, 0)
+
+        # Hostile projectiles that will still reach us after the horizon
+        center_y = b.y[:, 0:1] + SPRITE_SIZE / 2
+        offset = b.x[:, 0:1] + SPRITE_SIZE / 2 - b.proj_x
+        incoming = (b.proj_active & (b.proj_owner != 0) & (np.abs(b.proj_y - center_y) < SPRITE_SIZE / 2) &
+                    (offset * b.proj_dir > 0) & (np.abs(offset) < 200))
+        scores -= THREAT_PENALTY * incoming.sum(axis=1)
+
+        if self.nav_graph is not None:
+            nav = self.nav_graph
+            for arena in range(b.arenas):
+                source = nav.locate(b.x[arena, 0] + SPRITE_SIZE / 2, b.y[arena, 0] + SPRITE_SIZE)
+                target = nav.locate(b.x[arena, 1] + SPRITE_SIZE / 2, b.y[arena, 1] + SPRITE_SIZE)
+                if source is not None and target is not None and nav.dist[source][target] != float("inf"):
+                    scores[arena] -= ROUTE_WEIGHT * nav.dist[source][target]
+        return scores
@@ -0,0 +1,173 @@
+"""Memory accounting for cabinets that run for days.
+
+A ``MemoryMonitor`` gathers three kinds of numbers on demand:
+
+* surface memory by owner. Pixels live in SDL, outside Python's allocator,
+  so neither ``gc`` nor ``tracemalloc`` sees them; owners register a
+  function listing their surfaces instead. A surface listed by several
+  owners (a projectile's image is also in the projectile frame cache)
+  counts once, for the first owner registered;
+* live instances of watched classes, counted by one walk over ``gc``, and
+  sizes of containers such as the particle list;
+* ``tracemalloc`` snapshots, each compared with the one before to show the
+  lines whose allocations grew.
+
+``Soak`` samples the monitor every minute or so into a JSON lines file and
+at the end fits a straight line through every number, so a steady climb
+stands out from the ups and downs of a match.
+"""
+import gc
+import json
+import time
+import tracemalloc
+
+SAMPLE_INTERVAL = 60  # Seconds between soak samples
+TRACE_FRAMES = 1  # Stack depth tracemalloc records
+TOP_LINES = 10
+GROWTH_SHOWN = 0.05  # Growth over the run, as a fraction of the mean, worth flagging
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+class MemoryMonitor:
+    def __init__(self):
+        self.owners = []  # (name, function returning surfaces)
+        self.classes = {}  # class -> name
+        self.counters = []  # (name, function returning a number)
+        self._snapshot = None
+
+    def surfaces(self, owner, source):
+        """Account the surfaces ``source()`` returns to ``owner``."""
+        self.owners.append((owner, source))
+
+    def watch(self, *classes):
+        for cls in classes:
+            self.classes[cls] = cls.__name__
+
+    def count(self, name, source):
+        self.counters.append((name, source))
+
+    def surface_usage(self):
+        """owner -> (surfaces, bytes)"""
+        seen = set()
+        usage = {}
+        for owner, source in self.owners:
+            count = size = 0
+            for surface in source():
+                if surface is not None and id(surface) not in seen:
+                    seen.add(id(surface))
+                    count += 1
+                    size += surface_bytes(surface)
+            usage[owner] = (count, size)
+        return usage
+
+    def object_counts(self, objects=None):
+        counts = dict.fromkeys(self.classes.values(), 0)
+        classes = self.classes
+        for obj in gc.get_objects() if objects is None else objects:
+            name = classes.get(type(obj))
+            if name:
+                counts[name] += 1
+        return counts
+
+    def sample(self):
+        """Every number as one flat dict, for the soak log."""
+        sample = {"time": round(time.time(), 1)}
+        usage = self.surface_usage()
+        for owner, (count, size) in usage.items():
+            sample[f"surfaces.{owner}"] = size
+        sample["surfaces.total"] = sum(size for count, size in usage.values())
+        objects = gc.get_objects()
+        for name, count in self.object_counts(objects).items():
+            sample[f"objects.{name}"] = count
+        for name, source in self.counters:
+            sample[f"count.{name}"] = source()
+        if tracemalloc.is_tracing():
+            sample["traced"] = tracemalloc.get_traced_memory()[0]
+        sample["gc.tracked"] = len(objects)
+        return sample
+
+    def snapshot(self, limit=TOP_LINES):
+        """Lines of the biggest allocation growth since the last snapshot; the first call starts tracing."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._snapshot = None
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        previous, self._snapshot = self._snapshot, snapshot
+        if previous is None:
+            return ["tracemalloc started, the next snapshot shows what grew"]
+        return [str(stat) for stat in snapshot.compare_to(previous, "lineno")[:limit]]
+
+    def report(self):
+        """Readable lines: surfaces by owner, live objects, counters and the tracemalloc growth."""
+        lines = ["Surfaces:"]
+        for owner, (count, size) in self.surface_usage().items():
+            lines.append(f"  {owner:<18} {count:6} {size / 1024 / 1024:8.2f} MB")
+        lines.append("Objects: " + ", ".join(f"{name} {count}" for name, count in self.object_counts().items()))
+        lines.append("Counts: " + ", ".join(f"{name} {source()}" for name, source in self.counters))
+        lines.append("Allocations:")
+        lines += ["  " + line for line in self.snapshot()]
+        return lines
+
+
+def trend(samples):
+    """name -> (first, last, change per hour) of every number, by a least squares line over the samples."""
+    if len(samples) < 2:
+        return {}
+    times = [sample["time"] for sample in samples]
+    mean_time = sum(times) / len(times)
+    spread = sum((t - mean_time) ** 2 for t in times) or 1
+    trends = {}
+    for name in samples[-1]:
+        if name == "time" or any(name not in sample for sample in samples):
+            continue
+        values = [sample[name] for sample in samples]
+        mean = sum(values) / len(values)
+        slope = sum((t - mean_time) * (v - mean) for t, v in zip(times, values)) / spread
+        trends[name] = (values[0], values[-1], slope * 3600)
+    return trends
+
+
+class Soak:
+    """Samples ``monitor`` into ``path`` for ``hours``, then writes and prints the trends."""
+
+    def __init__(self, monitor, path, hours, interval=SAMPLE_INTERVAL):
+        self.monitor = monitor
+        self.path = path
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.ends = self.started + hours * 3600
+        self.next_sample = self.started
+        self.samples = []
+        self.matches = 0
+        self.file = open(path, "a")
+        monitor.count("matches", lambda: self.matches)
+        tracemalloc.start(TRACE_FRAMES)
+
+    def tick(self):
+        """Call once a frame, False once the soak is over."""
+        now = time.perf_counter()
+        if now >= self.next_sample:
+            self.next_sample = now + self.interval
+            sample = self.monitor.sample()
+            self.samples.append(sample)
+            self.file.write(json.dumps(sample) + "\n")
+            self.file.flush()
+        return now < self.ends
+
+    def finish(self):
+        trends = trend(self.samples)
+        hours = (time.perf_counter() - self.started) / 3600
+        lines = [f"Soak: {hours:.2f} h, {self.matches} matches, {len(self.samples)} samples"]
+        for name, (first, last, per_hour) in sorted(trends.items()):
+            mean = (first + last) / 2 or 1
+            flag = "  GROWING" if per_hour * hours > GROWTH_SHOWN * abs(mean) and last > first else ""
+            lines.append(f"  {name:<28} {first:>12} -> {last:<12} {per_hour:+.1f}/h{flag}")
+        self.file.write(json.dumps({"summary": {name: list(values) for name, values in trends.items()}}) + "\n")
+        self.file.close()
+        print("\n".join(lines))
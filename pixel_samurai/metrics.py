@@ -0,0 +1,202 @@
+"""Operational metrics for a fleet of cabinets.
+
+The game updates counters, gauges and histograms in memory as it runs; a
+background thread renders them every few seconds and writes them out, so
+the game never waits on a file or a socket:
+
+* a path ending in ``.prom`` is rewritten with the Prometheus text format,
+  for node_exporter's textfile collector;
+* any other path gets one JSON object per flush appended, rotated past
+  ``MAX_BYTES``;
+* with a port, ``GET /metrics`` answers the last Prometheus text rendered.
+
+Updates take a lock only long enough to bump a number. Gauges are set by
+the game (on its own thread, at its own pace), the writer never reads
+game state.
+"""
+import json
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FLUSH_INTERVAL = 5  # Seconds
+MAX_BYTES = 16 * 1024 * 1024
+PREFIX = "pixel_samurai_"
+
+# Upper bounds in seconds, Prometheus style (each bucket counts everything up to its bound)
+FRAME_BUCKETS = (0.004, 0.008, 0.012, 0.0167, 0.025, 0.033, 0.05, 0.1, 0.25)
+MATCH_BUCKETS = (15, 30, 60, 90, 120, 180, 300, 600)
+
+
+def resident_bytes():
+    """Memory the process has in RAM, None where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last one is above every bound
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def copy(self):
+        histogram = Histogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.sum, histogram.count = self.sum, self.count
+        return histogram
+
+
+class Metrics:
+    def __init__(self, path=None, port=None, interval=FLUSH_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.host = socket.gethostname()
+        self.descriptions = {}
+        self.kinds = {}
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.prometheus = ""  # Last rendering, served over HTTP
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server = None
+        if port:
+            self._server = ThreadingHTTPServer(("", port), self._handler())
+            threading.Thread(target=self._server.serve_forever, name="Metrics server", daemon=True).start()
+        self._thread = threading.Thread(target=self._run, name="Metrics", daemon=True)
+        self._thread.start()
+
+    # Declaring
+    def counter(self, name, description):
+        self._declare(name, "counter", description)
+        self.counters[name] = 0
+
+    def gauge(self, name, description):
+        self._declare(name, "gauge", description)
+
+    def histogram(self, name, description, buckets):
+        self._declare(name, "histogram", description)
+        self.histograms[name] = Histogram(buckets)
+
+    def _declare(self, name, kind, description):
+        self.kinds[name] = kind
+        self.descriptions[name] = description
+
+    # Updating, from the game
+    def inc(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def set(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name, value):
+        with self._lock:
+            self.histograms[name].observe(value)
+
+    # Writing, on the metrics thread
+    def snapshot(self):
+        with self._lock:
+            return (dict(self.counters), dict(self.gauges),
+                    {name: histogram.copy() for name, histogram in self.histograms.items()})
+
+    def render_prometheus(self, snapshot):
+        counters, gauges, histograms = snapshot
+        lines = []
+        for name, kind in self.kinds.items():
+            full = PREFIX + name
+            if kind == "gauge" and name not in gauges:
+                continue
+            lines.append(f"# HELP {full} {self.descriptions[name]}")
+            lines.append(f"# TYPE {full} {kind}")
+            if kind == "counter":
+                lines.append(f"{full} {counters[name]}")
+            elif kind == "gauge":
+                lines.append(f"{full} {gauges[name]}")
+            else:
+                histogram = histograms[name]
+                total = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    total += count
+                    lines.append(f'{full}_bucket{{le="{bound}"}} {total}')
+                lines.append(f'{full}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f"{full}_sum {histogram.sum}")
+                lines.append(f"{full}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def render_json(self, snapshot):
+        counters, gauges, histograms = snapshot
+        record = {"time": round(time.time(), 3), "host": self.host, **counters, **gauges}
+        for name, histogram in histograms.items():
+            record[name] = {"count": histogram.count, "sum": round(histogram.sum, 6),
+                            "avg": round(histogram.sum / histogram.count, 6) if histogram.count else None,
+                            "buckets": dict(zip(map(str, histogram.buckets + ("+Inf",)), histogram.counts))}
+        return json.dumps(record) + "\n"
+
+    def flush(self):
+        snapshot = self.snapshot()
+        if self._server or (self.path and self.path.endswith(".prom")):
+            self.prometheus = self.render_prometheus(snapshot)
+        if not self.path:
+            return
+        try:
+            if self.path.endswith(".prom"):
+                # Written aside and moved in, a collector never reads half a file
+                with open(self.path + ".tmp", "w") as file:
+                    file.write(self.prometheus)
+                os.replace(self.path + ".tmp", self.path)
+            else:
+                data = self.render_json(snapshot)
+                if os.path.exists(self.path) and os.path.getsize(self.path) + len(data) > MAX_BYTES:
+                    os.replace(self.path, self.path + ".1")
+                with open(self.path, "a") as file:
+                    file.write(data)
+        except OSError as e:
+            print(f"Metrics: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+        self.flush()
+
+    def _handler(self):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the console
+
+        return Handler
+
+    def close(self):
+        """Write the final numbers and stop the writer and the server."""
+        self._stop.set()
+        self._thread.join()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
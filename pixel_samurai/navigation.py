@@ -0,0 +1,280 @@
+"""Platform navigation graph for the AI.
+
+Built once per stage from the platform layout. Each platform is a node and
+edges are the moves a samurai can make between them (walk, jump, drop),
+worked out from ``jump_power``, ``GRAVITY`` and ``speed`` by replaying the
+frame-by-frame motion of ``Samurai``. Shortest routes between every pair of
+platforms are precomputed, so a per-frame route query is a table lookup.
+"""
+from .settings import WIDTH, GRAVITY, SAMURAI_SPEED, JUMP_POWER, MAX_FALL_SPEED, SPRITE_SIZE
+
+WALK = "walk"
+JUMP = "jump"
+DROP = "drop"
+
+# Extra cost in frames for routes through lava
+LAVA_PENALTY = 120
+
+# Only count on this share of the horizontal air reach, the AI does not steer perfectly
+AIR_CONTROL = 0.8
+
+# Ignore targets closer than this when walking to a goal x
+ARRIVE_DISTANCE = 10
+
+
+def air_frames(rise, vel_y, gravity=GRAVITY, max_fall=MAX_FALL_SPEED):
+    """Frames until feet starting at height 0 with ``vel_y`` land on a ledge ``rise`` pixels higher.
+
+    Returns None if the ledge is out of reach. Mirrors apply_gravity followed by the
+    position update in Samurai.update, and landing only happening while falling.
+    """
+    height = 0.0
+    apex = 0.0
+    for frame in range(1, 600):
+        vel_y = min(vel_y + gravity, max_fall)
+        height -= vel_y
+        apex = max(apex, height)
+        if vel_y > 0 and height < rise:
+            return frame if apex >= rise else None
+    return None
+
+
+class NavNode:
+    __slots__ = ("index", "left", "right", "top", "lava", "center")
+
+    def __init__(self, index, left, right, top, lava):
+        self.index = index
+        self.left = left  # Range the fighter's centerx can stand in
+        self.right = right
+        self.top = top
+        self.lava = lava
+        self.center = (left + right) / 2
+
+
+class NavEdge:
+    __slots__ = ("kind", "source", "target", "cost", "takeoff_min", "takeoff_max", "direction", "land_min", "land_max")
+
+    def __init__(self, kind, source, target, cost, takeoff_min, takeoff_max, direction, land_min, land_max):
+        self.kind = kind
+        self.source = source
+        self.target = target
+        self.cost = cost
+        self.takeoff_min = takeoff_min  # Centerx range on the source to start the move from
+        self.takeoff_max = takeoff_max
+        self.direction = direction  # -1/1 to walk off for drops, 0 when any direction works
+        self.land_min = land_min  # Centerx range that lands on the target
+        self.land_max = land_max
+
+    def __repr__(self):
+        return f"NavEdge({self.kind}, {self.source}->{self.target}, cost={self.cost})"
+
+
+class NavGraph:
+    def __init__(self, platforms, jump_power=JUMP_POWER, gravity=GRAVITY, speed=SAMURAI_SPEED,
+                 body_width=SPRITE_SIZE, max_fall=MAX_FALL_SPEED):
+        """``platforms`` is an iterable of (x, y, width, height, type) tuples or Platform sprites."""
+        self.jump_power = jump_power
+        self.gravity = gravity
+        self.speed = speed
+        self.half_width = body_width / 2
+        self.max_fall = max_fall
+
+        self.nodes = []
+        for platform in platforms:
+            if hasattr(platform, "rect"):
+                x, y, w = platform.rect.x, platform.rect.y, platform.rect.width
+                kind = platform.platform_type
+            else:
+                x, y, w, _, kind = platform
+            # Keep centerx on the platform and inside the screen clamp of Samurai.update
+            left = max(x, self.half_width)
+            right = min(x + w, WIDTH - self.half_width)
+            if left <= right:
+                self.nodes.append(NavNode(len(self.nodes), left, right, y, kind == "lava"))
+
+        count = len(self.nodes)
+        self.edges = [[] for _ in range(count)]
+        for source in self.nodes:
+            for target in self.nodes:
+                if source is not target:
+                    edge = self._best_edge(source, target)
+                    if edge:
+                        self.edges[source.index].append(edge)
+
+        self._shortest_paths()
+        self._locate_cache = {}
+        self._escape_cache = {}
+
+    def _best_edge(self, source, target):
+        candidates = [self._walk_edge(source, target), self._jump_edge(source, target)]
+        candidates.extend(self._drop_edges(source, target))
+        candidates = [edge for edge in candidates if edge]
+        if not candidates:
+            return None
+        edge = min(candidates, key=lambda e: e.cost)
+        if target.lava:
+            edge.cost += LAVA_PENALTY
+        return edge
+
+    def _landing_range(self, target):
+        # Any overlap with the platform lands, but aim for the middle half of the body
+        margin = self.half_width / 2
+        return target.left - margin, target.right + margin
+
+    def _walk_edge(self, source, target):
+        if abs(source.top - target.top) > 2:
+            return None
+        gap = max(target.left - source.right, source.left - target.right)
+        if gap > self.half_width:
+            return None
+        direction = 1 if target.center > source.center else -1
+        land_min, land_max = self._landing_range(target)
+        cost = 1 + max(gap, 0) / self.speed
+        return NavEdge(WALK, source.index, target.index, cost, source.left, source.right, direction,
+                       land_min, land_max)
+
+    def _jump_edge(self, source, target):
+        frames = air_frames(source.top - target.top, self.jump_power, self.gravity, self.max_fall)
+        if frames is None:
+            return None
+        reach = self.speed * frames * AIR_CONTROL
+        land_min, land_max = self._landing_range(target)
+        takeoff_min = max(source.left, land_min - reach)
+        takeoff_max = min(source.right, land_max + reach)
+        if takeoff_min > takeoff_max:
+            return None
+        return NavEdge(JUMP, source.index, target.index, frames, takeoff_min, takeoff_max, 0, land_min, land_max)
+
+    def _drop_edges(self, source, target):
+        if target.top <= source.top:
+            return []
+        frames = air_frames(source.top - target.top, 0.0, self.gravity, self.max_fall)
+        if frames is None:
+            return []
+        reach = self.speed * frames * AIR_CONTROL
+        land_min, land_max = self._landing_range(target)
+        edges = []
+        for direction, edge_x in ((1, source.right), (-1, source.left)):
+            # Support is lost once the body clears the edge, then the fall carries it on
+            leave_x = edge_x + direction * self.half_width
+            lo, hi = sorted((leave_x, leave_x + direction * reach))
+            if lo <= land_max and hi >= land_min and 0 <= leave_x <= WIDTH:
+                walk = abs(edge_x - source.center) / self.speed
+                edges.append(NavEdge(DROP, source.index, target.index, frames + walk,
+                                     source.left, source.right, direction, land_min, land_max))
+        return edges
+
+    def _shortest_paths(self):
+        # Floyd-Warshall over the handful of platforms, keeping the first edge of each route
+        count = len(self.nodes)
+        inf = float("inf")
+        self.dist = [[0.0 if i == j else inf for j in range(count)] for i in range(count)]
+        self.first_edge = [[None] * count for _ in range(count)]
+        for source, edges in enumerate(self.edges):
+            for edge in edges:
+                self.dist[source][edge.target] = edge.cost
+                self.first_edge[source][edge.target] = edge
+        for k in range(count):
+            dist_k = self.dist[k]
+            for i in range(count):
+                dist_ik = self.dist[i][k]
+                if dist_ik == inf:
+                    continue
+                dist_i = self.dist[i]
+                first_i = self.first_edge[i]
+                for j in range(count):
+                    if dist_ik + dist_k[j] < dist_i[j]:
+                        dist_i[j] = dist_ik + dist_k[j]
+                        first_i[j] = first_i[k]
+
+    def locate(self, centerx, bottom):
+        """Node a fighter stands on, or the first one below it while airborne (None over a gap)."""
+        key = (int(centerx) >> 3, int(bottom) >> 2)
+        node = self._locate_cache.get(key, -1)
+        if node != -1:
+            return node
+        node = None
+        best_top = None
+        for candidate in self.nodes:
+            if (candidate.left - self.half_width < centerx < candidate.right + self.half_width and
+                    candidate.top >= bottom - 4 and (best_top is None or candidate.top < best_top)):
+                node = candidate.index
+                best_top = candidate.top
+        self._locate_cache[key] = node
+        return node
+
+    def next_edge(self, source, target):
+        """First edge of the fastest route between two nodes (None if already there or unreachable)."""
+        if source is None or target is None or source == target:
+            return None
+        return self.first_edge[source][target]
+
+    def route(self, source, target):
+        """Full list of edges from ``source`` to ``target``."""
+        edges = []
+        while source != target:
+            edge = self.next_edge(source, target)
+            if edge is None:
+                break
+            edges.append(edge)
+            source = edge.target
+        return edges
+
+    def escape_node(self, source, threat):
+        """Node that can be reached soonest relative to how long ``threat`` needs to get there."""
+        key = (source, threat)
+        node = self._escape_cache.get(key, -1)
+        if node != -1:
+            return node
+        node = source
+        if source is not None and threat is not None:
+            best = None
+            for candidate in range(len(self.nodes)):
+                if candidate == threat or self.dist[source][candidate] == float("inf"):
+                    continue
+                margin = self.dist[threat][candidate] - self.dist[source][candidate]
+                if best is None or margin > best:
+                    node, best = candidate, margin
+        self._escape_cache[key] = node
+        return node
+
+    def flank_x(self, node, target_x, target_facing_right, distance=120):
+        """Centerx behind a target standing on ``node``, falling back to its front if the ledge is too short."""
+        area = self.nodes[node]
+        behind = target_x - distance if target_facing_right else target_x + distance
+        if area.left <= behind <= area.right:
+            return behind
+        front = target_x + distance if target_facing_right else target_x - distance
+        return min(max(front, area.left), area.right)
+
+    def steer(self, source, target, centerx, goal_x=None):
+        """Input to follow the route for one frame: (direction, jump).
+
+        ``goal_x`` is the centerx to walk to once on the ``target`` node.
+        """
+        if source is None or target is None:
+            return 0, False
+        if source == target:
+            if goal_x is None or abs(goal_x - centerx) < ARRIVE_DISTANCE:
+                return 0, False
+            return (1 if goal_x > centerx else -1), False
+
+        edge = self.first_edge[source][target]
+        if edge is None:
+            return 0, False
+        if edge.kind == DROP or edge.kind == WALK:
+            return edge.direction, False
+        if centerx < edge.takeoff_min:
+            return 1, False
+        if centerx > edge.takeoff_max:
+            return -1, False
+        return self.air_steer(edge, centerx), True
+
+    def air_steer(self, edge, centerx):
+        """Direction to hold while in the air on ``edge``."""
+        target = self.nodes[edge.target]
+        if centerx < target.left:
+            return 1
+        if centerx > target.right:
+            return -1
+        return 0
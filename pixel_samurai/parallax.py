@@ -0,0 +1,145 @@
+"""Pre-rendered parallax background shared by the menus and the arena.
+
+Each layer is drawn once into a display-format strip that tiles seamlessly
+and scrolls at its own rate; drawing a layer is at most two area blits of
+the strip, whatever its content. A PNG named after a layer in the
+backgrounds folder (``sky.png``, ``mountains.png``, ...) replaces the
+generated art for that layer.
+"""
+import os
+import random
+
+import pygame
+
+
+class ParallaxLayer:
+    def __init__(self, name, image, rate, y=0):
+        self.name = name
+        self.image = image
+        self.rate = rate  # Pixels scrolled per frame, negative drifts right
+        self.y = y
+        self.offset = 0.0
+        self.enabled = True
+
+    def scaled(self, factor):
+        """This layer ``factor`` times smaller, for a low resolution buffer."""
+        width, height = self.image.get_size()
+        image = pygame.transform.scale(self.image, (width // factor, height // factor))
+        if self.image.get_colorkey():
+            image.set_colorkey(self.image.get_colorkey(), pygame.RLEACCEL)
+        layer = ParallaxLayer(self.name, image, self.rate / factor, self.y // factor)
+        layer.enabled = self.enabled
+        return layer
+
+    def scroll(self, frames=1):
+        self.offset = (self.offset + self.rate * frames) % self.image.get_width()
+
+    def draw(self, surface):
+        strip_width, strip_height = self.image.get_size()
+        view_width = surface.get_width()
+        x = int(self.offset)
+        # Wrap around: the tail of the strip, then its head if the tail does not fill the view
+        first = min(strip_width - x, view_width)
+        surface.blit(self.image, (0, self.y), (x, 0, first, strip_height))
+        if first < view_width:
+            surface.blit(self.image, (first, self.y), (0, 0, view_width - first, strip_height))
+
+
+class ParallaxBackground:
+    def __init__(self, layers):
+        self.layers = layers
+
+    def layer(self, name):
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def scaled(self, factor):
+        return ParallaxBackground([layer.scaled(factor) for layer in self.layers])
+
+    def update(self, frames=1):
+        for layer in self.layers:
+            layer.scroll(frames)
+
+    def draw(self, surface):
+        for layer in self.layers:
+            if layer.enabled:
+                layer.draw(surface)
+
+
+def _tiled_polygons(surface, color, shapes, strip_width):
+    # Draw every shape a strip width to each side too, so the strip wraps without a seam
+    for points in shapes:
+        for shift in (-strip_width, 0, strip_width):
+            pygame.draw.polygon(surface, color, [(x + shift, y) for x, y in points])
+
+
+def _sky(width, height, rng):
+    sky = pygame.Surface((width, height))
+    for y in range(0, height, 4):
+        color_value = max(50, 150 - y // 3)
+        pygame.draw.line(sky, (color_value, color_value + 50, 255), (0, y), (width, y), 4)
+    return sky.convert()
+
+
+def _ridge(strip_width, strip_height, step, peaks, low, high, jitter, color, rng):
+    # Row of jagged hills along the bottom of a transparent strip
+    strip = pygame.Surface((strip_width, strip_height))
+    strip.fill((255, 0, 255))
+    shapes = []
+    for x in range(0, strip_width, step):
+        top = strip_height - rng.randint(low, high)
+        points = [(x, top)]
+        for i in range(peaks):
+            points.append((x + (i + 1) * step // (peaks + 1), top + rng.randint(-jitter, jitter)))
+        points += [(x + step + 50, top), (x + step + 50, strip_height), (x, strip_height)]
+        shapes.append(points)
+    _tiled_polygons(strip, color, shapes, strip_width)
+    strip = strip.convert()
+    strip.set_colorkey((255, 0, 255), pygame.RLEACCEL)
+    return strip
+
+
+def _ground(strip_width, rng):
+    ground = pygame.Surface((strip_width, 50))
+    ground.fill((50, 150, 50))
+    for x in range(0, strip_width, 8):
+        pygame.draw.line(ground, (30, 120, 30), (x, 0), (x, rng.randint(2, 6)), 2)
+    return ground.convert()
+
+
+def _clouds(strip_width, strip_height, count, rng):
+    strip = pygame.Surface((strip_width, strip_height), pygame.SRCALPHA)
+    for _ in range(count):
+        w = rng.randint(100, 200)
+        h = rng.randint(50, 100)
+        x = rng.randint(0, strip_width)
+        y = rng.randint(0, strip_height - h)
+        cloud = pygame.Surface((w, h), pygame.SRCALPHA)
+        pygame.draw.ellipse(cloud, (255, 255, 255, rng.randint(100, 180)), (0, 0, w, h))
+        for shift in (-strip_width, 0):
+            strip.blit(cloud, (x + shift, y))
+    return strip.convert_alpha()
+
+
+def build_background(width, height, folder=None, seed=7):
+    """Sky, far mountains, hills, ground and clouds for a ``width`` x ``height`` view."""
+    rng = random.Random(seed)
+    strip_width = width * 2
+
+    def image(name, generate):
+        path = os.path.join(folder, name + ".png") if folder else None
+        if path and os.path.exists(path):
+            return pygame.image.load(path).convert_alpha()
+        return generate()
+
+    mountains = image("mountains", lambda: _ridge(strip_width, 230, 200, 5, 100, 200, 30, (80, 80, 100), rng))
+    hills = image("hills", lambda: _ridge(strip_width, 145, 150, 4, 60, 120, 25, (30, 100, 30), rng))
+    return ParallaxBackground([
+        ParallaxLayer("sky", image("sky", lambda: _sky(width, height, rng)), 0),
+        ParallaxLayer("mountains", mountains, 0.25, height - mountains.get_height()),
+        ParallaxLayer("clouds", image("clouds", lambda: _clouds(strip_width, height // 3 + 100, 20, rng)), -0.4, 50),
+        ParallaxLayer("hills", hills, 0.5, height - hills.get_height()),
+        ParallaxLayer("ground", image("ground", lambda: _ground(strip_width, rng)), 1, height - 50),
+    ])
@@ -0,0 +1,280 @@
+"""Screen effects applied to the finished match frame, in place.
+
+``PostFX.apply`` runs after the scene and HUD are drawn and before the frame
+is captured and flipped:
+
+* shake, after a special attack: the frame scrolls by a few pixels;
+* heat, above lava platforms: warmer colours, strongest near the lava;
+* desaturation, while a player's health is low: colours fade to grey;
+* hit flash, when a fighter is hit: the frame brightens and fades back;
+* vignette: darker edges and corners.
+
+Flash and heat are a multiply then an add per channel, ``BLEND_RGB_MULT``
+and ``BLEND_RGB_ADD`` blits of a strip of one colour filled per call; the
+heat only covers the air above the lava. The vignette multiplies the four
+edge bands by shaded strips made once per canvas size. Desaturation is the
+only effect that reads pixels: the grey share of every pixel, its luma times
+the fade, is worked out from ``pygame.surfarray.pixels2d`` with in-place
+integer numpy operations, a band of rows at a time so the scratch array stays
+in the CPU cache. The colours are then faded with a multiply blit and the
+grey share added straight into the pixels. Every array and surface is made up
+front, nothing frame-sized is allocated per frame.
+
+Every effect has a cost budget. One that overruns it for several frames in
+a row (a single frame for the short shake and flash, which would be over
+before the count was reached), or the most expensive one when a whole frame
+was late, is suspended for a while and then tried again; each suspension in
+a row lasts twice as long, up to ``SUSPEND_LIMIT`` times the first.
+"""
+import random
+import time
+
+import numpy as np
+import pygame
+
+from .ai_worker import LatencyStats
+from .settings import FPS
+
+FRAME_BUDGET = 1 / FPS
+OVER_BUDGET_FRAMES = 10  # Overruns in a row before an effect is suspended
+SUSPEND_FRAMES = 5 * FPS
+SUSPEND_LIMIT = 16
+
+# Effect: cost budget in seconds, in the order they are applied
+BUDGETS = {"shake": 0.0005, "heat": 0.0005, "desaturate": 0.004, "flash": 0.0015, "vignette": 0.0005}
+# Overruns in a row before a suspension, for effects that last fewer frames than OVER_BUDGET_FRAMES
+PATIENCE = {"shake": 1, "flash": 1}
+
+SHAKE_FRAMES = 12
+SHAKE_PIXELS = 6
+HEAT_HEIGHT = 90  # Rows above a lava platform that shimmer
+HEAT_STEPS = 10  # Strength steps from the lava upwards
+LOW_HEALTH = 0.3  # Health fraction under which the colours start to fade
+DESATURATE_STEPS = 8
+DESATURATE_MAX = 0.8
+DESATURATE_BAND = 96  # Rows worked on at a time, few enough for the arrays to stay in the CPU cache
+FLASH_FRAMES = 6
+FLASH_STRENGTH = 0.35
+VIGNETTE_BAND = 0.12  # Fraction of the width and height the edges darken over
+VIGNETTE_STRENGTH = 0.35
+STRIP_HEIGHT = 96  # Rows of the one-colour strip the blends are blitted from
+LUMA_WEIGHTS = (77, 150, 29)  # Red, green and blue in 8.8 fixed point
+
+
+def _ramp(levels, strength, multiply, add):
+    """A (multiply colour, add colour) per strength step, the effect at (step / (levels - 1)) * strength."""
+    steps = []
+    for step in range(levels):
+        k = step / (levels - 1) * strength
+        steps.append((tuple(round(255 * min(1.0, m(k))) for m in multiply), tuple(round(a(k)) for a in add)))
+    return steps
+
+
+class PostEffect:
+    def __init__(self, name, budget, patience=OVER_BUDGET_FRAMES):
+        self.name = name
+        self.budget = budget
+        self.patience = patience
+        self.cost = LatencyStats(window=FPS)
+        self.over = 0  # Frames in a row over the budget
+        self.suspended = 0  # Frames left before it runs again
+        self.suspensions = 0  # In a row, each doubles the wait
+
+    def measure(self, seconds):
+        self.cost.add(seconds)
+        if seconds > self.budget:
+            self.cost.misses += 1
+            self.over += 1
+            if self.over >= self.patience:
+                self.suspend()
+        else:
+            self.over = 0
+            self.suspensions = 0
+
+    def suspend(self):
+        self.suspended = SUSPEND_FRAMES * min(2 ** self.suspensions, SUSPEND_LIMIT)
+        self.suspensions += 1
+        self.over = 0
+
+
+class PostFX:
+    def __init__(self, budgets=BUDGETS):
+        self.effects = {name: PostEffect(name, budget, PATIENCE.get(name, OVER_BUDGET_FRAMES))
+                        for name, budget in budgets.items()}
+        self.enabled = True
+        self.pixel_size = 1  # Logical pixels per pixel of the frame, 2 on a half resolution buffer
+        self.late = False
+        self.ran = []  # Effects applied to the last frame
+        self.shake_frames = 0
+        self.flash_frames = 0
+
+        # Multiply and add colours, a pair per strength step
+        white = (lambda k: 1 - k,) * 3
+        self.flash_steps = _ramp(FLASH_FRAMES + 1, FLASH_STRENGTH, white, (lambda k: 255 * k,) * 3)
+        # Red and green brighten by about their average gain, blue fades
+        self.heat_steps = _ramp(HEAT_STEPS + 1, 1.0, (lambda k: 1, lambda k: 1, lambda k: 1 - 0.3 * k),
+                                (lambda k: 48 * k, lambda k: 6 * k, lambda k: 0))
+        self.desaturate_alphas = [round(255 * DESATURATE_MAX * step / DESATURATE_STEPS)
+                                  for step in range(DESATURATE_STEPS + 1)]
+        self._size = None
+
+    def reset(self):
+        # A new match starts without the last one's shake and flash
+        self.shake_frames = 0
+        self.flash_frames = 0
+
+    def shake(self, frames=SHAKE_FRAMES):
+        self.shake_frames = max(self.shake_frames, frames)
+
+    def flash(self):
+        self.flash_frames = FLASH_FRAMES
+
+    def frame_done(self, seconds):
+        """Report the work time of a match frame, a late one makes the next apply shed an effect."""
+        self.late = seconds > FRAME_BUDGET
+
+    def apply(self, surface, heat=(), health=1.0):
+        """Apply the effects to ``surface``; ``heat`` are the lava platforms' rects, ``health`` is the lowest
+        player's health fraction."""
+        for effect in self.effects.values():
+            if effect.suspended:
+                effect.suspended -= 1
+        if self.late and self.ran:
+            # The costliest effect applied to the late frame goes first
+            max(self.ran, key=lambda effect: effect.cost.samples[-1]).suspend()
+        self.late = False
+        self.ran = []
+        if not self.enabled:
+            return
+        if self._size != surface.get_size():
+            self._prepare(surface)
+
+        if self.shake_frames > 0:
+            self.shake_frames -= 1
+            self._run("shake", self._shake, surface)
+        if heat:
+            self._run("heat", self._heat, surface, heat)
+        if health < LOW_HEALTH and self._luma_multiplier:
+            level = round(DESATURATE_STEPS * min(1.0, (LOW_HEALTH - health) / LOW_HEALTH))
+            if level:
+                self._run("desaturate", self._desaturate, surface, level)
+        if self.flash_frames:
+            self._run("flash", self._flash, surface, self.flash_frames)
+            self.flash_frames -= 1
+        self._run("vignette", self._vignette, surface)
+
+    def _run(self, name, apply, *args):
+        effect = self.effects[name]
+        if effect.suspended:
+            return
+        started = time.perf_counter()
+        apply(*args)
+        effect.measure(time.perf_counter() - started)
+        self.ran.append(effect)
+
+    def _prepare(self, surface):
+        size = self._size = surface.get_size()
+        width, height = size
+        self._bounds = pygame.Rect(0, 0, width, height)
+        self._strip = pygame.Surface((width, min(STRIP_HEIGHT, height))).convert(surface)
+
+        # The luma sum works on whole 32-bit pixels with green in the middle byte: red and blue are multiplied
+        # by their weights at once, (r << 16 | b) * (w_r | w_b << 16) has r * w_r + b * w_b in the top half
+        shifts = surface.get_shifts()[:3]
+        self._luma_multiplier = None
+        if surface.get_bytesize() == 4 and shifts[1] == 8 and sorted((shifts[0], shifts[2])) == [0, 16]:
+            red, green, blue = LUMA_WEIGHTS
+            low, high = (red, blue) if shifts[0] == 16 else (blue, red)
+            self._luma_multiplier = np.uint32(low | high << 16)
+            self._sums = np.empty((height, width), dtype=np.uint32)
+            self._scratch = np.empty((min(DESATURATE_BAND, height), width), dtype=np.uint32)
+
+        # Darkening per column and per row, 1 away from the edges; a corner gets both
+        def falloff(length, band):
+            edge = np.minimum(np.arange(length), np.arange(length)[::-1]).astype(np.float32)
+            return 1 - VIGNETTE_STRENGTH * (1 - np.minimum(edge / band, 1)) ** 2
+
+        def shade(mask):
+            strip = pygame.Surface(mask.shape).convert(surface)
+            pygame.surfarray.blit_array(strip, np.repeat((mask * 255).round().astype(np.uint8)[..., None], 3, 2))
+            return strip
+
+        band_x, band_y = int(width * VIGNETTE_BAND), int(height * VIGNETTE_BAND)
+        columns, rows = falloff(width, band_x), falloff(height, band_y)
+        # Top and bottom bands span the width, the side bands fill in between
+        self._vignette_bands = [
+            (shade(columns[:, None] * rows[None, :band_y]), (0, 0)),
+            (shade(columns[:, None] * rows[None, -band_y:]), (0, height - band_y)),
+            (shade(np.repeat(columns[:band_x, None], height - 2 * band_y, 1)), (0, band_y)),
+            (shade(np.repeat(columns[-band_x:, None], height - 2 * band_y, 1)), (width - band_x, band_y)),
+        ]
+
+    def _blend(self, surface, colors, area):
+        """Multiply then add ``area`` of ``surface`` by a (multiply, add) pair of colours."""
+        multiply, add = colors
+        strip = self._strip
+        used = pygame.Rect(0, 0, area.width, min(strip.get_height(), area.height))
+        for color, flags in ((multiply, pygame.BLEND_RGB_MULT), (add, pygame.BLEND_RGB_ADD)):
+            if color in ((255, 255, 255), (0, 0, 0)):
+                continue  # Would leave the pixels as they are
+            strip.fill(color, used)
+            for top in range(area.top, area.bottom, used.height):
+                surface.blit(strip, (area.left, top), used.clip(0, 0, area.width, area.bottom - top),
+                             special_flags=flags)
+
+    def _shake(self, surface):
+        # Surface.scroll moves the pixels in place, the uncovered strip keeps its old pixels
+        pixels = SHAKE_PIXELS // self.pixel_size
+        surface.scroll(random.randint(-pixels, pixels), random.randint(-pixels, pixels))
+
+    def _heat(self, surface, rects):
+        step_height = HEAT_HEIGHT // HEAT_STEPS // self.pixel_size
+        for rect in rects:
+            # Slices of the air above the lava, hottest at the bottom
+            for step in range(HEAT_STEPS):
+                area = pygame.Rect(rect.x, rect.top - (step + 1) * step_height, rect.width, step_height)
+                area = area.clip(self._bounds)
+                if area:
+                    self._blend(surface, self.heat_steps[HEAT_STEPS - step], area)
+
+    def _desaturate(self, surface, level):
+        alpha = self.desaturate_alphas[level]
+        # Transposed, the view walks the rows in memory order like the arrays
+        pixels = pygame.surfarray.pixels2d(surface).T
+        for top in range(0, len(pixels), DESATURATE_BAND):
+            band = pixels[top:top + DESATURATE_BAND]
+            sums = self._sums[top:top + DESATURATE_BAND]
+            scratch = self._scratch[:len(band)]
+            np.bitwise_and(band, 0xff00ff, out=sums)
+            np.multiply(sums, self._luma_multiplier, out=sums)
+            np.right_shift(sums, 16, out=sums)
+            np.bitwise_and(band, 0xff00, out=scratch)
+            np.multiply(scratch, LUMA_WEIGHTS[1], out=scratch)
+            np.right_shift(scratch, 8, out=scratch)
+            np.add(sums, scratch, out=sums)
+            np.right_shift(sums, 8, out=sums)
+            # The grey share of every channel, (luma * alpha) >> 8 in all three bytes
+            np.multiply(sums, alpha, out=sums)
+            np.right_shift(sums, 8, out=sums)
+            np.multiply(sums, 0x010101, out=sums)
+        del band, pixels  # Unlocks the surface for blitting
+        # The colour share: a multiply blit leaves (c * (255 - alpha) + 255) >> 8, which plus the grey share
+        # is at most 255, so adding whole pixels never carries into the next channel
+        self._blend(surface, ((255 - alpha,) * 3, (0, 0, 0)), self._bounds)
+        pixels = pygame.surfarray.pixels2d(surface).T
+        np.add(pixels, self._sums, out=pixels)
+
+    def _flash(self, surface, frames):
+        self._blend(surface, self.flash_steps[frames], self._bounds)
+
+    def _vignette(self, surface):
+        for strip, position in self._vignette_bands:
+            surface.blit(strip, position, special_flags=pygame.BLEND_RGB_MULT)
+
+    def summary(self):
+        """Short text for the debug overlay."""
+        parts = []
+        for effect in self.effects.values():
+            cost = effect.cost.percentile(50) * 1000
+            parts.append(f"{effect.name} {'off' if effect.suspended else f'{cost:.1f}'}")
+        return "  ".join(parts)
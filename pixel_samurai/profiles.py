@@ -0,0 +1,218 @@
+"""Player profiles, match history and ratings in a local SQLite database.
+
+The game hands finished matches to ``ProfileStore.record_match``, which only
+queues them; a writer thread inserts whatever has queued up in a single
+transaction and updates the players' Elo ratings and running totals as it
+goes. The database is in WAL mode so reads never wait for that writer.
+
+Every fighter of a match gets a row, numbered by seat. Fighters sharing a
+name (a mirror match, several AIs of one difficulty) add up to one match for
+that player and are not rated against each other.
+
+Leaderboards come straight off an index on the rating and per-player totals
+are kept on the player row, so neither scans the match history::
+
+    python -m pixel_samurai.profiles --db profiles.db leaderboard
+    python -m pixel_samurai.profiles --db profiles.db player "Red Samurai"
+"""
+import argparse
+import queue
+import sqlite3
+import threading
+import time
+
+START_RATING = 1500.0
+K_FACTOR = 32
+BATCH = 256  # Matches written per transaction at most
+
+STATS = ("hits_landed", "damage_dealt", "jumps_made", "specials_used")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    rating REAL NOT NULL DEFAULT 1500,
+    matches INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    hits_landed INTEGER NOT NULL DEFAULT 0,
+    damage_dealt INTEGER NOT NULL DEFAULT 0,
+    jumps_made INTEGER NOT NULL DEFAULT 0,
+    specials_used INTEGER NOT NULL DEFAULT 0,
+    last_played REAL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    played REAL NOT NULL,
+    mode TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    ticks INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS match_players (
+    match_id INTEGER NOT NULL REFERENCES matches(id),
+    seat INTEGER NOT NULL,
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    place INTEGER NOT NULL,
+    health INTEGER NOT NULL,
+    hits_landed INTEGER NOT NULL,
+    damage_dealt INTEGER NOT NULL,
+    jumps_made INTEGER NOT NULL,
+    specials_used INTEGER NOT NULL,
+    rating_before REAL NOT NULL,
+    rating_after REAL NOT NULL,
+    PRIMARY KEY (match_id, seat)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS players_by_rating ON players (rating DESC);
+CREATE INDEX IF NOT EXISTS match_players_by_player ON match_players (player_id, match_id);
+CREATE INDEX IF NOT EXISTS matches_by_mode ON matches (mode, played);
+"""
+
+
+def connect(path):
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def elo_changes(ratings, places, names=None):
+    """Rating change per player, every pair of players counts as one game split K ways; pairs with the same
+    ``names`` entry are not a game."""
+    count = len(ratings)
+    changes = [0.0] * count
+    if count < 2:
+        return changes
+    k = K_FACTOR / (count - 1)
+    for a in range(count):
+        for b in range(a + 1, count):
+            if names and names[a] == names[b]:
+                continue
+            expected = 1 / (1 + 10 ** ((ratings[b] - ratings[a]) / 400))
+            score = 1.0 if places[a] < places[b] else 0.5 if places[a] == places[b] else 0.0
+            changes[a] += k * (score - expected)
+            changes[b] -= k * (score - expected)
+    return changes
+
+
+class ProfileStore:
+    def __init__(self, path):
+        self.path = path
+        self.reader = connect(path)
+        self.pending = queue.Queue()
+        self.written = 0
+        self._writer = threading.Thread(target=self._run, name="Profile store", daemon=True)
+        self._writer.start()
+
+    def record_match(self, mode, difficulty, ticks, results):
+        """Queue a finished match.
+
+        ``results`` holds one dict per player with ``name``, ``place`` (1 is
+        the winner), ``health`` and the STATS counters.
+        """
+        self.pending.put((time.time(), mode, difficulty, ticks, results))
+
+    def _run(self):
+        writer = connect(self.path)
+        while True:
+            batch = [self.pending.get()]
+            while len(batch) < BATCH:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            matches = [match for match in batch if match is not None]
+            try:
+                with writer:
+                    for match in matches:
+                        self._insert(writer, *match)
+                self.written += len(matches)
+            except sqlite3.Error as e:
+                print(f"Profile store: {e}")
+            for _ in batch:
+                self.pending.task_done()
+            if stop:
+                writer.close()
+                return
+
+    def _insert(self, db, played, mode, difficulty, ticks, results):
+        players = {}  # name -> (id, rating)
+        for result in results:
+            if result["name"] not in players:
+                db.execute("INSERT OR IGNORE INTO players (name, rating) VALUES (?, ?)",
+                           (result["name"], START_RATING))
+                players[result["name"]] = db.execute("SELECT id, rating FROM players WHERE name = ?",
+                                                     (result["name"],)).fetchone()
+        names = [result["name"] for result in results]
+        changes = elo_changes([players[name][1] for name in names], [result["place"] for result in results], names)
+
+        match_id = db.execute("INSERT INTO matches (played, mode, difficulty, ticks) VALUES (?, ?, ?, ?)",
+                              (played, mode, difficulty, ticks)).lastrowid
+        totals = {}  # name -> [rating change, won, *STATS] over its seats
+        for seat, (result, change) in enumerate(zip(results, changes), 1):
+            player_id, rating = players[result["name"]]
+            stats = [result[name] for name in STATS]
+            db.execute("INSERT INTO match_players VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                       (match_id, seat, player_id, result["place"], result["health"], *stats, rating,
+                        rating + change))
+            total = totals.setdefault(result["name"], [0.0, 0] + [0] * len(STATS))
+            total[0] += change
+            total[1] |= result["place"] == 1
+            for index, value in enumerate(stats, 2):
+                total[index] += value
+        for name, (change, won, *stats) in totals.items():
+            db.execute("UPDATE players SET rating = rating + ?, matches = matches + 1, wins = wins + ?, "
+                       "hits_landed = hits_landed + ?, damage_dealt = damage_dealt + ?, "
+                       "jumps_made = jumps_made + ?, specials_used = specials_used + ?, last_played = ? "
+                       "WHERE id = ?", (change, int(won), *stats, played, players[name][0]))
+
+    def flush(self):
+        """Wait until everything queued so far is written."""
+        self.pending.join()
+
+    def close(self):
+        self.pending.put(None)
+        self._writer.join()
+        self.reader.close()
+
+    def leaderboard(self, limit=10):
+        """(name, rating, matches, wins) of the best rated players."""
+        return self.reader.execute("SELECT name, rating, matches, wins FROM players ORDER BY rating DESC LIMIT ?",
+                                   (limit,)).fetchall()
+
+    def player(self, name):
+        """Totals of one player as a dict, None for an unknown name."""
+        cursor = self.reader.execute("SELECT * FROM players WHERE name = ?", (name,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([column[0] for column in cursor.description], row))
+
+    def history(self, name, limit=20):
+        """Most recent matches of one player: (played, mode, difficulty, place, rating change)."""
+        return self.reader.execute(
+            "SELECT m.played, m.mode, m.difficulty, mp.place, mp.rating_after - mp.rating_before "
+            "FROM players p JOIN match_players mp ON mp.player_id = p.id JOIN matches m ON m.id = mp.match_id "
+            "WHERE p.name = ? ORDER BY mp.match_id DESC, mp.seat LIMIT ?", (name, limit)).fetchall()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Show player ratings and statistics')
+    parser.add_argument('--db', default='profiles.db', help='Profile database')
+    parser.add_argument('command', choices=['leaderboard', 'player'])
+    parser.add_argument('name', nargs='?', help='Player name for the player command')
+    args = parser.parse_args()
+    store = ProfileStore(args.db)
+    if args.command == 'leaderboard':
+        for rank, (name, rating, matches, wins) in enumerate(store.leaderboard(), 1):
+            print(f"{rank:3}. {name:24} {rating:7.1f}  {wins}/{matches} won")
+    else:
+        totals = store.player(args.name)
+        if totals is None:
+            parser.error(f"no player named {args.name!r}")
+        for key, value in totals.items():
+            print(f"{key:14} {value}")
+        for played, mode, difficulty, place, change in store.history(args.name):
+            print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(played))}  {mode:20} {difficulty:7} "
+                  f"place {place}  {change:+.1f}")
+    store.close()
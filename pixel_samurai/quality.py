@@ -0,0 +1,73 @@
+"""Visual quality levels and the governor that picks one from measured frame times.
+
+``LEVELS`` runs from everything on to the cheapest look; each step turns
+down the next feature in priority order (particles first, the background
+layers last). The fixed presets pin one level, ``auto`` lets the governor
+step down while the frame time percentile is over budget and back up when
+there is clear headroom.
+"""
+from .ai_worker import LatencyStats
+from .settings import FPS
+
+LEVELS = [
+    # particles: emission scale, max_particles: live cap, ghosts: speed boost copies,
+    # layers: background layers drawn besides the sky and ground
+    {"particles": 1.0, "max_particles": 400, "ghosts": 3, "layers": ("mountains", "clouds", "hills")},
+    {"particles": 0.5, "max_particles": 300, "ghosts": 3, "layers": ("mountains", "clouds", "hills")},
+    {"particles": 0.5, "max_particles": 200, "ghosts": 1, "layers": ("mountains", "clouds", "hills")},
+    {"particles": 0.25, "max_particles": 150, "ghosts": 1, "layers": ("mountains", "hills")},
+    {"particles": 0.25, "max_particles": 100, "ghosts": 0, "layers": ("hills",)},
+    {"particles": 0.1, "max_particles": 50, "ghosts": 0, "layers": ()},
+]
+
+PRESETS = {"high": 0, "medium": 2, "low": len(LEVELS) - 1, "auto": 0}
+PRESET_NAMES = ("low", "medium", "high", "auto")
+
+FRAME_BUDGET = 1 / FPS
+PERCENTILE = 95
+STEP_DOWN_AT = 1.0  # Fraction of the budget the percentile may reach before stepping down
+STEP_UP_BELOW = 0.6  # ... and has to stay under before stepping back up
+WINDOW = 90  # Frames measured at a level before judging it
+STEP_UP_WINDOW = 300  # Stepping up again is judged over a longer window, to avoid flapping
+
+
+class QualityGovernor:
+    def __init__(self, preset="auto", budget=FRAME_BUDGET):
+        self.budget = budget
+        self.frames = LatencyStats(window=STEP_UP_WINDOW)
+        self.set_preset(preset)
+
+    def set_preset(self, preset):
+        self.preset = preset
+        self.auto = preset == "auto"
+        self._set_level(PRESETS[preset])
+
+    def _set_level(self, level):
+        self.level = level
+        settings = LEVELS[level]
+        self.particles = settings["particles"]
+        self.max_particles = settings["max_particles"]
+        self.ghosts = settings["ghosts"]
+        self.layers = settings["layers"]
+        self.frames.samples.clear()
+
+    def record(self, seconds):
+        """Add the work time of one frame, returns True when the level changed."""
+        frames = self.frames
+        frames.add(seconds)
+        if not self.auto or len(frames.samples) < WINDOW:
+            return False
+
+        if frames.percentile(PERCENTILE) > self.budget * STEP_DOWN_AT and self.level < len(LEVELS) - 1:
+            self._set_level(self.level + 1)
+            return True
+        if (len(frames.samples) >= STEP_UP_WINDOW and self.level > 0 and
+                frames.percentile(PERCENTILE) < self.budget * STEP_UP_BELOW):
+            self._set_level(self.level - 1)
+            return True
+        return False
+
+    def summary(self):
+        """Short text for the debug overlay."""
+        return (f"{self.preset} level {self.level}/{len(LEVELS) - 1}  "
+                f"p{PERCENTILE} {self.frames.percentile(PERCENTILE) * 1000:.1f} ms")
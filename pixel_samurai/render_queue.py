@@ -0,0 +1,99 @@
+"""A frame's sprites drawn in layers through one queue.
+
+Everything the match shows submits ``(surface, position)`` to the
+``RenderQueue`` once per frame, with the layer it belongs on. ``flush``
+draws the layers bottom to top with one ``Surface.blits`` call each, so a
+sprite costs an append in Python instead of a method call and a blit of its
+own. Within a layer sprites keep the order they were submitted in.
+
+A drawable that comes up twice in a frame, like a projectile that is in
+``all_sprites`` and in its owner's group, is only queued the first time.
+
+Everything is submitted in logical coordinates. Flushed onto a low
+resolution buffer with a ``scale`` of 2, positions are halved. Sprite and
+effect frames loaded from files are drawn from their ``prescale``
+counterpart, the same art decoded straight at the buffer's size, so the art
+is resampled once at load and the buffer is only scaled up by ``present``.
+Surfaces the game draws itself (labels, particles, projectiles) are drawn
+from a copy shrunk once and kept while it is in use.
+"""
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+REDUCED_CACHE = 2048  # Shrunk surfaces kept, particle dots alone can be a thousand
+
+# Layers, bottom to top
+STAGE = 0  # Platforms
+POWERUPS = 1
+FIGHTERS = 2  # Shields and speed ghosts, then the fighter
+PROJECTILES = 3
+EFFECTS = 4
+PARTICLES = 5
+LABELS = 6  # Names, health and special bars above the fighters
+HUD = 7  # Panels and icons fixed on the screen
+LAYER_COUNT = 8
+
+
+class RenderQueue:
+    def __init__(self, layers=LAYER_COUNT):
+        self.layers = [[] for _ in range(layers)]
+        self._seen = set()
+        self.reduced = OrderedDict()  # (surface, scale) -> shrunk copy, least recently used first
+        self.prescaled = weakref.WeakKeyDictionary()  # Loaded frame -> the same art at the buffer's size
+        # Last flush, for the debug overlay
+        self.drawn = 0
+        self.calls = 0
+        self.duplicates = 0
+        self._duplicates = 0
+
+    def first(self, drawable):
+        """True the first time ``drawable`` comes up this frame, for drawables submitting several surfaces."""
+        if drawable in self._seen:
+            self._duplicates += 1
+            return False
+        self._seen.add(drawable)
+        return True
+
+    def submit(self, surface, position, layer, drawable=None):
+        if drawable is None or self.first(drawable):
+            self.layers[layer].append((surface, position))
+
+    def prescale(self, surface, small):
+        """Draw ``surface`` as ``small`` on the buffer, kept as long as ``surface`` is."""
+        self.prescaled[surface] = small
+
+    def shrink(self, surface, scale):
+        key = (surface, scale)
+        small = self.reduced.get(key)
+        if small is None:
+            width, height = surface.get_size()
+            small = self.reduced[key] = pygame.transform.scale(surface, (max(1, width // scale),
+                                                                          max(1, height // scale)))
+            if len(self.reduced) > REDUCED_CACHE:
+                self.reduced.popitem(last=False)
+        else:
+            self.reduced.move_to_end(key)
+        return small
+
+    def flush(self, target, scale=1):
+        """Draw everything queued onto ``target`` and empty the queue; ``target`` is ``scale`` times smaller than
+        the logical coordinates."""
+        drawn = calls = 0
+        for batch in self.layers:
+            if batch:
+                if scale != 1:
+                    prescaled = self.prescaled
+                    batch[:] = [(prescaled.get(surface) or self.shrink(surface, scale),
+                                 (int(x) // scale, int(y) // scale)) for surface, (x, y) in batch]
+                target.blits(batch, doreturn=False)
+                drawn += len(batch)
+                calls += 1
+                batch.clear()
+        self._seen.clear()
+        self.drawn, self.calls = drawn, calls
+        self.duplicates, self._duplicates = self._duplicates, 0
+
+    def summary(self):
+        return f"{self.drawn} sprites in {self.calls} blits, {self.duplicates} duplicates"
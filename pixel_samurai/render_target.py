@@ -0,0 +1,115 @@
+"""Fixed-size canvases shown in a window of any size.
+
+The menus draw into ``canvas`` at the logical resolution. The match draws
+into ``buffer``: the canvas itself by default or, with a render scale of 2,
+a canvas half as wide and half as high (640x360 for 1280x720) with a
+quarter of the pixels to fill.
+
+``present`` scales whichever of the two holds the frame once per frame into
+a preallocated area of the window: by the largest whole factor that fits
+(crisp pixels), or by a smooth fractional factor when the window is smaller.
+The rest of the window is letterboxed. A 640x360 buffer fills 1280x720,
+1920x1080, 2560x1440 and 3840x2160 windows exactly. The menus go through
+the buffer too when that fills more of the window than the canvas would.
+A fixed window of the logical size *is* the canvas, so presenting the menus
+costs nothing in the default setup.
+"""
+import pygame
+
+BAR_COLOR = (0, 0, 0)
+
+
+class Fit:
+    """Where a surface of ``size`` goes in the window, and by which factor."""
+
+    def __init__(self, size, window):
+        width, height = size
+        window_width, window_height = window.get_size()
+        whole = min(window_width // width, window_height // height)
+        self.integer = whole >= 1
+        self.scale = whole if self.integer else min(window_width / width, window_height / height)
+        scaled = (int(width * self.scale), int(height * self.scale))
+        self.offset = ((window_width - scaled[0]) // 2, (window_height - scaled[1]) // 2)
+        self.dest = window.subsurface(pygame.Rect(self.offset, scaled))
+
+        # Letterbox bars around the scaled surface
+        x, y = self.offset
+        w, h = scaled
+        bars = [(0, 0, window_width, y), (0, y + h, window_width, window_height - y - h), (0, y, x, h),
+                (x + w, y, window_width - x - w, h)]
+        self.bars = [pygame.Rect(bar) for bar in bars if bar[2] > 0 and bar[3] > 0]
+
+    @property
+    def area(self):
+        return self.dest.get_width() * self.dest.get_height()
+
+
+class RenderTarget:
+    def __init__(self, logical_size, window_size=None, flags=0, render_scale=1):
+        self.logical_size = logical_size
+        self.render_scale = render_scale
+        window = pygame.display.set_mode(window_size or logical_size, flags)
+        # The canvases are never replaced, a resizable window may change size under them
+        self.direct = window.get_size() == logical_size and not flags & pygame.RESIZABLE
+        self.canvas = window if self.direct else pygame.Surface(logical_size).convert()
+        if render_scale == 1:
+            self.buffer = self.canvas
+        else:
+            self.buffer = pygame.Surface((logical_size[0] // render_scale, logical_size[1] // render_scale)).convert()
+        self.window_size = None
+        self._layout()
+
+    def _layout(self):
+        window = pygame.display.get_surface()
+        self.window_size = window.get_size()
+        self.canvas_fit = Fit(self.logical_size, window)
+        self.buffer_fit = Fit(self.buffer.get_size(), window)
+        # Menus shrink into the buffer when it fills more of the window, e.g. 1280x720 menus on a 1080p screen
+        self.menus_in_buffer = self.buffer is not self.canvas and self.buffer_fit.area > self.canvas_fit.area
+
+    def present(self, surface=None):
+        """Copy ``surface`` (the canvas or the buffer, the canvas by default) into the window, call before
+        pygame.display.flip()."""
+        if pygame.display.get_surface().get_size() != self.window_size:
+            self._layout()  # The window was resized
+        if surface is None or surface is self.canvas:
+            if self.direct:
+                return
+            if self.menus_in_buffer:
+                pygame.transform.smoothscale(self.canvas, self.buffer.get_size(), self.buffer)
+                surface = self.buffer
+            else:
+                surface = self.canvas
+        fit = self.canvas_fit if surface is self.canvas else self.buffer_fit
+        if fit.scale == 1:
+            fit.dest.blit(surface, (0, 0))
+        elif fit.integer:
+            pygame.transform.scale(surface, fit.dest.get_size(), fit.dest)
+        else:
+            pygame.transform.smoothscale(surface, fit.dest.get_size(), fit.dest)
+        window = pygame.display.get_surface()
+        for bar in fit.bars:
+            window.fill(BAR_COLOR, bar)
+
+    def _menu_fit(self):
+        # Where the canvas ends up in the window and how many window pixels a canvas pixel covers
+        if self.menus_in_buffer:
+            return self.buffer_fit, self.buffer_fit.scale / self.render_scale
+        return self.canvas_fit, self.canvas_fit.scale
+
+    def to_logical(self, pos):
+        """Window coordinates to canvas coordinates."""
+        if self.direct:
+            return pos
+        fit, scale = self._menu_fit()
+        return (int((pos[0] - fit.offset[0]) / scale), int((pos[1] - fit.offset[1]) / scale))
+
+    def to_window(self, pos):
+        """Canvas coordinates to window coordinates, the middle of the window pixels a canvas pixel covers."""
+        if self.direct:
+            return pos
+        fit, scale = self._menu_fit()
+        return (int((pos[0] + 0.5) * scale) + fit.offset[0], int((pos[1] + 0.5) * scale) + fit.offset[1])
+
+    def mouse_pos(self):
+        return self.to_logical(pygame.mouse.get_pos())
@@ -0,0 +1,241 @@
+"""Seekable match replays.
+
+A replay stores what every fighter did on every tick (``CONTROL_ACTIONS``
+bits, see ``training_env.actions_from_bits``) and the damage events, cut
+into chunks of ``keyframe_interval`` ticks. Each chunk starts with a full
+``WorldState`` keyframe and is zlib-compressed on its own, and an index of
+chunk offsets sits at the end of the file::
+
+    b"PSRP" version  header length  header JSON
+    chunk 0, chunk 1, ...            (zlib: payload length, payload JSON, input bytes)
+    index JSON                       (ticks recorded, [first tick, offset, length] per chunk)
+    index offset  b"PSIX"
+
+Seeking to a tick reads one chunk, loads its keyframe into a ``DuelBatch``
+and steps forward at most one interval, however long the match is.
+``DuelBatch`` leaves out powerups, so the re-simulation may drift slightly
+from the live match between keyframes.
+
+``export`` re-simulates whole replays, every chunk in its own arena of one
+batch, into columnar arrays of fighter positions and damage events::
+
+    python -m pixel_samurai.replay replays/*.psr --out analysis --format csv
+"""
+import argparse
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from .settings import FPS
+from .simulation import DuelBatch, FighterState, ProjectileState, WorldState
+from .training_env import actions_from_bits
+
+MAGIC = b"PSRP"
+INDEX_MAGIC = b"PSIX"
+VERSION = 1
+KEYFRAME_SECONDS = 5
+
+_HEADER = struct.Struct("<4sHI")  # magic, version, header length
+_FOOTER = struct.Struct("<Q4s")  # index offset, magic
+_PAYLOAD = struct.Struct("<I")  # payload JSON length, the input bytes follow
+
+POSITION_COLUMNS = ("match", "tick", "fighter", "x", "y", "health")
+DAMAGE_COLUMNS = ("match", "tick", "target", "attacker", "amount")
+
+
+def _encode_world(world):
+    # The platforms live in the header, every keyframe of a match shares them
+    return {"tick": world.tick, "fighters": [list(f) for f in world.fighters],
+            "projectiles": [list(p) for p in world.projectiles]}
+
+
+def _decode_world(data, platforms):
+    return WorldState(data["tick"], tuple(FighterState(*f) for f in data["fighters"]),
+                      tuple(ProjectileState(*p) for p in data["projectiles"]), platforms)
+
+
+class ReplayWriter:
+    """Streams a match to ``path``, one compressed chunk per keyframe interval."""
+
+    def __init__(self, path, world, names=(), keyframe_interval=KEYFRAME_SECONDS * FPS, meta=None):
+        self.file = open(path, "wb")
+        self.path = path
+        self.fighters = len(world.fighters)
+        self.keyframe_interval = keyframe_interval
+        self.index = []
+        header = {"fighters": self.fighters, "names": list(names), "platforms": [list(p) for p in world.platforms],
+                  "keyframe_interval": keyframe_interval, "fps": FPS, "meta": meta or {}}
+        header = json.dumps(header).encode()
+        self.file.write(_HEADER.pack(MAGIC, VERSION, len(header)) + header)
+        self.first_tick = self.tick = world.tick
+        self._start_chunk(world)
+
+    def _start_chunk(self, world):
+        self.keyframe = _encode_world(world)
+        self.inputs = []
+        self.events = []
+
+    def record(self, inputs, snapshot):
+        """Add one tick: a CONTROL_ACTIONS bitmask per fighter.
+
+        ``snapshot(tick)`` returns the WorldState after this tick, it is only
+        called when the next chunk needs its keyframe.
+        """
+        self.inputs.append(inputs)
+        self.tick += 1
+        if len(self.inputs) == self.keyframe_interval:
+            self._write_chunk()
+            self._start_chunk(snapshot(self.tick))
+
+    def damage(self, target, attacker, amount):
+        """Damage dealt to fighter ``target`` on the tick being recorded, ``attacker`` is None for the stage."""
+        self.events.append([self.tick, target, -1 if attacker is None else attacker, amount])
+
+    def _write_chunk(self):
+        if not self.inputs:
+            return
+        payload = json.dumps({"keyframe": self.keyframe, "events": self.events}).encode()
+        inputs = np.array(self.inputs, np.uint8).reshape(-1, self.fighters)
+        chunk = zlib.compress(_PAYLOAD.pack(len(payload)) + payload + inputs.tobytes())
+        self.index.append([self.keyframe["tick"], self.file.tell(), len(chunk)])
+        self.file.write(chunk)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self._write_chunk()
+        index_offset = self.file.tell()
+        self.file.write(json.dumps({"ticks": self.tick - self.first_tick, "chunks": self.index}).encode())
+        self.file.write(_FOOTER.pack(index_offset, INDEX_MAGIC))
+        self.file.close()
+
+
+class Chunk:
+    def __init__(self, keyframe, inputs, events):
+        self.keyframe = keyframe  # WorldState at the first tick
+        self.inputs = inputs  # uint8 bitmasks, (ticks, fighters)
+        self.events = events  # [tick, target, attacker or -1, amount]
+
+    @property
+    def start(self):
+        return self.keyframe.tick
+
+
+class ReplayReader:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            magic, version, length = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} replay")
+            self.header = json.loads(file.read(length))
+            file.seek(-_FOOTER.size, os.SEEK_END)
+            index_offset, magic = _FOOTER.unpack(file.read(_FOOTER.size))
+            if magic != INDEX_MAGIC:
+                raise ValueError(f"{path} has no index, the match was not closed")
+            index_end = file.seek(0, os.SEEK_END) - _FOOTER.size
+            file.seek(index_offset)
+            index = json.loads(file.read(index_end - index_offset))
+        self.ticks = index["ticks"]
+        self.index = index["chunks"]
+        self.fighters = self.header["fighters"]
+        self.keyframe_interval = self.header["keyframe_interval"]
+        self.platforms = tuple(tuple(p) for p in self.header["platforms"])
+
+    def chunk(self, number):
+        start, offset, length = self.index[number]
+        with open(self.path, "rb") as file:
+            file.seek(offset)
+            data = zlib.decompress(file.read(length))
+        payload_length, = _PAYLOAD.unpack_from(data)
+        payload = json.loads(data[_PAYLOAD.size:_PAYLOAD.size + payload_length])
+        inputs = np.frombuffer(data, np.uint8, offset=_PAYLOAD.size + payload_length)
+        return Chunk(_decode_world(payload["keyframe"], self.platforms), inputs.reshape(-1, self.fighters),
+                     payload["events"])
+
+    def seek(self, tick):
+        """One-arena DuelBatch holding the match state at the start of ``tick``."""
+        if not self.index:
+            raise ValueError(f"{self.path} has no ticks recorded")
+        first = self.index[0][0]
+        number = min(max(0, (tick - first) // self.keyframe_interval), len(self.index) - 1)
+        chunk = self.chunk(number)
+        batch = DuelBatch.from_world(chunk.keyframe)
+        for bits in chunk.inputs[:max(0, tick - chunk.start)]:
+            batch.step(actions_from_bits(bits)[None])
+        return batch
+
+    def columns(self, match=0):
+        """Fighter positions for every tick and the damage events, as dicts of column arrays."""
+        chunks = [self.chunk(number) for number in range(len(self.index))]
+        if not chunks:
+            empty = np.zeros(0, np.int64)
+            return dict.fromkeys(POSITION_COLUMNS, empty), dict.fromkeys(DAMAGE_COLUMNS, empty)
+
+        # Every chunk re-simulates from its own keyframe in its own arena, all at once
+        batch = DuelBatch(len(chunks), self.fighters, self.platforms)
+        inputs = np.zeros((len(chunks), self.keyframe_interval, self.fighters), np.uint8)
+        for arena, chunk in enumerate(chunks):
+            batch.load(chunk.keyframe, arena)
+            inputs[arena, :len(chunk.inputs)] = chunk.inputs
+        lengths = np.array([len(chunk.inputs) for chunk in chunks])
+        starts = np.array([chunk.start for chunk in chunks])
+
+        shape = (self.keyframe_interval, len(chunks), self.fighters)
+        x = np.empty(shape, np.float32)
+        y = np.empty(shape, np.float32)
+        health = np.empty(shape, np.int32)
+        for step in range(self.keyframe_interval):
+            x[step] = batch.x
+            y[step] = batch.y
+            health[step] = batch.health
+            batch.step(actions_from_bits(inputs[:, step]))
+
+        step, arena, fighter = np.indices(shape)
+        valid = step < lengths[arena]
+        positions = {
+            "match": np.full(valid.sum(), match),
+            "tick": (starts[arena] + step)[valid],
+            "fighter": fighter[valid],
+            "x": x[valid],
+            "y": y[valid],
+            "health": health[valid],
+        }
+        events = np.array([event for chunk in chunks for event in chunk.events], np.int64).reshape(-1, 4)
+        damage = {"match": np.full(len(events), match)}
+        damage.update(zip(DAMAGE_COLUMNS[1:], events.T))
+        return positions, damage
+
+
+def export(paths):
+    """Columns of many replays concatenated, ``match`` numbers them in ``paths`` order."""
+    tables = [ReplayReader(path).columns(match) for match, path in enumerate(paths)]
+    positions = {name: np.concatenate([table[0][name] for table in tables]) for name in POSITION_COLUMNS}
+    damage = {name: np.concatenate([table[1][name] for table in tables]) for name in DAMAGE_COLUMNS}
+    return positions, damage
+
+
+def save_columns(columns, path):
+    """Write a dict of columns as .npz or .csv, by the extension of ``path``."""
+    if path.endswith(".npz"):
+        np.savez_compressed(path, **columns)
+        return
+    names = list(columns)
+    rows = np.column_stack([columns[name] for name in names]) if names else np.zeros((0, 0))
+    np.savetxt(path, rows, delimiter=",", header=",".join(names), comments="", fmt="%g")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export fighter positions and damage events from replays')
+    parser.add_argument('replays', nargs='+', help='Replay files')
+    parser.add_argument('--out', default='.', help='Output folder')
+    parser.add_argument('--format', choices=['npz', 'csv'], default='npz', help='Output format')
+    args = parser.parse_args()
+    os.makedirs(args.out, exist_ok=True)
+    positions, damage = export(args.replays)
+    save_columns(positions, os.path.join(args.out, f"positions.{args.format}"))
+    save_columns(damage, os.path.join(args.out, f"damage.{args.format}"))
+    print(f"{len(args.replays)} replays: {len(positions['tick'])} positions, {len(damage['tick'])} damage events")
@@ -0,0 +1,77 @@
+"""Characters and projectile types, loaded from a JSON data file.
+
+``assets/characters/roster.json`` holds both tables::
+
+    {"projectiles": {"normal": {"size": [20, 10], "color": [255, 200, 0], "core": [255, 150, 0],
+                                "trail": [255, 150, 0], "damage": 10, "speed": 1.0}, ...},
+     "characters": [{"name": "Red Samurai", "health": 100, "speed": 6, "power": 8, "color": [255, 50, 50],
+                     "sprites": "assets/player1", "projectile": "normal", "special_projectile": "special",
+                     "animation_speed": {"run": 0.2}}, ...]}
+
+``sprites`` is a folder with one subfolder per animation. Characters naming
+the same folder share one set of images, and every fighter of a character
+(mirror matches, free-for-all AIs) uses that same set, so the sprites are
+decoded and kept in memory once however many fighters or characters use
+them. ``power`` scales projectile damage, BASE_POWER deals the damage
+listed for the projectile.
+
+The roster file and the sprite folders it names are found under
+``GAME_DIR``, the folder holding ``assets/``, wherever the game is started
+from; placeholders are generated for sprite folders that are missing.
+"""
+import json
+import os
+
+from .settings import GAME_DIR, ASSET_DIR
+
+ROSTER_FILE = os.path.join(ASSET_DIR, "characters", "roster.json")
+
+ANIMATIONS = ("idle", "run", "attack", "jump", "hurt")
+ANIMATION_SPEEDS = {'idle': 0.15, 'run': 0.2, 'attack': 0.3, 'jump': 0.2, 'hurt': 0.25}
+BASE_POWER = 8
+
+
+class ProjectileStyle:
+    def __init__(self, name, size, color, trail, damage, speed=1.0, core=None):
+        self.name = name
+        self.size = tuple(size)
+        self.color = tuple(color)
+        self.core = tuple(core) if core else None  # Inner ellipse, 2 pixels in
+        self.trail = tuple(trail)
+        self.damage = damage
+        self.speed = speed  # Times PROJECTILE_SPEED
+
+
+class Character:
+    def __init__(self, name, health, speed, power, color, sprites, placeholder_color=(255, 0, 255, 200),
+                 projectile="normal", special_projectile="special", animation_speed=None):
+        self.name = name
+        self.health = health
+        self.speed = speed
+        self.power = power
+        self.color = tuple(color)
+        self.sprites = sprites
+        self.placeholder_color = tuple(placeholder_color)
+        self.projectile = projectile
+        self.special_projectile = special_projectile
+        self.animation_speed = dict(ANIMATION_SPEEDS, **(animation_speed or {}))
+
+    @property
+    def damage_scale(self):
+        return self.power / BASE_POWER
+
+
+def load_roster(path=ROSTER_FILE):
+    """(characters in roster order, projectile name -> ProjectileStyle)"""
+    with open(path) as file:
+        data = json.load(file)
+    projectiles = {name: ProjectileStyle(name, **style) for name, style in data["projectiles"].items()}
+    characters = [Character(**character) for character in data["characters"]]
+    for character in characters:
+        character.sprites = os.path.join(GAME_DIR, character.sprites)
+        for projectile in (character.projectile, character.special_projectile):
+            if projectile not in projectiles:
+                raise ValueError(f"{path}: {character.name} fires unknown projectile {projectile!r}")
+    if len(characters) < 2:
+        raise ValueError(f"{path}: the roster needs at least two characters")
+    return characters, projectiles
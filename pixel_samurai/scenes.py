@@ -0,0 +1,129 @@
+"""Screens on a stack, run by one loop at one frame rate.
+
+The top ``Scene`` gets each frame's events and is updated; it is only drawn
+when that shows something new:
+
+* ``live`` scenes (the match) draw every frame;
+* ``ambient`` scenes (a scrolling background, drifting particles) draw
+  every frame too, but once nobody has touched anything for
+  ``IDLE_SECONDS`` the loop waits for input up to ``1 / IDLE_FPS`` per
+  frame, so they keep moving at a low rate;
+* still scenes draw when an event arrives and otherwise wait for one.
+
+A scene asks for another screen by returning its state from ``handle`` or
+``update``. Overlays (pause, options) are pushed over the current screen
+and ``BACK`` returns to the one below; going to a screen already on the
+stack returns to it; anything else replaces the stack.
+"""
+import time
+
+import pygame
+
+IDLE_SECONDS = 10  # Without input for this long ambient scenes slow down
+IDLE_FPS = 10
+WAIT_MS = 1000  # Longest wait for an event on a still scene
+
+BACK = "back"
+
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+                pygame.MOUSEWHEEL, pygame.JOYBUTTONDOWN, pygame.JOYAXISMOTION, pygame.JOYHATMOTION)
+
+
+class Scene:
+    state = None  # Game state reported while this scene is on top
+    overlay = False
+    ambient = False
+    live = False
+
+    def enter(self):
+        """Shown anew, reset what a visit changes."""
+
+    def resume(self):
+        """On top again after the overlay above it closed."""
+
+    def handle(self, events):
+        """React to the frame's events, may return the state to go to."""
+
+    def update(self):
+        """Advance one frame, may return the state to go to."""
+
+    def draw(self, surface):
+        pass
+
+
+class SceneStack:
+    def __init__(self, scenes):
+        self.scenes = scenes  # state -> Scene
+        self.stack = []
+        self.dirty = True  # Something changed since the top scene last drew
+        self.last_input = time.perf_counter()
+        self.drawn = 0
+        self.skipped = 0
+
+    @property
+    def top(self):
+        return self.stack[-1]
+
+    @property
+    def state(self):
+        return self.top.state
+
+    @property
+    def idle(self):
+        return time.perf_counter() - self.last_input > IDLE_SECONDS
+
+    def show(self, state):
+        if state == BACK:
+            self.stack.pop()
+            self.top.resume()
+        elif any(scene.state == state for scene in self.stack):
+            while self.top.state != state:
+                self.stack.pop()
+            self.top.resume()
+        else:
+            scene = self.scenes[state]
+            if not scene.overlay:
+                self.stack.clear()
+            self.stack.append(scene)
+            scene.enter()
+        self.dirty = True
+
+    def poll(self):
+        """The frame's events, waiting for the first one while the top scene has nothing new to show."""
+        scene = self.top
+        timeout = 0
+        if not (scene.live or self.dirty):
+            if not scene.ambient:
+                timeout = WAIT_MS
+            elif self.idle:
+                timeout = 1000 // IDLE_FPS
+        events = []
+        if timeout:
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                events.append(event)
+        events += pygame.event.get()
+        if events:
+            self.dirty = True
+            if any(event.type in INPUT_EVENTS for event in events):
+                self.last_input = time.perf_counter()
+        return events
+
+    def step(self, events, surface):
+        """Run the top scene for a frame, returns True when it drew something to present."""
+        scene = self.top
+        following = scene.handle(events)
+        drew = False
+        if following is None:
+            following = scene.update()
+            if scene.live or scene.ambient or self.dirty:
+                scene.draw(surface)
+                self.dirty = False
+                drew = True
+        if drew:
+            self.drawn += 1
+        else:
+            self.skipped += 1
+        if following is not None:
+            self.show(following)
+        return drew
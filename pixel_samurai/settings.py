@@ -0,0 +1,48 @@
+# Game settings shared by the game client and the headless tools
+import os
+
+# The folder holding assets/, files are found there whatever the working directory
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSET_DIR = os.path.join(GAME_DIR, "assets")
+
+# Game Settings
+WIDTH, HEIGHT = 1280, 720
+FPS = 60
+GRAVITY = 0.8
+SCROLL_SPEED = 5
+PROJECTILE_SPEED = 10
+
+# Samurai tuning
+SAMURAI_SPEED = 6
+JUMP_POWER = -16
+MAX_FALL_SPEED = 10
+ATTACK_COOLDOWN = 25
+MAX_HEALTH = 100
+MAX_SPECIAL = 100
+SPECIAL_CHARGE_RATE = 0.1
+SPECIAL_HIT_BONUS = 10
+SPRITE_SIZE = 96  # 64px art scaled by 1.5
+
+# Action names used as keys of the controls dicts
+CONTROL_ACTIONS = ('left', 'right', 'jump', 'attack', 'special')
+
+# Fighter spawn points (x, y)
+SPAWN_POINTS = [(100, HEIGHT - 100), (700, HEIGHT - 100)]
+
+# Expanded platform layout with different types (x, y, width, height, type)
+PLATFORM_DATA = [
+    (0, HEIGHT - 30, WIDTH * 2, 30, "normal"),  # Ground
+    (200, HEIGHT - 150, 150, 20, "stone"),  # Platform 1
+    (500, HEIGHT - 200, 100, 20, "normal"),  # Platform 2
+    (700, HEIGHT - 250, 120, 20, "stone"),  # Platform 3
+    (300, HEIGHT - 300, 140, 20, "normal"),  # Platform 4
+    (100, HEIGHT - 400, 80, 20, "ice"),  # High platform
+    (900, HEIGHT - 350, 90, 20, "normal"),  # Far platform
+    (400, HEIGHT - 450, 60, 20, "stone"),  # Highest platform
+]
+
+# Lava platforms added on hard difficulty
+HARD_PLATFORM_DATA = [
+    (600, HEIGHT - 120, 100, 10, "lava"),
+    (250, HEIGHT - 250, 80, 10, "lava")
+]
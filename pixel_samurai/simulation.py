@@ -0,0 +1,384 @@
+"""Headless, vectorised duel simulation.
+
+Mirrors the per-frame rules of ``Samurai`` in main.py (input handling, gravity,
+platform landing, movement, projectiles, cooldowns and the special meter) as
+NumPy array operations, so many independent arenas can be stepped at once
+without Sprites or Surfaces. Powerup pickups and visual effects are not
+simulated, an active shield is.
+
+``WorldState`` is a plain-tuple copy of a live match (see ``capture_world``)
+that can be loaded into every arena of a batch to search from it.
+"""
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from .settings import (WIDTH, HEIGHT, GRAVITY, PROJECTILE_SPEED, SAMURAI_SPEED, JUMP_POWER, MAX_FALL_SPEED,
+                       ATTACK_COOLDOWN, MAX_HEALTH, MAX_SPECIAL, SPECIAL_CHARGE_RATE, SPECIAL_HIT_BONUS,
+                       SPRITE_SIZE, CONTROL_ACTIONS, SPAWN_POINTS, PLATFORM_DATA)
+
+# Index of each action in the last axis of an action array
+LEFT, RIGHT, JUMP, ATTACK, SPECIAL = range(len(CONTROL_ACTIONS))
+
+# Frames a fighter is locked out of input (animation frames / animation speed in Samurai)
+ATTACK_LOCK = 17  # 5 attack frames at 0.3
+SPECIAL_LOCK = 12  # 5 attack frames at 0.45
+HURT_LOCK = 12  # 3 hurt frames at 0.25
+
+# Projectiles sit in both all_sprites and their owner's group, so main.py moves them twice per frame
+PROJECTILE_SUBSTEPS = 2
+PROJECTILE_SLOTS = 8  # Per fighter, the oldest projectile is recycled when all are in flight
+
+# Projectile hit box and base damage: (width, height, damage, speed), the "normal" and "special" roster styles
+NORMAL_PROJECTILE = (20, 10, 10, PROJECTILE_SPEED)
+SPECIAL_PROJECTILE = (30, 20, 15, PROJECTILE_SPEED * 1.2)
+SPECIAL_POWER = 1.5  # Specials hit this much harder than the fighter's power
+
+# Lava hurts on landing every this many frames
+LAVA_INTERVAL = 30
+
+
+# power and the two shots are the fighter's loadout, the defaults keep older replays loading
+FighterState = namedtuple("FighterState", "x y vel_x vel_y speed health special_meter cooldown attack_lock hurt "
+                                          "shield on_ground facing power shot special_shot",
+                          defaults=(1.0, NORMAL_PROJECTILE, SPECIAL_PROJECTILE))
+ProjectileState = namedtuple("ProjectileState", "x y direction speed width height damage owner travel")
+WorldState = namedtuple("WorldState", "tick fighters projectiles platforms")
+
+
+def _frames_left(samurai):
+    # Frames until the current attack or hurt animation releases the fighter
+    speed = getattr(samurai, "current_animation_speed", 0.2)
+    return max(0, math.ceil((len(samurai.current_imgs) - samurai.index) / speed))
+
+
+def projectile_kind(style):
+    """(width, height, damage, speed) of a roster ProjectileStyle."""
+    return (style.size[0], style.size[1], style.damage, PROJECTILE_SPEED * style.speed)
+
+
+def capture_fighter(samurai, styles=None):
+    """FighterState for a live Samurai sprite, ``styles`` maps its projectile types to ProjectileStyles."""
+    shot, special_shot = NORMAL_PROJECTILE, SPECIAL_PROJECTILE
+    if styles:
+        shot = projectile_kind(styles[samurai.projectile_type])
+        special_shot = projectile_kind(styles[samurai.special_projectile_type])
+    return FighterState(
+        x=float(samurai.x), y=float(samurai.y), vel_x=float(samurai.vel_x), vel_y=float(samurai.vel_y),
+        speed=float(samurai.speed), health=int(samurai.health), special_meter=float(samurai.special_meter),
+        cooldown=int(samurai.current_attack_cooldown),
+        attack_lock=_frames_left(samurai) if samurai.is_attacking else 0,
+        hurt=_frames_left(samurai) if samurai.is_hurting else 0,
+        shield=int(samurai.shield_time) if samurai.shield_active else 0,
+        on_ground=bool(samurai.on_ground), facing=1 if samurai.facing_right else -1,
+        power=float(samurai.power), shot=shot, special_shot=special_shot)
+
+
+def capture_world(fighters, platforms, tick, styles=None):
+    """WorldState for live Samurai sprites (in order), their projectiles and the stage layout tuples."""
+    projectiles = []
+    for owner, samurai in enumerate(fighters):
+        for projectile in samurai.projectiles:
+            if not projectile.alive():
+                continue
+            rect = projectile.rect
+            projectiles.append(ProjectileState(
+                x=float(rect.centerx), y=float(rect.centery), direction=1 if projectile.facing_right else -1,
+                speed=float(projectile.speed), width=rect.width, height=rect.height, damage=projectile.damage,
+                owner=owner, travel=float(rect.centerx - projectile.original_x)))
+    return WorldState(tick, tuple(capture_fighter(f, styles) for f in fighters), tuple(projectiles), tuple(platforms))
+
+
+def spawn_points(count):
+    """Spawn positions for ``count`` fighters, matching main.py for a duel."""
+    if count <= len(SPAWN_POINTS):
+        return SPAWN_POINTS[:count]
+    step = (WIDTH - SPRITE_SIZE - 100) / (count - 1)
+    return [(int(100 + i * step), SPAWN_POINTS[0][1]) for i in range(count)]
+
+
+class DuelBatch:
+    """State of ``arenas`` independent fights with ``fighters`` samurai each.
+
+    Every fighter attribute is an array of shape (arenas, fighters), ``shot``
+    and ``special_shot`` add a last axis for (width, height, damage, speed).
+    Every projectile attribute is an array of shape (arenas, fighters * PROJECTILE_SLOTS).
+    """
+
+    def __init__(self, arenas, fighters=2, platforms=None):
+        self.arenas = arenas
+        self.fighters = fighters
+        self.platforms = list(platforms if platforms is not None else PLATFORM_DATA)
+        rects = np.array([p[:4] for p in self.platforms], dtype=np.float32).reshape(-1, 4)
+        self.plat_left = rects[:, 0]
+        self.plat_top = rects[:, 1]
+        self.plat_right = rects[:, 0] + rects[:, 2]
+        self.plat_bottom = rects[:, 1] + rects[:, 3]
+        self.plat_lava = np.array([p[4] == "lava" for p in self.platforms], dtype=bool)
+        self.plat_ice = np.array([p[4] == "ice" for p in self.platforms], dtype=bool)
+
+        shape = (arenas, fighters)
+        self.x = np.zeros(shape, np.float32)
+        self.y = np.zeros(shape, np.float32)
+        self.vel_x = np.zeros(shape, np.float32)
+        self.vel_y = np.zeros(shape, np.float32)
+        self.speed = np.full(shape, SAMURAI_SPEED, np.float32)
+        self.health = np.zeros(shape, np.int32)
+        self.special_meter = np.zeros(shape, np.float32)
+        self.cooldown = np.zeros(shape, np.int32)
+        self.attack_lock = np.zeros(shape, np.int32)
+        self.hurt = np.zeros(shape, np.int32)
+        self.shield = np.zeros(shape, np.int32)
+        self.on_ground = np.zeros(shape, bool)
+        self.facing = np.ones(shape, np.int8)
+        self.next_slot = np.zeros(shape, np.int32)
+
+        # Loadout, kept by reset() like the fighter's character
+        self.power = np.ones(shape, np.float64)
+        self.shot = np.empty(shape + (4,), np.float64)
+        self.shot[:] = NORMAL_PROJECTILE
+        self.special_shot = np.empty(shape + (4,), np.float64)
+        self.special_shot[:] = SPECIAL_PROJECTILE
+
+        # Stats tracking, same names as Samurai
+        self.hits_landed = np.zeros(shape, np.int32)
+        self.damage_dealt = np.zeros(shape, np.int32)
+        self.jumps_made = np.zeros(shape, np.int32)
+        self.specials_used = np.zeros(shape, np.int32)
+
+        # Per-step outputs
+        self.damage_taken = np.zeros(shape, np.int32)
+        self.damage_done = np.zeros(shape, np.int32)
+
+        slots = (arenas, fighters * PROJECTILE_SLOTS)
+        self.proj_x = np.zeros(slots, np.float32)
+        self.proj_y = np.zeros(slots, np.float32)
+        self.proj_dir = np.zeros(slots, np.int8)
+        self.proj_speed = np.zeros(slots, np.float32)
+        self.proj_travel = np.zeros(slots, np.float32)
+        self.proj_w = np.zeros(slots, np.float32)
+        self.proj_h = np.zeros(slots, np.float32)
+        self.proj_damage = np.zeros(slots, np.int32)
+        self.proj_active = np.zeros(slots, bool)
+        self.proj_owner = np.repeat(np.arange(fighters), PROJECTILE_SLOTS)[None, :].repeat(arenas, 0)
+
+        self.tick = np.zeros(arenas, np.int64)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Put the arenas selected by the boolean ``mask`` (default: all) back to the starting state."""
+        idx = slice(None) if mask is None else np.asarray(mask, dtype=bool)
+        spawns = np.array(spawn_points(self.fighters), dtype=np.float32)
+        self.x[idx] = spawns[:, 0]
+        self.y[idx] = spawns[:, 1]
+        for name in ("vel_x", "vel_y", "special_meter", "cooldown", "attack_lock", "hurt", "shield", "next_slot",
+                     "hits_landed", "damage_dealt", "jumps_made", "specials_used", "damage_taken", "damage_done"):
+            getattr(self, name)[idx] = 0
+        self.health[idx] = MAX_HEALTH
+        self.speed[idx] = SAMURAI_SPEED
+        self.on_ground[idx] = False
+        self.facing[idx] = 1
+        self.proj_active[idx] = False
+        self.tick[idx] = 0
+
+    @classmethod
+    def from_world(cls, world, arenas=1):
+        """Batch with every arena set to ``world``."""
+        batch = cls(arenas, len(world.fighters), world.platforms)
+        batch.load(world)
+        return batch
+
+    def load(self, world, arena=None):
+        """Set every arena, or only ``arena``, to the fighters and projectiles of a WorldState."""
+        idx = slice(None) if arena is None else arena
+        for name in FighterState._fields:
+            getattr(self, name)[idx] = [getattr(fighter, name) for fighter in world.fighters]
+        self.proj_active[idx] = False
+        next_slot = [0] * self.fighters
+        for projectile in world.projectiles:
+            owner = projectile.owner
+            slot = owner * PROJECTILE_SLOTS + next_slot[owner]
+            next_slot[owner] = (next_slot[owner] + 1) % PROJECTILE_SLOTS
+            self.proj_x[idx, slot] = projectile.x
+            self.proj_y[idx, slot] = projectile.y
+            self.proj_dir[idx, slot] = projectile.direction
+            self.proj_speed[idx, slot] = projectile.speed
+            self.proj_travel[idx, slot] = projectile.travel
+            self.proj_w[idx, slot] = projectile.width
+            self.proj_h[idx, slot] = projectile.height
+            self.proj_damage[idx, slot] = projectile.damage
+            self.proj_active[idx, slot] = True
+        self.next_slot[idx] = next_slot
+        self.tick[idx] = world.tick
+
+    def copy(self):
+        """Independent deep copy of the whole batch."""
+        clone = object.__new__(DuelBatch)
+        for name, value in self.__dict__.items():
+            setattr(clone, name, value.copy() if isinstance(value, np.ndarray) else value)
+        return clone
+
+    def alive(self):
+        return self.health > 0
+
+    def finished(self):
+        """Arenas where at most one fighter is left standing."""
+        return (self.health > 0).sum(axis=1) <= 1
+
+    def step(self, actions):
+        """Advance every arena by one frame.
+
+        ``actions`` is a bool array of shape (arenas, fighters, len(CONTROL_ACTIONS)).
+        After the call ``damage_taken`` and ``damage_done`` hold this frame's totals.
+        """
+        actions = np.asarray(actions, dtype=bool)
+        self.damage_taken[:] = 0
+        self.damage_done[:] = 0
+        self._handle_keys(actions)
+
+        # Apply gravity
+        self.vel_y = np.minimum(self.vel_y + GRAVITY, MAX_FALL_SPEED)
+
+        self._handle_collision()
+        self._update()
+        self._projectile_hits()
+        self.tick += 1
+
+    def _handle_keys(self, actions):
+        alive = self.health > 0
+        free = alive & (self.attack_lock == 0) & (self.hurt == 0)
+        left = actions[..., LEFT] & free
+        right = actions[..., RIGHT] & free & ~left
+        self.vel_x = np.where(alive, np.where(left, -self.speed, np.where(right, self.speed, 0)), self.vel_x)
+        self.facing = np.where(left, -1, np.where(right, 1, self.facing)).astype(np.int8)
+
+        jump = actions[..., JUMP] & free & self.on_ground
+        self.vel_y[jump] = JUMP_POWER
+        self.on_ground &= ~jump
+        self.jumps_made += jump
+
+        # Attacks fire from the rect computed at the end of the previous frame
+        center_x = np.floor(self.x) + SPRITE_SIZE // 2
+        center_y = np.floor(self.y) + SPRITE_SIZE // 2
+        muzzle_x = center_x + 40 * self.facing
+
+        attack = actions[..., ATTACK] & free & (self.cooldown == 0)
+        if attack.any():
+            self.attack_lock[attack] = ATTACK_LOCK
+            self.cooldown[attack] = ATTACK_COOLDOWN
+            self._spawn(attack, muzzle_x, center_y, self.shot, 1.0)
+
+        special = actions[..., SPECIAL] & free & (self.special_meter >= MAX_SPECIAL)
+        if special.any():
+            self.attack_lock[special] = SPECIAL_LOCK
+            self.special_meter[special] = 0
+            self.specials_used += special
+            for offset in (-20, 0, 20):
+                self._spawn(special, muzzle_x, center_y + offset, self.special_shot, SPECIAL_POWER)
+
+    def _spawn(self, mask, x, y, kind, scale):
+        arena, fighter = np.nonzero(mask)
+        width, height, damage, speed = kind[arena, fighter].T
+        # Same rounding as Projectile: int(style.damage * power)
+        damage = (damage * (scale * self.power[arena, fighter])).astype(np.int32)
+        slot = fighter * PROJECTILE_SLOTS + self.next_slot[arena, fighter]
+        self.next_slot[arena, fighter] = (self.next_slot[arena, fighter] + 1) % PROJECTILE_SLOTS
+        self.proj_x[arena, slot] = x[arena, fighter]
+        self.proj_y[arena, slot] = y[arena, fighter]
+        self.proj_dir[arena, slot] = self.facing[arena, fighter]
+        self.proj_speed[arena, slot] = speed
+        self.proj_travel[arena, slot] = 0
+        self.proj_w[arena, slot] = width
+        self.proj_h[arena, slot] = height
+        self.proj_damage[arena, slot] = damage
+        self.proj_active[arena, slot] = True
+
+    def _handle_collision(self):
+        left = np.floor(self.x)[..., None]
+        top = np.floor(self.y)[..., None]
+        right = left + SPRITE_SIZE
+        bottom = top + SPRITE_SIZE
+
+        # Landing on top of a platform while falling, first platform in layout order wins
+        landing = ((left < self.plat_right) & (right > self.plat_left) &
+                   (top < self.plat_top) & (bottom > self.plat_top) &
+                   (self.vel_y > 0)[..., None])
+        landed = landing.any(axis=-1)
+        platform = landing.argmax(axis=-1)
+
+        self.y = np.where(landed, self.plat_top[platform] - SPRITE_SIZE, self.y)
+        self.vel_y[landed] = 0
+        self.on_ground = landed
+
+        lava = landed & self.plat_lava[platform] & (self.tick % LAVA_INTERVAL == 0)[:, None]
+        if lava.any():
+            self._take_damage(lava, np.ones_like(self.health))
+
+        ice = landed & self.plat_ice[platform]
+        self.vel_x[ice] *= 0.95
+
+    def _update(self):
+        moving = self.hurt == 0
+        self.x = np.where(moving, np.clip(self.x + self.vel_x, 0, WIDTH - SPRITE_SIZE), self.x)
+        self.y = np.where(moving, np.clip(self.y + self.vel_y, 0, HEIGHT - SPRITE_SIZE), self.y)
+
+        np.subtract(self.attack_lock, 1, out=self.attack_lock, where=self.attack_lock > 0)
+        np.subtract(self.hurt, 1, out=self.hurt, where=self.hurt > 0)
+        np.subtract(self.cooldown, 1, out=self.cooldown, where=self.cooldown > 0)
+        np.subtract(self.shield, 1, out=self.shield, where=self.shield > 0)
+
+        charging = self.special_meter < MAX_SPECIAL
+        self.special_meter[charging] += SPECIAL_CHARGE_RATE
+
+        for _ in range(PROJECTILE_SUBSTEPS):
+            move = self.proj_dir * self.proj_speed
+            self.proj_x += move
+            self.proj_travel += move
+        self.proj_active &= np.abs(self.proj_travel) <= WIDTH
+
+    def _projectile_hits(self):
+        if not self.proj_active.any():
+            return
+        # Overlap of every projectile rect with every fighter rect: (arenas, slots, fighters)
+        fighter_left = np.floor(self.x)[:, None, :]
+        fighter_top = np.floor(self.y)[:, None, :]
+        proj_left = np.floor(self.proj_x - self.proj_w / 2)[..., None]
+        proj_top = np.floor(self.proj_y - self.proj_h / 2)[..., None]
+        hits = ((proj_left < fighter_left + SPRITE_SIZE) & (proj_left + self.proj_w[..., None] > fighter_left) &
+                (proj_top < fighter_top + SPRITE_SIZE) & (proj_top + self.proj_h[..., None] > fighter_top))
+        hits &= self.proj_active[..., None]
+        hits &= self.proj_owner[..., None] != np.arange(self.fighters)
+        hits &= (self.health > 0)[:, None, :]
+        if not hits.any():
+            return
+
+        # Every projectile touching a fighter is spent, only the first one per fighter deals damage
+        self.proj_active &= ~hits.any(axis=-1)
+        struck = hits.any(axis=1)
+        first = hits.argmax(axis=1)
+        arena = np.arange(self.arenas)[:, None]
+        damage = np.where(struck, self.proj_damage[arena, first], 0)
+        attacker = self.proj_owner[arena, first]
+        self._take_damage(struck, damage, attacker)
+
+    def _take_damage(self, mask, amount, attacker=None):
+        # An active shield absorbs the hit completely
+        mask = mask & (self.shield == 0) & (self.hurt == 0) & (self.health > 0)
+        if not mask.any():
+            return
+        dealt = np.where(mask, np.minimum(amount, self.health), 0)
+        self.health -= dealt
+        self.hurt[mask] = HURT_LOCK
+        self.damage_taken += dealt
+        if attacker is None:
+            return
+
+        # Credit the attacker with the hit and charge their special meter
+        arena, target = np.nonzero(mask)
+        source = attacker[arena, target]
+        np.add.at(self.hits_landed, (arena, source), 1)
+        np.add.at(self.damage_dealt, (arena, source), amount[arena, target])
+        np.add.at(self.damage_done, (arena, source), dealt[arena, target])
+        np.add.at(self.special_meter, (arena, source), SPECIAL_HIT_BONUS)
+        np.minimum(self.special_meter, MAX_SPECIAL, out=self.special_meter)
@@ -0,0 +1,178 @@
+"""Gym-style vector environment for training replacement AIs for ``Samurai.ai_action``.
+
+Steps ``num_arenas`` independent duels at once on top of ``DuelBatch``::
+
+    env = VectorDuelEnv(num_arenas=1024)
+    obs = env.reset(seed=0)                      # (arenas, fighters, observation_size)
+    obs, rewards, dones, info = env.step(actions)
+
+``actions`` is either a bool array (arenas, fighters, len(ACTIONS)) or an int
+bitmask array (arenas, fighters) where bit ``i`` presses ``ACTIONS[i]``.
+Finished arenas are reset automatically; their final result is in ``info``.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from .settings import (WIDTH, HEIGHT, FPS, PROJECTILE_SPEED, SAMURAI_SPEED, MAX_FALL_SPEED, ATTACK_COOLDOWN,
+                       MAX_HEALTH, MAX_SPECIAL, SPRITE_SIZE, CONTROL_ACTIONS, PLATFORM_DATA, HARD_PLATFORM_DATA)
+from .simulation import DuelBatch
+
+# The action space mirrors the keys of the controls dicts
+ACTIONS = CONTROL_ACTIONS
+NUM_ACTION_COMBOS = 1 << len(ACTIONS)
+
+FIGHTER_FEATURES = 11
+PROJECTILE_FEATURES = 4
+PLATFORM_FEATURES = 5
+
+
+def actions_from_bits(bits):
+    """Convert an int bitmask array (..., ) to a bool action array (..., len(ACTIONS))."""
+    bits = np.asarray(bits)
+    return (bits[..., None] >> np.arange(len(ACTIONS))) & 1 == 1
+
+
+class VectorDuelEnv:
+    """N parallel arenas with ``fighters`` samurai each, every fighter driven by the caller."""
+
+    def __init__(self, num_arenas=64, fighters=2, hard=False, max_steps=FPS * 90, nearest_projectiles=6):
+        platforms = list(PLATFORM_DATA) + (list(HARD_PLATFORM_DATA) if hard else [])
+        self.batch = DuelBatch(num_arenas, fighters, platforms)
+        self.num_arenas = num_arenas
+        self.fighters = fighters
+        self.max_steps = max_steps
+        self.nearest_projectiles = nearest_projectiles
+
+        # Platform layout never changes, so its part of the observation is built once
+        self.platform_features = np.array(
+            [(x / WIDTH, y / HEIGHT, w / WIDTH, kind == "lava", kind == "ice") for x, y, w, h, kind in platforms],
+            dtype=np.float32).ravel()
+        self.observation_size = (FIGHTER_FEATURES * fighters + PROJECTILE_FEATURES * nearest_projectiles +
+                                 self.platform_features.size)
+        self.action_size = len(ACTIONS)
+
+        self.episode_steps = np.zeros(num_arenas, np.int64)
+        self.episode_returns = np.zeros((num_arenas, fighters), np.float32)
+        self.rng = np.random.default_rng()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.batch.reset()
+        self._randomise_start(slice(None))
+        self.episode_steps[:] = 0
+        self.episode_returns[:] = 0
+        return self.observe()
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        if actions.ndim == 2:
+            actions = actions_from_bits(actions)
+        batch = self.batch
+        batch.step(actions)
+        self.episode_steps += 1
+
+        rewards = (batch.damage_done - batch.damage_taken).astype(np.float32) / MAX_HEALTH
+        knocked_out = batch.finished()
+        truncated = self.episode_steps >= self.max_steps
+        dones = knocked_out | truncated
+
+        # On a knockout the survivor gets +1 and every fighter that went down -1
+        standing = batch.health > 0
+        winner = np.where(knocked_out & standing.any(axis=1), standing.argmax(axis=1), -1)
+        rewards += np.where(knocked_out[:, None], np.where(standing, 1.0, -1.0), 0.0).astype(np.float32)
+        self.episode_returns += rewards
+
+        info = {
+            "winner": winner,
+            "knocked_out": knocked_out,
+            "truncated": truncated & ~knocked_out,
+            "episode_steps": self.episode_steps.copy(),
+            "episode_returns": self.episode_returns.copy(),
+            "final_health": batch.health.copy(),
+        }
+        if dones.any():
+            batch.reset(dones)
+            self._randomise_start(dones)
+            self.episode_steps[dones] = 0
+            self.episode_returns[dones] = 0
+        return self.observe(), rewards, dones, info
+
+    def _randomise_start(self, index):
+        # Small horizontal jitter so arenas do not stay in lock-step
+        count = self.batch.x[index].size
+        jitter = self.rng.integers(-40, 41, size=count).reshape(self.batch.x[index].shape)
+        self.batch.x[index] = np.clip(self.batch.x[index] + jitter, 0, WIDTH - SPRITE_SIZE)
+
+    def observe(self):
+        """Observation array of shape (arenas, fighters, observation_size), one row per fighter's view."""
+        b = self.batch
+        own = np.stack([
+            b.x / WIDTH,
+            b.y / HEIGHT,
+            b.vel_x / SAMURAI_SPEED,
+            b.vel_y / MAX_FALL_SPEED,
+            b.health / MAX_HEALTH,
+            b.special_meter / MAX_SPECIAL,
+            b.cooldown / ATTACK_COOLDOWN,
+            b.on_ground,
+            b.facing,
+            b.attack_lock > 0,
+            b.hurt > 0,
+        ], axis=-1).astype(np.float32)
+
+        # Every other fighter in turn order, with positions relative to the observer
+        parts = [own]
+        for shift in range(1, self.fighters):
+            other = np.roll(own, -shift, axis=1).copy()
+            other[..., 0] -= own[..., 0]
+            other[..., 1] -= own[..., 1]
+            parts.append(other)
+        parts.append(self._projectile_features())
+        parts.append(np.broadcast_to(self.platform_features,
+                                     (self.num_arenas, self.fighters, self.platform_features.size)))
+        return np.concatenate(parts, axis=-1)
+
+    def _projectile_features(self):
+        b = self.batch
+        center_x = (b.x + SPRITE_SIZE / 2)[..., None]
+        center_y = (b.y + SPRITE_SIZE / 2)[..., None]
+        dx = (b.proj_x[:, None, :] - center_x) / WIDTH
+        dy = (b.proj_y[:, None, :] - center_y) / HEIGHT
+        active = np.broadcast_to(b.proj_active[:, None, :], dx.shape)
+        distance = np.where(active, dx * dx + dy * dy, np.inf)
+
+        k = min(self.nearest_projectiles, distance.shape[-1])
+        nearest = np.argsort(distance, axis=-1)[..., :k]
+        hostile = b.proj_owner[:, None, :] != np.arange(self.fighters)[None, :, None]
+        velocity = (b.proj_dir * b.proj_speed / PROJECTILE_SPEED)[:, None, :]
+        features = np.stack([dx, dy, np.broadcast_to(velocity, dx.shape), hostile], axis=-1)
+        features = np.take_along_axis(features, nearest[..., None], axis=2)
+        features *= np.take_along_axis(active, nearest, axis=2)[..., None]
+
+        out = np.zeros((self.num_arenas, self.fighters, self.nearest_projectiles, PROJECTILE_FEATURES), np.float32)
+        out[:, :, :k] = features
+        return out.reshape(self.num_arenas, self.fighters, -1)
+
+
+def benchmark(num_arenas, steps, seed=0):
+    """Step random actions and return simulated arena-steps per second."""
+    env = VectorDuelEnv(num_arenas)
+    env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, NUM_ACTION_COMBOS, size=(steps, num_arenas, env.fighters))
+    start = time.perf_counter()
+    for t in range(steps):
+        env.step(actions[t])
+    return num_arenas * steps / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the vectorised duel environment')
+    parser.add_argument('--arenas', type=int, default=4096, help='Number of parallel arenas')
+    parser.add_argument('--steps', type=int, default=500, help='Frames to simulate')
+    args = parser.parse_args()
+    rate = benchmark(args.arenas, args.steps)
+    print(f"{args.arenas} arenas: {rate:,.0f} arena-steps/s")
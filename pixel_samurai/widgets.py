@@ -0,0 +1,161 @@
+"""Retained menu widgets.
+
+A widget renders itself onto its own surface once and blits that surface
+every frame after, it only renders again when something it shows changes
+(hover, the on/off state, the text). ``render_text`` does the same for
+loose text: rendered lines are kept in a small cache keyed by font, text
+and colour, so a menu drawing the same captions every frame renders them
+once.
+"""
+from collections import OrderedDict
+
+import pygame
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+TEXT_CACHE_SIZE = 512
+
+_text_cache = OrderedDict()
+_fonts = {}
+
+
+def default_font(size):
+    """The default font at ``size``, loaded once."""
+    if size not in _fonts:
+        _fonts[size] = pygame.font.Font(None, size)
+    return _fonts[size]
+
+
+def render_text(font, text, color):
+    """Rendered text, from the cache when it was rendered lately."""
+    key = (id(font), text, color)
+    surface = _text_cache.get(key)
+    if surface is None:
+        surface = _text_cache[key] = font.render(text, True, color)
+        if len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
+    return surface
+
+
+def cached_text():
+    """The rendered lines in the cache, for memory accounting."""
+    return list(_text_cache.values())
+
+
+class Widget:
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self._surface = None
+        self._offset = (0, 0)
+        self._look = None
+
+    @property
+    def rendered(self):
+        """The surface drawn last, None before the first draw."""
+        return self._surface
+
+    def look(self):
+        """Everything the widget's appearance depends on, it renders again when this changes."""
+        return None
+
+    def render(self):
+        """(surface, offset of the surface from the widget's top left)"""
+        raise NotImplementedError
+
+    def draw(self, surface):
+        look = self.look()
+        if self._surface is None or look != self._look:
+            self._surface, self._offset = self.render()
+            self._look = look
+        surface.blit(self._surface, (self.rect.x + self._offset[0], self.rect.y + self._offset[1]))
+
+
+class Button(Widget):
+    def __init__(self, x, y, width, height, text, color=(100, 100, 255), hover_color=(150, 150, 255), text_color=WHITE,
+                 font=None):
+        super().__init__((x, y, width, height))
+        self.text = text
+        self.color = color
+        self.hover_color = hover_color
+        self.text_color = text_color
+        self.hovered = False
+        self.font = font or default_font(36)
+
+    def look(self):
+        return self.hovered, self.text
+
+    def render(self):
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        rect = surface.get_rect()
+        color = self.hover_color if self.hovered else self.color
+
+        # Draw button with pixel art style
+        pygame.draw.rect(surface, color, rect)
+        pygame.draw.rect(surface, (color[0] * 0.8, color[1] * 0.8, color[2] * 0.8), rect, 4)
+
+        # Add lighting effect
+        light_rect = pygame.Rect(4, 4, rect.width - 8, 10)
+        pygame.draw.rect(surface, (min(255, color[0] + 50), min(255, color[1] + 50), min(255, color[2] + 50)),
+                         light_rect)
+
+        # Draw text
+        text_surface = self.font.render(self.text, True, self.text_color)
+        surface.blit(text_surface, text_surface.get_rect(center=rect.center))
+        return surface, (0, 0)
+
+    def check_hover(self, mouse_pos):
+        self.hovered = self.rect.collidepoint(mouse_pos)
+        return self.hovered
+
+    def is_clicked(self, mouse_pos, mouse_click):
+        return self.rect.collidepoint(mouse_pos) and mouse_click
+
+
+# Toggle button for on/off settings
+class ToggleButton(Widget):
+    def __init__(self, x, y, width, height, text, is_on=True, font=None):
+        super().__init__((x, y, width, height))
+        self.text = text
+        self.is_on = is_on
+        self.font = font or default_font(28)
+
+    def look(self):
+        return self.is_on, self.text
+
+    def render(self):
+        # The label sits left of the switch, the surface covers both
+        label = self.font.render(self.text, True, WHITE)
+        left = label.get_width() + 10
+        surface = pygame.Surface((left + self.rect.width, max(self.rect.height, label.get_height())),
+                                 pygame.SRCALPHA)
+        switch = pygame.Rect(left, 0, self.rect.width, self.rect.height)
+        surface.blit(label, label.get_rect(midright=(switch.x - 10, switch.centery)))
+
+        # Draw toggle background
+        bg_color = (80, 80, 80)
+        pygame.draw.rect(surface, bg_color, switch, border_radius=switch.height // 2)
+
+        # Draw toggle indicator
+        if self.is_on:
+            indicator_color = (100, 255, 100)
+            indicator_rect = pygame.Rect(switch.x + switch.width // 2, switch.y + 2,
+                                         switch.width // 2 - 4, switch.height - 4)
+        else:
+            indicator_color = (255, 100, 100)
+            indicator_rect = pygame.Rect(switch.x + 2, switch.y + 2, switch.width // 2 - 4, switch.height - 4)
+
+        pygame.draw.rect(surface, indicator_color, indicator_rect, border_radius=indicator_rect.height // 2)
+
+        # Draw text on indicator
+        status_text = "ON" if self.is_on else "OFF"
+        status_surface = self.font.render(status_text, True, BLACK)
+        surface.blit(status_surface, status_surface.get_rect(center=indicator_rect.center))
+        return surface, (-left, 0)
+
+    def is_clicked(self, mouse_pos, mouse_click):
+        if self.rect.collidepoint(mouse_pos) and mouse_click:
+            self.is_on = not self.is_on
+            return True
+        return False
@@ -0,0 +1,92 @@
+"""What the entities of a match share: sprite groups, the stage and the game's services.
+
+``Samurai``, ``Projectile``, ``PowerUp`` and ``Platform`` are made with a
+``World`` and reach everything outside themselves through it, so a tool or
+a test can build and step a match without a window or the game module::
+
+    world = World(character_sprites, projectile_styles)
+    world.build_stage(PLATFORM_DATA)
+    fighter = Samurai(world, 100, 620, controls, character)
+
+Every service is optional. Without them a world plays silently, shows no
+screen effects, logs nothing and records no replay. The game keeps one world
+for the session and ``reset`` empties it before every match.
+"""
+import random
+
+import pygame
+
+from .effect_pool import EffectPool
+from .entities import Platform, Particle
+from .navigation import NavGraph
+from .quality import QualityGovernor
+
+
+class World:
+    def __init__(self, sprites, projectile_styles, effects=None, quality=None, post_fx=None, sound=None, log=None):
+        self.sprites = sprites  # sprites(character) -> animation name -> images, shared by its fighters
+        self.projectile_styles = projectile_styles  # Projectile type -> ProjectileStyle
+        self.effects = effects if effects is not None else EffectPool()
+        self.quality = quality or QualityGovernor("high")
+        self.post_fx = post_fx  # Shake and flash over the frame
+        self.sound = sound  # sound(name) plays a sound effect
+        self.log = log  # log(kind, **fields) records a gameplay event
+        self.replay_writer = None  # ReplayWriter of the match, when recording
+        self.debug = False  # Labels show the AI's state
+        self.ai_async = "off"  # Where master AI decisions run, see pixel_samurai.ai_worker
+        self.master_ai_count = 0  # Master AIs in the match, they share the search budget
+
+        # Everyone in the match, in seat order, and the stage they stand on
+        self.fighters = []
+        self.platform_data = []
+        self.nav_graph = None
+        self.reset()
+
+    def reset(self):
+        """Empty the groups for a new match, the stage is built again with build_stage()."""
+        self.all_sprites = pygame.sprite.Group()
+        self.platforms = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+        self.particles = []
+        self.effects.clear()
+
+    def build_stage(self, platform_data):
+        """Platforms from (x, y, width, height, type) tuples, into platforms and all_sprites, and their
+        navigation graph for the AI."""
+        self.platform_data = list(platform_data)
+        for x, y, w, h, platform_type in self.platform_data:
+            platform = Platform(self, x, y, w, h, platform_type)
+            self.platforms.add(platform)
+            self.all_sprites.add(platform)
+        self.nav_graph = NavGraph(self.platform_data)
+
+    def fighter_number(self, fighter):
+        """Position of a fighter in the match, None for anything else (e.g. the stage)"""
+        return self.fighters.index(fighter) if fighter in self.fighters else None
+
+    def event(self, kind, **fields):
+        if self.log:
+            self.log(kind, **fields)
+
+    def play(self, name):
+        if self.sound:
+            self.sound(name)
+
+    def spawn_effect(self, kind, x, y):
+        # A world without effect frames registered shows none
+        if kind in self.effects.kinds:
+            self.effects.spawn(kind, x, y)
+
+    def shake(self):
+        if self.post_fx:
+            self.post_fx.shake()
+
+    def flash(self):
+        if self.post_fx:
+            self.post_fx.flash()
+
+    def create_particles(self, x, y, count=10, color=(255, 255, 0), speed=1):
+        # Scale the burst by the quality level, rounding at random so small bursts still show up sometimes
+        count = int(count * self.quality.particles + random.random())
+        for _ in range(min(count, self.quality.max_particles - len(self.particles))):
+            self.particles.append(Particle(x, y, color, speed))
@@ -0,0 +1,12 @@
+import pygame
+import pytest
+
+
+@pytest.fixture
+def display(monkeypatch):
+    # Converting surfaces to the display format needs a display, a dummy one does
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
@@ -0,0 +1,78 @@
+import threading
+import time
+from functools import partial
+
+from pixel_samurai.ai_worker import AIWorker, LatencyStats
+from pixel_samurai.lookahead import LookaheadPlanner
+from pixel_samurai.settings import PLATFORM_DATA
+from pixel_samurai.simulation import FighterState, WorldState
+
+
+class Gated:
+    """Agent answering with the snapshot's tick once the test lets it."""
+
+    def __init__(self, gate):
+        self.gate = gate
+
+    def decide(self, world):
+        self.gate.wait(5)
+        return world.tick
+
+
+def answer(worker, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        result = worker.poll()
+        if result is not None:
+            return result
+        time.sleep(0.001)
+    raise AssertionError("the worker never answered")
+
+
+def world(tick):
+    fighter = FighterState(x=300.0, y=594.0, vel_x=0.0, vel_y=0.0, speed=5.0, health=100, special_meter=0.0,
+                           cooldown=0, attack_lock=0, hurt=0, shield=0, on_ground=True, facing=1)
+    return WorldState(tick, (fighter, fighter._replace(x=600.0, facing=-1)), (), tuple(PLATFORM_DATA))
+
+
+def test_a_busy_worker_ignores_new_snapshots():
+    gate = threading.Event()
+    worker = AIWorker(partial(Gated, gate), "thread")
+    assert worker.submit(world(1))
+    assert not worker.submit(world(2)) and worker.busy
+    assert worker.poll() is None
+    gate.set()
+    assert answer(worker) == 1 and not worker.busy
+    assert worker.submit(world(3)) and answer(worker) == 3
+    assert worker.latency.decisions == 2
+    worker.close()
+
+
+def test_a_late_answer_counts_one_miss():
+    gate = threading.Event()
+    worker = AIWorker(partial(Gated, gate), "thread", deadline=0.01)
+    worker.submit(world(1))
+    time.sleep(0.02)
+    assert worker.poll() is None and worker.poll() is None
+    assert worker.latency.misses == 1
+    gate.set()
+    assert answer(worker) == 1
+    worker.close()
+
+
+def test_the_planner_runs_in_a_worker_process():
+    worker = AIWorker(partial(LookaheadPlanner, horizon=5), "process")
+    worker.submit(world(7))
+    plan, tick, intent = answer(worker)
+    assert plan.shape[0] == 5 and tick == 7 and intent
+    worker.close()
+    worker.worker.join(10)
+    assert not worker.worker.is_alive()
+
+
+def test_latency_percentiles():
+    stats = LatencyStats(window=4)
+    for seconds in (0.5, 0.1, 0.2, 0.3, 0.4):  # The first falls out of the window
+        stats.add(seconds)
+    assert stats.percentile(50) == 0.3 and stats.percentile(100) == 0.4
+    assert stats.decisions == 5
@@ -0,0 +1,42 @@
+import itertools
+from types import SimpleNamespace
+
+import pygame
+
+from pixel_samurai import assets
+from pixel_samurai.assets import AssetLoader
+
+
+def write_frames(folder, count):
+    folder.mkdir()
+    for i in range(count):
+        pygame.image.save(pygame.Surface((8, 8)), str(folder / f"frame{i}.png"))
+
+
+def test_poll_converts_a_slice_per_call(tmp_path, display, monkeypatch):
+    write_frames(tmp_path / "run", 8)
+    loader = AssetLoader()
+    loader.images("run", str(tmp_path / "run"))
+    loader.jobs["run"].result()
+    # Every look at the clock is a millisecond later, a 3.5 ms budget converts three images
+    ticks = itertools.count()
+    monkeypatch.setattr(assets, "time", SimpleNamespace(perf_counter=lambda: next(ticks) / 1000))
+    assert not loader.poll(0.0035)
+    assert loader._converting[0][2] == 3 and "run" not in loader.assets
+    assert not loader.poll(0.0035)
+    assert loader._converting[0][2] == 6
+    assert loader.poll(0.0035)
+    images = loader.get("run")
+    assert len(images) == 8 and all(image.get_flags() & pygame.SRCALPHA for image in images)
+    loader.close()
+
+
+def test_get_with_wait_jumps_the_queue(tmp_path, display):
+    write_frames(tmp_path / "idle", 2)
+    loader = AssetLoader()
+    loader.images("idle", str(tmp_path / "idle"))
+    images = loader.get("idle", wait=True)
+    assert len(images) == 2 and loader.finished
+    # poll has nothing left to hand over
+    assert loader.poll(0) and not loader._waiting and not loader._converting
+    loader.close()
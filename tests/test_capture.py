@@ -0,0 +1,56 @@
+import threading
+
+import pygame
+import pytest
+
+from pixel_samurai.capture import ClipRecorder, read_clip
+
+
+def frame(shade):
+    surface = pygame.Surface((64, 36))
+    surface.fill((shade, 0, 0))
+    return surface
+
+
+def shades(path):
+    size, fps, frames = read_clip(path)
+    return size, fps, [image.get_at((0, 0))[0] for image in frames]
+
+
+def finish(recorder):
+    # Saving writes on a thread of its own, wait for it too
+    recorder.close()
+    for thread in threading.enumerate():
+        if thread.name == "Clip writer":
+            thread.join()
+
+
+def test_the_instant_replay_keeps_the_last_seconds(tmp_path):
+    recorder = ClipRecorder((64, 36), str(tmp_path), replay_seconds=1, every=30)  # Two frames a second
+    for i in range(1, 121):
+        recorder.capture(frame(i))
+    path = recorder.save_replay()
+    finish(recorder)
+    # Every 30th frame was captured, the replay held the last two
+    assert shades(path) == ((32, 18), 2, [90, 120])
+
+
+def test_recording_writes_every_captured_frame(tmp_path):
+    recorder = ClipRecorder((64, 36), str(tmp_path), replay_seconds=0, every=1)
+    assert not recorder.active
+    recorder.capture(frame(1))  # Nothing to keep it for
+    assert recorder.toggle_recording()
+    for i in range(2, 5):
+        recorder.capture(frame(i))
+    path = recorder.clip_path
+    assert not recorder.toggle_recording()
+    recorder.capture(frame(5))
+    finish(recorder)
+    assert shades(path)[2] == [2, 3, 4]
+
+
+def test_read_clip_rejects_other_files(tmp_path):
+    path = tmp_path / "clip.psc"
+    path.write_bytes(b"not a clip at all")
+    with pytest.raises(ValueError):
+        read_clip(str(path))
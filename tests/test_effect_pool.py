@@ -0,0 +1,67 @@
+import pygame
+
+from pixel_samurai.effect_pool import EffectPool, frame_table
+from pixel_samurai.render_queue import RenderQueue
+
+
+def images(count, size=(10, 20)):
+    return [pygame.Surface(size) for _ in range(count)]
+
+
+def test_frame_table_holds_every_tick():
+    frames = images(3)
+    assert frame_table(frames, 0.5) == (frames[0], frames[0], frames[1], frames[1], frames[2], frames[2])
+    assert frame_table(frames, 1) == tuple(frames)
+
+
+def test_spawn_centres_and_finishes():
+    pool = EffectPool(4)
+    frames = images(2)
+    pool.register("flash", frames, 1)
+    pool.spawn("flash", 100, 50)
+    slot = pool.active[0]
+    assert slot.position == (95, 40) and slot.image is frames[0]
+    pool.update(scroll=3)
+    assert slot.image is frames[1] and slot.position == (92, 40)
+    pool.update(scroll=0)
+    assert len(pool) == 0 and len(pool.free) == 4
+
+
+def test_full_pool_recycles_the_oldest():
+    pool = EffectPool(2)
+    pool.register("flash", images(5), 1)
+    pool.spawn("flash", 0, 0)
+    oldest = pool.active[0]
+    pool.update(scroll=0)
+    pool.spawn("flash", 10, 10)
+    pool.spawn("flash", 20, 20)
+    assert pool.recycled == 1 and len(pool) == 2
+    # The oldest slot was reused for the newest effect, nothing new was made
+    assert pool.active[-1] is oldest and oldest.tick == 0
+    assert set(pool.active) <= set(pool.slots)
+
+
+def test_finished_slots_are_reused_in_order():
+    pool = EffectPool(3)
+    pool.register("short", images(1), 1)
+    pool.register("long", images(4), 1)
+    pool.spawn("long", 0, 0)
+    pool.spawn("short", 0, 0)
+    pool.spawn("long", 5, 5)
+    first, _, last = pool.active
+    pool.update(scroll=0)
+    assert pool.active == [first, last] and len(pool.free) == 1
+    pool.spawn("short", 0, 0)
+    assert pool.recycled == 0
+
+
+def test_submit_and_clear():
+    pool = EffectPool(4)
+    pool.register("flash", images(3), 1)
+    for x in (10, 20):
+        pool.spawn("flash", x, 0)
+    queue = RenderQueue()
+    pool.submit(queue)
+    assert sum(len(batch) for batch in queue.layers) == 2
+    pool.clear()
+    assert len(pool) == 0 and len(pool.free) == 4
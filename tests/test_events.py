@@ -0,0 +1,45 @@
+import json
+
+from pixel_samurai.events import EventLog
+
+
+def read(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_events_are_written_as_json_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = EventLog(str(path), flush_interval=3600)
+    log.emit("hit", 12, fighter=0, damage=7)
+    log.emit("jump", 13, fighter=1)
+    log.close()
+    events = read(path)
+    assert [{k: v for k, v in event.items() if k != "time"} for event in events] == [
+        {"tick": 12, "event": "hit", "fighter": 0, "damage": 7},
+        {"tick": 13, "event": "jump", "fighter": 1}]
+    assert log.written == 2 and log.dropped == 0
+
+
+def test_the_file_rotates_and_keeps_the_last_backups(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = EventLog(str(path), flush_interval=3600, max_bytes=200, backups=2)
+    log._stop.set()  # Flushed by hand below, one batch per file
+    log._thread.join()
+    for tick in range(4):
+        log.emit("attack", tick, fighter=0, padding="x" * 100)
+        log._flush()
+    # Every batch pushed the file over the limit: the newest is the live file, then .1 and .2, the oldest is gone
+    assert [event["tick"] for event in read(path)] == [3]
+    assert [event["tick"] for event in read(tmp_path / "events.jsonl.1")] == [2]
+    assert [event["tick"] for event in read(tmp_path / "events.jsonl.2")] == [1]
+    assert not (tmp_path / "events.jsonl.3").exists()
+
+
+def test_a_full_buffer_drops_the_oldest_events(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = EventLog(str(path), capacity=3, flush_interval=3600)
+    for tick in range(5):
+        log.emit("jump", tick)
+    log.close()
+    assert [event["tick"] for event in read(path)] == [2, 3, 4]
+    assert log.dropped == 2
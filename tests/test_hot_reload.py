@@ -0,0 +1,106 @@
+import os
+
+from pixel_samurai.hot_reload import FileWatcher
+
+
+def save(path, data, mtime):
+    with open(path, "w") as file:
+        file.write(data)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def watcher():
+    # Every poll looks, the tests step time by calling poll
+    return FileWatcher(interval=0)
+
+
+def test_file_change_is_reported_once_it_holds_still(tmp_path):
+    path = str(tmp_path / "roster.json")
+    save(path, "{}", 1_000_000_000)
+    calls = []
+    files = watcher()
+    files.watch_file(path, lambda: calls.append(1))
+    files.poll()
+    assert calls == []
+
+    save(path, '{"half', 2_000_000_000)
+    files.poll()
+    assert calls == []  # Still being written
+    save(path, '{"half": "done"}', 3_000_000_000)
+    files.poll()
+    assert calls == []
+    files.poll()
+    assert calls == [1]
+    files.poll()
+    assert calls == [1] and files.reloads == 1
+
+
+def test_deleted_file_is_not_reported(tmp_path):
+    path = str(tmp_path / "settings.py")
+    save(path, "x = 1", 1_000_000_000)
+    calls = []
+    files = watcher()
+    files.watch_file(path, lambda: calls.append(1))
+    os.remove(path)
+    files.poll()
+    files.poll()
+    assert calls == []
+    save(path, "x = 2", 2_000_000_000)
+    files.poll()
+    files.poll()
+    assert calls == [1]
+
+
+def test_folder_reports_changed_names(tmp_path):
+    for name in ("idle_0.png", "idle_1.png", "notes.txt"):
+        save(str(tmp_path / name), "a", 1_000_000_000)
+    calls = []
+    files = watcher()
+    files.watch_folder(str(tmp_path), calls.append)
+    save(str(tmp_path / "idle_1.png"), "bb", 2_000_000_000)
+    save(str(tmp_path / "notes.txt"), "bb", 2_000_000_000)  # Not an image
+    files.poll()
+    files.poll()
+    assert calls == [["idle_1.png"]]
+
+
+def test_folder_reports_none_when_files_come_or_go(tmp_path):
+    save(str(tmp_path / "idle_0.png"), "a", 1_000_000_000)
+    calls = []
+    files = watcher()
+    files.watch_folder(str(tmp_path), calls.append)
+    save(str(tmp_path / "idle_1.png"), "a", 1_000_000_000)
+    files.poll()
+    files.poll()
+    os.remove(str(tmp_path / "idle_0.png"))
+    files.poll()
+    files.poll()
+    assert calls == [None, None]
+
+
+def test_failing_callback_does_not_stop_the_watcher(tmp_path, capsys):
+    path = str(tmp_path / "roster.json")
+    save(path, "{}", 1_000_000_000)
+    files = watcher()
+    files.watch_file(path, lambda: 1 / 0)
+    save(path, "{ }", 2_000_000_000)
+    files.poll()
+    files.poll()
+    assert "failed" in capsys.readouterr().out
+    save(path, "{  }", 3_000_000_000)
+    files.poll()
+    files.poll()
+    assert files.reloads == 2
+
+
+def test_interval_limits_polling(tmp_path):
+    path = str(tmp_path / "roster.json")
+    save(path, "{}", 1_000_000_000)
+    calls = []
+    files = FileWatcher(interval=3600)
+    files.watch_file(path, lambda: calls.append(1))
+    files.poll()
+    save(path, "{ }", 2_000_000_000)
+    files.poll()
+    files.poll()
+    assert calls == []
@@ -0,0 +1,111 @@
+import pygame
+
+from pixel_samurai.inputs import InputBuffer, PadBinding, PAD_BUTTONS, PAD_DEADZONE
+
+CONTROLS = {'left': pygame.K_a, 'right': pygame.K_d, 'jump': pygame.K_w, 'attack': pygame.K_f, 'special': pygame.K_g}
+
+
+class Pad:
+    """Stands in for a pygame Joystick with two axes, one hat and four buttons."""
+
+    def __init__(self):
+        self.buttons = [False] * 4
+        self.axes = [0.0, 0.0]
+        self.hat = (0, 0)
+
+    def get_numbuttons(self):
+        return len(self.buttons)
+
+    def get_button(self, button):
+        return self.buttons[button]
+
+    def get_numaxes(self):
+        return len(self.axes)
+
+    def get_axis(self, axis):
+        return self.axes[axis]
+
+    def get_numhats(self):
+        return 1
+
+    def get_hat(self, hat):
+        return self.hat
+
+
+def pad_buffer(binding):
+    buffer = InputBuffer(CONTROLS)
+    buffer.joystick = 7
+    buffer.binding = binding
+    return buffer
+
+
+def test_binding_from_json_converts_button_numbers():
+    binding = PadBinding.from_json({"deadzone": 0.25, "axis": 2, "up": "jump", "buttons": {"0": "jump", "5": "attack"}})
+    assert binding.buttons == {0: 'jump', 5: 'attack'}
+    assert (binding.axis, binding.hat, binding.deadzone, binding.up) == (2, 0, 0.25, 'jump')
+
+    default = PadBinding.from_json({})
+    assert default.buttons == PAD_BUTTONS
+    assert (default.axis, default.deadzone, default.up) == (0, PAD_DEADZONE, None)
+
+
+def test_poll_releases_what_an_event_left_held():
+    buffer = pad_buffer(PadBinding())
+    pad = Pad()
+    buffer.feed(pygame.event.Event(pygame.JOYBUTTONDOWN, instance_id=7, button=2), 1.0)
+    assert buffer.pad_held['attack']
+    # The button-up event never arrived, the next poll sees the button is up
+    buffer.poll(pad, 1.1)
+    assert not buffer.pad_held['attack']
+
+
+def test_poll_holds_an_action_while_any_of_its_inputs_is():
+    buffer = pad_buffer(PadBinding(up='jump'))
+    pad = Pad()
+    pad.buttons[2] = pad.buttons[3] = True  # Both bound to attack
+    pad.axes = [-0.9, -0.9]
+    buffer.poll(pad, 1.0)
+    assert buffer.pad_held['attack'] and buffer.pad_held['left'] and buffer.pad_held['jump']
+
+    pad.buttons[3] = False
+    pad.axes = [0.0, 0.0]
+    pad.hat = (1, 0)
+    buffer.poll(pad, 1.1)
+    assert buffer.pad_held['attack'] and buffer.pad_held['right']
+    assert not buffer.pad_held['left'] and not buffer.pad_held['jump']
+
+
+def key(kind, name):
+    return pygame.event.Event(kind, key=CONTROLS[name])
+
+
+def test_a_tap_between_samples_is_seen_once():
+    buffer = InputBuffer(CONTROLS)
+    buffer.feed(key(pygame.KEYDOWN, 'attack'), 1.0)
+    buffer.feed(key(pygame.KEYUP, 'attack'), 1.004)
+    keys, times = buffer.sample()
+    assert keys[CONTROLS['attack']] and times == [1.0]
+    assert buffer.taps == 1
+    # Released, so the next frame no longer has it
+    keys, times = buffer.sample()
+    assert not keys[CONTROLS['attack']] and times == []
+
+
+def test_a_held_key_keeps_its_first_press_time():
+    buffer = InputBuffer(CONTROLS)
+    buffer.feed(key(pygame.KEYDOWN, 'left'), 1.0)
+    buffer.feed(key(pygame.KEYDOWN, 'left'), 1.01)  # Key repeat
+    keys, times = buffer.sample()
+    assert keys[CONTROLS['left']] and times == [1.0] and buffer.taps == 0
+    keys, times = buffer.sample()
+    assert keys[CONTROLS['left']] and times == []
+
+
+def test_clear_drops_presses_but_not_held_keys():
+    buffer = InputBuffer(CONTROLS)
+    buffer.feed(key(pygame.KEYDOWN, 'jump'), 1.0)
+    buffer.feed(key(pygame.KEYUP, 'jump'), 1.01)
+    buffer.feed(key(pygame.KEYDOWN, 'right'), 1.02)
+    buffer.clear()
+    keys, times = buffer.sample()
+    assert not keys[CONTROLS['jump']] and keys[CONTROLS['right']] and times == []
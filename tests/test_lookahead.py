@@ -0,0 +1,46 @@
+from pixel_samurai.lookahead import LookaheadPlanner, IDLE
+from pixel_samurai.navigation import NavGraph
+from pixel_samurai.settings import HEIGHT, SPRITE_SIZE, MAX_SPECIAL, PLATFORM_DATA, CONTROL_ACTIONS
+from pixel_samurai.simulation import FighterState, WorldState, ATTACK, SPECIAL
+
+GROUND_Y = HEIGHT - 30 - SPRITE_SIZE
+
+
+def fighter(x, facing, special_meter=0):
+    return FighterState(x=float(x), y=float(GROUND_Y), vel_x=0.0, vel_y=0.0, speed=5.0, health=100,
+                        special_meter=float(special_meter), cooldown=0, attack_lock=0, hurt=0, shield=0,
+                        on_ground=True, facing=facing)
+
+
+def duel(tick=0, special_meter=0):
+    # The planner's fighter faces the opponent on open ground, in range of its shots
+    return WorldState(tick, (fighter(300, 1, special_meter), fighter(600, -1)), (), tuple(PLATFORM_DATA))
+
+
+def test_decide_plans_from_the_worlds_tick():
+    planner = LookaheadPlanner(NavGraph(PLATFORM_DATA), horizon=20)
+    plan, tick, intent = planner.decide(duel(tick=40))
+    assert plan.shape == (20, len(CONTROL_ACTIONS)) and tick == 40
+    assert intent in planner.names and planner.searches == 1
+    # Lined up with the opponent the best plan shoots
+    assert plan[:, ATTACK].any()
+
+
+def test_specials_are_only_planned_with_a_full_meter():
+    planner = LookaheadPlanner(horizon=20)
+    plan, _, _ = planner.decide(duel())
+    assert not plan[:, SPECIAL].any()
+    plan, _, intent = planner.decide(duel(special_meter=MAX_SPECIAL))
+    assert plan[:, SPECIAL].any() and "special" in intent
+
+
+def test_act_spreads_a_search_over_frames():
+    planner = LookaheadPlanner(horizon=10, budget=0)  # One simulated step per call
+    for tick in range(9):
+        assert planner.act(duel(tick)) == IDLE
+    assert planner.search["step"] == 9 and planner.searches == 0
+    planner.act(duel(9))
+    assert planner.searches == 1 and planner.search_frames == 10 and planner.plan_tick == 0
+    # The next search starts with what the finished plan still has to play
+    buttons = planner.act(duel(10))
+    assert planner.search is not None and buttons == IDLE  # Past the end of a 10 frame plan
@@ -0,0 +1,52 @@
+import pygame
+import pytest
+
+from pixel_samurai.memory import MemoryMonitor, trend, surface_bytes
+
+
+def test_trend_of_a_steady_leak():
+    samples = [{"time": 1000 + minute * 60, "leak": 500 + minute * 10, "flat": 7} for minute in range(30)]
+    trends = trend(samples)
+    assert set(trends) == {"leak", "flat"}
+    first, last, per_hour = trends["leak"]
+    assert (first, last) == (500, 790)
+    assert per_hour == pytest.approx(600)
+    assert trends["flat"] == (7, 7, 0)
+
+
+def test_trend_ignores_noise_around_a_flat_line():
+    samples = [{"time": t, "value": 100 + (5 if t % 2 else -5)} for t in range(0, 3600, 60)]
+    assert trend(samples)["value"][2] == pytest.approx(0, abs=1)
+
+
+def test_trend_needs_two_samples_and_common_names():
+    assert trend([]) == {}
+    assert trend([{"time": 0, "value": 1}]) == {}
+    # A number missing from any sample (an owner registered late) has no trend
+    trends = trend([{"time": 0, "a": 1}, {"time": 60, "a": 2, "b": 5}])
+    assert list(trends) == ["a"]
+
+
+def test_surfaces_are_counted_once_by_first_owner():
+    monitor = MemoryMonitor()
+    shared, own = pygame.Surface((10, 10)), pygame.Surface((4, 4))
+    monitor.surfaces("sprites", lambda: [shared, shared, None])
+    monitor.surfaces("effects", lambda: [shared, own])
+    usage = monitor.surface_usage()
+    assert usage == {"sprites": (1, surface_bytes(shared)), "effects": (1, surface_bytes(own))}
+
+
+def test_sample_is_flat():
+    class Thing:
+        pass
+
+    monitor = MemoryMonitor()
+    monitor.watch(Thing)
+    monitor.count("things", lambda: 3)
+    monitor.surfaces("canvas", lambda: [pygame.Surface((8, 8))])
+    keep = [Thing(), Thing()]
+    sample = monitor.sample()
+    assert sample["objects.Thing"] == len(keep)
+    assert sample["count.things"] == 3
+    assert sample["surfaces.canvas"] == sample["surfaces.total"] > 0
+    assert all(isinstance(value, (int, float)) for value in sample.values())
@@ -0,0 +1,38 @@
+import pytest
+
+from pixel_samurai.metrics import Metrics
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics(interval=3600)
+    yield metrics
+    metrics.close()
+
+
+def test_prometheus_buckets_are_cumulative(metrics):
+    metrics.histogram("frame_seconds", "Frame time", (0.01, 0.02, 0.05))
+    for value in (0.005, 0.01, 0.015, 0.04, 0.04, 0.2):
+        metrics.observe("frame_seconds", value)
+    lines = metrics.render_prometheus(metrics.snapshot()).splitlines()
+    assert lines == [
+        "# HELP pixel_samurai_frame_seconds Frame time",
+        "# TYPE pixel_samurai_frame_seconds histogram",
+        # A value on a bound counts in that bucket, and every bucket counts everything below it
+        'pixel_samurai_frame_seconds_bucket{le="0.01"} 2',
+        'pixel_samurai_frame_seconds_bucket{le="0.02"} 3',
+        'pixel_samurai_frame_seconds_bucket{le="0.05"} 5',
+        'pixel_samurai_frame_seconds_bucket{le="+Inf"} 6',
+        f"pixel_samurai_frame_seconds_sum {0.005 + 0.01 + 0.015 + 0.04 + 0.04 + 0.2}",
+        "pixel_samurai_frame_seconds_count 6",
+    ]
+
+
+def test_gauges_are_left_out_until_set(metrics):
+    metrics.counter("matches_total", "Matches")
+    metrics.gauge("fps", "Frames per second")
+    metrics.inc("matches_total", 2)
+    assert "pixel_samurai_fps" not in metrics.render_prometheus(metrics.snapshot())
+    metrics.set("fps", 59.5)
+    text = metrics.render_prometheus(metrics.snapshot())
+    assert "pixel_samurai_matches_total 2\n" in text and "pixel_samurai_fps 59.5\n" in text
@@ -0,0 +1,69 @@
+import math
+
+from pixel_samurai.navigation import NavGraph, air_frames, JUMP, DROP, WALK, LAVA_PENALTY
+from pixel_samurai.settings import JUMP_POWER
+
+# Ground, a ledge a jump above it, a second ledge a jump above that one, a lava pool at ground level and a
+# platform too high to reach from anywhere
+GROUND, LEDGE, HIGH, LAVA, CLOUD = range(5)
+LAYOUT = [
+    (0, 680, 900, 40, "normal"),
+    (500, 560, 200, 20, "normal"),
+    (520, 420, 160, 20, "normal"),
+    (900, 680, 380, 40, "lava"),
+    (0, 50, 150, 20, "normal"),
+]
+
+
+def edge(graph, source, target):
+    return next((edge for edge in graph.edges[source] if edge.target == target), None)
+
+
+def test_air_frames_reach():
+    assert air_frames(100, JUMP_POWER) is not None
+    assert air_frames(400, JUMP_POWER) is None
+    assert air_frames(-100, 0.0) is not None  # Falling down to a lower ledge
+
+
+def test_edges_between_platforms():
+    graph = NavGraph(LAYOUT)
+    assert edge(graph, GROUND, LEDGE).kind == JUMP
+    assert edge(graph, LEDGE, HIGH).kind == JUMP
+    assert edge(graph, LEDGE, GROUND).kind == DROP
+    assert edge(graph, GROUND, HIGH) is None  # Two jumps up
+    assert edge(graph, GROUND, CLOUD) is None
+
+
+def test_walking_onto_lava_costs_the_penalty():
+    graph = NavGraph(LAYOUT)
+    to_lava, from_lava = edge(graph, GROUND, LAVA), edge(graph, LAVA, GROUND)
+    assert to_lava.kind == from_lava.kind == WALK
+    assert to_lava.cost == from_lava.cost + LAVA_PENALTY
+
+
+def test_routes():
+    graph = NavGraph(LAYOUT)
+    route = graph.route(GROUND, HIGH)
+    assert [(edge.source, edge.target) for edge in route] == [(GROUND, LEDGE), (LEDGE, HIGH)]
+    assert graph.dist[GROUND][HIGH] == sum(edge.cost for edge in route)
+    assert graph.next_edge(GROUND, HIGH) is route[0]
+    assert graph.next_edge(GROUND, GROUND) is None
+    assert graph.route(GROUND, CLOUD) == []
+    assert math.isinf(graph.dist[GROUND][CLOUD])
+
+
+def test_locate():
+    graph = NavGraph(LAYOUT)
+    assert graph.locate(100, 680) == GROUND
+    assert graph.locate(600, 560) == LEDGE
+    assert graph.locate(600, 300) == HIGH  # Airborne, the first platform below
+    assert graph.locate(1000, 680) == LAVA
+    assert graph.locate(300, 700) is None  # Under the ground
+
+
+def test_steer_on_the_goal_platform():
+    graph = NavGraph(LAYOUT)
+    assert graph.steer(GROUND, GROUND, 100, goal_x=400) == (1, False)
+    assert graph.steer(GROUND, GROUND, 400, goal_x=100) == (-1, False)
+    assert graph.steer(GROUND, GROUND, 100, goal_x=105) == (0, False)
+    assert graph.steer(None, GROUND, 100) == (0, False)
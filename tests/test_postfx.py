@@ -0,0 +1,51 @@
+import pygame
+
+from pixel_samurai.postfx import PostEffect, PostFX, SUSPEND_FRAMES, SUSPEND_LIMIT
+
+
+def test_an_effect_is_suspended_after_overrunning_in_a_row():
+    effect = PostEffect("heat", 0.001, patience=3)
+    effect.measure(0.002)
+    effect.measure(0.002)
+    effect.measure(0.0005)  # Back under the budget, the count starts over
+    effect.measure(0.002)
+    effect.measure(0.002)
+    assert not effect.suspended
+    effect.measure(0.002)
+    assert effect.suspended == SUSPEND_FRAMES and effect.over == 0
+
+
+def test_suspensions_in_a_row_back_off_up_to_the_limit():
+    effect = PostEffect("desaturate", 0.001, patience=1)
+    waits = []
+    for _ in range(7):
+        effect.measure(0.002)
+        waits.append(effect.suspended // SUSPEND_FRAMES)
+    assert waits == [1, 2, 4, 8, 16, SUSPEND_LIMIT, SUSPEND_LIMIT]
+
+    # A frame within the budget forgives the earlier ones
+    effect.measure(0.0005)
+    effect.measure(0.002)
+    assert effect.suspended == SUSPEND_FRAMES
+
+
+def test_a_late_frame_suspends_the_costliest_effect():
+    post_fx = PostFX()
+    heat, vignette = post_fx.effects["heat"], post_fx.effects["vignette"]
+    heat.cost.add(0.0001)
+    vignette.cost.add(0.0003)
+    post_fx.ran = [heat, vignette]
+    post_fx.enabled = False
+    post_fx.frame_done(1.0)
+    post_fx.apply(None)
+    assert vignette.suspended and not heat.suspended
+
+
+def test_low_health_fades_the_colours_to_grey(display):
+    surface = pygame.Surface((200, 120))
+    surface.fill((200, 40, 100))
+    PostFX().apply(surface, health=0.0)
+    # The middle is clear of the vignette, 80% of the way to the pixel's luma
+    luma = (77 * 200 + 150 * 40 + 29 * 100) / 256
+    expected = [0.2 * channel + 0.8 * luma for channel in (200, 40, 100)]
+    assert all(abs(got - want) <= 2 for got, want in zip(surface.get_at((100, 60))[:3], expected))
@@ -0,0 +1,59 @@
+import pytest
+
+from pixel_samurai.profiles import ProfileStore, elo_changes, START_RATING, K_FACTOR
+
+
+def result(name, place, hits=0, damage=0):
+    return {"name": name, "place": place, "health": 0 if place > 1 else 50, "hits_landed": hits,
+            "damage_dealt": damage, "jumps_made": 1, "specials_used": 0}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles.db"))
+    yield store
+    store.close()
+
+
+def test_elo_even_duel():
+    assert elo_changes([1500, 1500], [1, 2]) == [K_FACTOR / 2, -K_FACTOR / 2]
+    assert elo_changes([1500, 1500], [1, 1]) == [0.0, 0.0]
+    assert elo_changes([1500], [1]) == [0.0]
+
+
+def test_elo_upset_moves_more():
+    favourite_wins = elo_changes([1700, 1500], [1, 2])
+    underdog_wins = elo_changes([1700, 1500], [2, 1])
+    assert 0 < favourite_wins[0] < underdog_wins[1]
+    assert sum(underdog_wins) == pytest.approx(0)
+
+
+def test_elo_free_for_all_and_same_names():
+    changes = elo_changes([1500] * 4, [1, 2, 3, 4])
+    assert changes[0] == pytest.approx(K_FACTOR / 2) and changes[3] == pytest.approx(-K_FACTOR / 2)
+    assert sum(changes) == pytest.approx(0)
+    assert elo_changes([1500, 1500], [1, 2], ["Red", "Red"]) == [0.0, 0.0]
+    changes = elo_changes([1500, 1500, 1500], [1, 2, 3], ["CPU", "Blue", "CPU"])
+    assert changes[1] == pytest.approx(0)  # Beat one CPU, lost to the other
+
+
+def test_totals_and_leaderboard(store):
+    store.record_match("pvp", "medium", 600, [result("Red", 1, hits=3, damage=30), result("Blue", 2, hits=1)])
+    store.record_match("pvp", "medium", 500, [result("Blue", 1, hits=2, damage=20), result("Red", 2)])
+    store.record_match("pvp", "medium", 400, [result("Red", 1, hits=4, damage=40), result("Blue", 2)])
+    store.flush()
+    red = store.player("Red")
+    assert (red["matches"], red["wins"], red["hits_landed"], red["damage_dealt"]) == (3, 2, 7, 70)
+    assert red["rating"] > START_RATING > store.player("Blue")["rating"]
+    assert [name for name, *_ in store.leaderboard()] == ["Red", "Blue"]
+    assert [place for _, _, _, place, _ in store.history("Blue")] == [2, 1, 2]
+    assert store.player("Green") is None
+    assert store.written == 3
+
+
+def test_mirror_match_keeps_both_seats(store):
+    store.record_match("pvp", "medium", 600, [result("Red", 1, hits=3), result("Red", 2, hits=1)])
+    store.flush()
+    red = store.player("Red")
+    assert (red["rating"], red["matches"], red["wins"], red["hits_landed"]) == (START_RATING, 1, 1, 4)
+    assert [place for _, _, _, place, _ in store.history("Red")] == [1, 2]
@@ -0,0 +1,63 @@
+import pygame
+
+from pixel_samurai.render_queue import RenderQueue, STAGE, FIGHTERS, LABELS
+
+
+def square(color):
+    surface = pygame.Surface((10, 10))
+    surface.fill(color)
+    return surface
+
+
+def test_layers_draw_bottom_to_top_in_submit_order():
+    queue = RenderQueue()
+    target = pygame.Surface((40, 20))
+    # Submitted top layer first, the stage still ends up underneath
+    queue.submit(square((0, 0, 255)), (0, 0), LABELS)
+    queue.submit(square((255, 0, 0)), (5, 0), STAGE)
+    queue.submit(square((0, 255, 0)), (0, 0), FIGHTERS)
+    queue.submit(square((255, 255, 0)), (5, 0), FIGHTERS)
+    queue.flush(target)
+    assert target.get_at((2, 2))[:3] == (0, 0, 255)
+    # Within the fighters layer the later submit is on top
+    assert target.get_at((12, 2))[:3] == (255, 255, 0)
+    assert (queue.drawn, queue.calls) == (4, 3)
+    assert all(not layer for layer in queue.layers)
+
+
+def test_a_drawable_is_queued_once_per_frame():
+    queue = RenderQueue()
+    sprite = object()
+    queue.submit(square((255, 0, 0)), (0, 0), FIGHTERS, sprite)
+    queue.submit(square((0, 255, 0)), (0, 0), FIGHTERS, sprite)
+    assert not queue.first(sprite)
+    target = pygame.Surface((10, 10))
+    queue.flush(target)
+    assert target.get_at((0, 0))[:3] == (255, 0, 0)
+    assert (queue.drawn, queue.duplicates) == (1, 2)
+    # The next frame starts over
+    assert queue.first(sprite)
+
+
+def test_prescaled_frames_skip_the_shrink_cache():
+    queue = RenderQueue()
+    frame = pygame.Surface((96, 96))
+    small = pygame.Surface((48, 48))
+    small.fill((10, 20, 30))
+    queue.prescale(frame, small)
+    drawn = pygame.Surface((8, 8))
+    queue.submit(frame, (100, 50), FIGHTERS)
+    queue.submit(drawn, (10, 10), FIGHTERS)
+    target = pygame.Surface((640, 360))
+    queue.flush(target, 2)
+    assert target.get_at((50, 25))[:3] == (10, 20, 30)
+    # Only the surface without a prescaled copy went through the cache
+    assert list(queue.reduced) == [(drawn, 2)]
+
+
+def test_prescaled_entries_go_with_their_frame():
+    queue = RenderQueue()
+    frame = pygame.Surface((96, 96))
+    queue.prescale(frame, pygame.Surface((48, 48)))
+    del frame
+    assert len(queue.prescaled) == 0
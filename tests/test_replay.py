@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from pixel_samurai.replay import ReplayWriter, ReplayReader
+from pixel_samurai.simulation import DuelBatch, FighterState, ProjectileState, WorldState, PROJECTILE_SLOTS, \
+    LEFT, RIGHT, JUMP, ATTACK
+
+INTERVAL = 20
+TICKS = 75  # Three whole chunks and a partial one
+
+
+def snapshot(batch, tick):
+    """WorldState of arena 0, the way capture_world sees a live match."""
+    fighters = tuple(FighterState(*(getattr(batch, name)[0, f].tolist() for name in FighterState._fields))
+                     for f in range(batch.fighters))
+    projectiles = tuple(
+        ProjectileState(batch.proj_x[0, slot].item(), batch.proj_y[0, slot].item(), batch.proj_dir[0, slot].item(),
+                        batch.proj_speed[0, slot].item(), batch.proj_w[0, slot].item(),
+                        batch.proj_h[0, slot].item(), batch.proj_damage[0, slot].item(),
+                        int(slot) // PROJECTILE_SLOTS, batch.proj_travel[0, slot].item())
+        for slot in np.flatnonzero(batch.proj_active[0]))
+    return WorldState(tick, fighters, projectiles, tuple(batch.platforms))
+
+
+def inputs(tick):
+    # Walk towards each other, jump now and then and attack every 30 ticks
+    first = 1 << RIGHT | (1 << JUMP if tick % 25 == 5 else 0) | (1 << ATTACK if tick % 30 == 10 else 0)
+    second = 1 << LEFT | (1 << ATTACK if tick % 30 == 25 else 0)
+    return [first, second]
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Path of a recorded replay and the live states, states[t] is the batch at the start of tick t."""
+    path = str(tmp_path / "match.psr")
+    live = DuelBatch(1)
+    writer = ReplayWriter(path, snapshot(live, 0), names=("Red", "Blue"), keyframe_interval=INTERVAL)
+    states = [live.copy()]
+    for tick in range(TICKS):
+        bits = inputs(tick)
+        live.step(((np.array(bits)[:, None] >> np.arange(5)) & 1 == 1)[None])
+        if tick == 40:
+            writer.damage(1, 0, 10)
+        writer.record(bits, lambda t: snapshot(live, t))
+        states.append(live.copy())
+    writer.close()
+    return path, states
+
+
+def test_header_and_index(recording):
+    path, _ = recording
+    reader = ReplayReader(path)
+    assert reader.ticks == TICKS
+    assert reader.fighters == 2
+    assert reader.header["names"] == ["Red", "Blue"]
+    assert [start for start, _, _ in reader.index] == [0, 20, 40, 60]
+    chunk = reader.chunk(3)
+    assert chunk.start == 60 and chunk.inputs.shape == (15, 2)
+    assert list(chunk.inputs[0]) == inputs(60)
+    assert reader.chunk(2).events == [[40, 1, 0, 10]]
+
+
+@pytest.mark.parametrize("tick", [0, 7, 19, 20, 21, 39, 40, 59, 60, 74, TICKS])
+def test_seek_matches_the_live_match(recording, tick):
+    path, states = recording
+    batch = ReplayReader(path).seek(tick)
+    live = states[tick]
+    assert batch.tick[0] == tick
+    np.testing.assert_array_equal(batch.x, live.x)
+    np.testing.assert_array_equal(batch.y, live.y)
+    np.testing.assert_array_equal(batch.health, live.health)
+
+
+def test_columns_cover_every_tick(recording):
+    path, states = recording
+    positions, damage = ReplayReader(path).columns(match=3)
+    assert len(positions["tick"]) == TICKS * 2
+    assert (positions["match"] == 3).all()
+    at = (positions["tick"] == 50) & (positions["fighter"] == 1)
+    assert positions["x"][at][0] == states[50].x[0, 1]
+    assert list(damage["amount"]) == [10] and list(damage["tick"]) == [40]
+
+
+def test_unclosed_replay_is_rejected(tmp_path):
+    path = str(tmp_path / "open.psr")
+    writer = ReplayWriter(path, snapshot(DuelBatch(1), 0))
+    writer.record([0, 0], None)
+    writer.file.flush()
+    with pytest.raises(ValueError):
+        ReplayReader(path)
+    writer.close()
@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+
+from pixel_samurai.roster import load_roster, ROSTER_FILE, ANIMATION_SPEEDS, BASE_POWER
+from pixel_samurai.settings import GAME_DIR
+
+PROJECTILES = {"normal": {"size": [20, 10], "color": [255, 200, 0], "trail": [255, 150, 0], "damage": 10},
+               "special": {"size": [30, 20], "color": [100, 100, 255, 100], "core": [1, 2, 3], "trail": [0, 0, 255],
+                           "damage": 15, "speed": 1.2}}
+
+
+def fighter(name, **extra):
+    return dict({"name": name, "health": 100, "speed": 6, "power": 8, "color": [255, 50, 50],
+                 "sprites": "assets/player1"}, **extra)
+
+
+def write(tmp_path, characters, projectiles=PROJECTILES):
+    path = tmp_path / "roster.json"
+    path.write_text(json.dumps({"projectiles": projectiles, "characters": characters}))
+    return str(path)
+
+
+def test_shipped_roster_loads():
+    characters, projectiles = load_roster(ROSTER_FILE)
+    assert len(characters) >= 2
+    for character in characters:
+        assert character.projectile in projectiles and character.special_projectile in projectiles
+
+
+def test_fields_and_defaults(tmp_path):
+    path = write(tmp_path, [fighter("Red"), fighter("Blue", power=4, animation_speed={"run": 0.5})])
+    (red, blue), projectiles = load_roster(path)
+    assert red.projectile == "normal" and red.special_projectile == "special"
+    assert red.animation_speed == ANIMATION_SPEEDS
+    assert blue.animation_speed["run"] == 0.5 and blue.animation_speed["idle"] == ANIMATION_SPEEDS["idle"]
+    assert blue.damage_scale == 4 / BASE_POWER
+    assert red.color == (255, 50, 50)
+    assert red.sprites == os.path.join(GAME_DIR, "assets", "player1")
+    assert projectiles["normal"].speed == 1.0 and projectiles["normal"].core is None
+    assert projectiles["special"].size == (30, 20) and projectiles["special"].core == (1, 2, 3)
+
+
+def test_unknown_projectile_is_rejected(tmp_path):
+    path = write(tmp_path, [fighter("Red"), fighter("Blue", projectile="boulder")])
+    with pytest.raises(ValueError, match="Blue fires unknown projectile 'boulder'"):
+        load_roster(path)
+
+
+def test_a_roster_needs_two_characters(tmp_path):
+    with pytest.raises(ValueError, match="at least two"):
+        load_roster(write(tmp_path, [fighter("Red")]))
+
+
+def test_unknown_field_is_rejected(tmp_path):
+    with pytest.raises(TypeError):
+        load_roster(write(tmp_path, [fighter("Red"), fighter("Blue", armour=3)]))
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pygame
+import pytest
+
+from pixel_samurai import scenes
+from pixel_samurai.scenes import Scene, SceneStack, BACK, IDLE_SECONDS, IDLE_FPS, WAIT_MS
+
+
+class Screen(Scene):
+    def __init__(self, state, **kinds):
+        self.state = state
+        vars(self).update(kinds)
+        self.draws = 0
+        self.entered = self.resumed = 0
+
+    def enter(self):
+        self.entered += 1
+
+    def resume(self):
+        self.resumed += 1
+
+    def draw(self, surface):
+        self.draws += 1
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """The scenes module's clock, and the timeouts it waited for events with"""
+    clock = SimpleNamespace(now=100.0, waits=[])
+    monkeypatch.setattr(scenes, "time", SimpleNamespace(perf_counter=lambda: clock.now))
+    monkeypatch.setattr(pygame.event, "wait", lambda timeout: clock.waits.append(timeout)
+                        or pygame.event.Event(pygame.NOEVENT))
+    monkeypatch.setattr(pygame.event, "get", lambda: [])
+    return clock
+
+
+def test_ambient_scenes_slow_down_once_idle(clock):
+    stack = SceneStack({"menu": Screen("menu", ambient=True)})
+    stack.show("menu")
+    stack.poll()  # Dirty from the show, no wait
+    stack.step([], None)
+    stack.poll()
+    clock.now += IDLE_SECONDS + 1
+    stack.poll()
+    assert clock.waits == [1000 // IDLE_FPS]
+    # Ambient scenes draw every frame all the same
+    stack.step([], None)
+    assert stack.top.draws == 2
+
+
+def test_still_scenes_wait_for_events_and_skip_drawing(clock):
+    still = Screen("options")
+    stack = SceneStack({"options": still})
+    stack.show("options")
+    assert stack.step(stack.poll(), None)
+    assert not stack.step(stack.poll(), None)
+    assert clock.waits == [WAIT_MS] and still.draws == 1 and stack.skipped == 1
+
+
+def test_live_scenes_never_wait(clock):
+    stack = SceneStack({"match": Screen("match", live=True)})
+    stack.show("match")
+    clock.now += IDLE_SECONDS + 1
+    for _ in range(3):
+        stack.step(stack.poll(), None)
+    assert clock.waits == [] and stack.top.draws == 3
+
+
+def test_overlays_push_and_back_resumes(clock):
+    match, pause, menu = Screen("match", live=True), Screen("pause", overlay=True), Screen("menu")
+    stack = SceneStack({"match": match, "pause": pause, "menu": menu})
+    stack.show("match")
+    stack.show("pause")
+    assert stack.stack == [match, pause]
+    stack.show(BACK)
+    assert stack.stack == [match] and match.resumed == 1
+    stack.show("pause")
+    stack.show("match")  # Already on the stack, returned to
+    assert stack.stack == [match] and match.entered == 1
+    stack.show("menu")
+    assert stack.stack == [menu]
@@ -0,0 +1,119 @@
+import numpy as np
+
+from pixel_samurai.settings import MAX_HEALTH, MAX_SPECIAL, CONTROL_ACTIONS
+from pixel_samurai.simulation import DuelBatch, ATTACK, SPECIAL, RIGHT, SPECIAL_PROJECTILE
+from pixel_samurai.training_env import VectorDuelEnv, actions_from_bits
+
+
+def idle(arenas, fighters=2):
+    return np.zeros((arenas, fighters, len(CONTROL_ACTIONS)), bool)
+
+
+def test_reset_mask_only_touches_selected_arenas():
+    batch = DuelBatch(3)
+    start_x = batch.x.copy()
+    for _ in range(10):
+        batch.step(idle(3))
+    batch.health[:] = 40
+    batch.reset([True, False, True])
+    assert (batch.health[[0, 2]] == MAX_HEALTH).all()
+    assert (batch.health[1] == 40).all()
+    assert (batch.x[[0, 2]] == start_x[[0, 2]]).all()
+    assert list(batch.tick) == [0, 10, 0]
+
+
+def test_step_moves_fighters_and_counts_ticks():
+    batch = DuelBatch(2)
+    actions = idle(2)
+    actions[0, 0, RIGHT] = True
+    start_x = batch.x.copy()
+    for _ in range(5):
+        batch.step(actions)
+    assert batch.x[0, 0] > start_x[0, 0]
+    assert batch.x[1, 0] == start_x[1, 0]
+    assert list(batch.tick) == [5, 5]
+
+
+def test_copy_is_independent():
+    batch = DuelBatch(1)
+    clone = batch.copy()
+    clone.health[:] = 1
+    clone.step(idle(1))
+    assert (batch.health == MAX_HEALTH).all()
+    assert batch.tick[0] == 0
+
+
+def test_shots_follow_each_fighters_loadout():
+    batch = DuelBatch(2)
+    batch.power[1, 0] = 1.25
+    batch.shot[1, 0] = (40, 16, 12, 10.0)
+    actions = idle(2)
+    actions[:, 0, ATTACK] = True
+    batch.step(actions)
+    default, custom = np.flatnonzero(batch.proj_active[0]), np.flatnonzero(batch.proj_active[1])
+    assert batch.proj_damage[0, default].tolist() == [10]
+    assert batch.proj_damage[1, custom].tolist() == [15]
+    assert batch.proj_w[1, custom].tolist() == [40] and batch.proj_speed[1, custom].tolist() == [10.0]
+
+    batch = DuelBatch(1)
+    batch.power[0, 0] = 1.2
+    batch.special_meter[0, 0] = MAX_SPECIAL
+    actions = idle(1)
+    actions[0, 0, SPECIAL] = True
+    batch.step(actions)
+    # Specials fire at 1.5 times the fighter's power, rounded like Projectile: int(style.damage * power)
+    assert batch.proj_damage[0, batch.proj_active[0]].tolist() == [int(SPECIAL_PROJECTILE[2] * (1.5 * 1.2))] * 3
+
+
+def test_finished_when_one_fighter_is_left():
+    batch = DuelBatch(2)
+    batch.health[0, 1] = 0
+    assert list(batch.finished()) == [True, False]
+
+
+def test_env_reset_shapes():
+    env = VectorDuelEnv(num_arenas=4)
+    obs = env.reset(seed=0)
+    assert obs.shape == (4, 2, env.observation_size)
+    assert obs.dtype == np.float32
+
+
+def test_env_auto_resets_knocked_out_arenas():
+    env = VectorDuelEnv(num_arenas=2)
+    env.reset(seed=1)
+    for _ in range(3):
+        env.step(np.zeros((2, 2), int))
+    env.batch.health[0, 1] = 0
+    obs, rewards, dones, info = env.step(np.zeros((2, 2), int))
+
+    assert list(dones) == [True, False]
+    assert info["winner"][0] == 0 and info["winner"][1] == -1
+    assert info["knocked_out"][0] and not info["truncated"][0]
+    assert info["episode_steps"][0] == 4
+    assert rewards[0, 0] >= 1 and rewards[0, 1] <= -1
+    # The finished arena starts over, the other one plays on
+    assert (env.batch.health[0] == MAX_HEALTH).all()
+    assert env.episode_steps[0] == 0 and env.episode_steps[1] == 4
+    assert env.batch.tick[0] == 0 and env.batch.tick[1] == 4
+    assert np.isfinite(obs).all()
+
+
+def test_env_truncates_at_max_steps():
+    env = VectorDuelEnv(num_arenas=3, max_steps=5)
+    env.reset(seed=2)
+    for _ in range(4):
+        _, _, dones, _ = env.step(np.zeros((3, 2), int))
+        assert not dones.any()
+    _, _, dones, info = env.step(np.zeros((3, 2), int))
+    assert dones.all() and info["truncated"].all()
+    assert (info["winner"] == -1).all()
+    assert (env.episode_steps == 0).all()
+
+
+def test_bitmask_actions_match_bool_actions():
+    every = (1 << len(CONTROL_ACTIONS)) - 1
+    actions = actions_from_bits(np.array([[0, 1 << RIGHT], [every, 0]]))
+    assert actions.shape == (2, 2, len(CONTROL_ACTIONS))
+    assert not actions[0, 0].any()
+    assert actions[0, 1, RIGHT] and actions[0, 1].sum() == 1
+    assert actions[1, 0].all()
@@ -0,0 +1,70 @@
+import pygame
+
+from pixel_samurai.entities import Projectile
+from pixel_samurai.fighter import Samurai
+from pixel_samurai.roster import load_roster, ANIMATIONS
+from pixel_samurai.settings import HEIGHT, PLATFORM_DATA
+from pixel_samurai.world import World
+
+CONTROLS = {'left': pygame.K_a, 'right': pygame.K_d, 'jump': pygame.K_w, 'attack': pygame.K_f, 'special': pygame.K_g}
+IDLE = {key: False for key in CONTROLS.values()}
+
+
+def frames():
+    images = [pygame.Surface((96, 96), pygame.SRCALPHA) for _ in range(4)]
+    for image in images:
+        image.fill((200, 50, 50), (20, 10, 56, 86))
+    return images
+
+
+def make_world(**services):
+    sprites = {animation: frames() for animation in ANIMATIONS}
+    characters, styles = load_roster()
+    world = World(lambda character: sprites, styles, **services)
+    world.build_stage(PLATFORM_DATA)
+    return world, characters
+
+
+def test_a_match_steps_without_a_window():
+    sounds = []
+    events = []
+    world, characters = make_world(sound=sounds.append, log=lambda kind, **fields: events.append((kind, fields)))
+    p1 = Samurai(world, 100, 600, CONTROLS, characters[0])
+    p2 = Samurai(world, 300, 600, CONTROLS, characters[1], is_ai=True)
+    world.fighters = [p1, p2]
+    world.all_sprites.add(p1, p2)
+    assert len(world.platforms) == len(PLATFORM_DATA) and world.nav_graph is not None
+
+    p1.handle_keys({**IDLE, CONTROLS['attack']: True})
+    shots = p1.projectiles.sprites()
+    assert len(shots) == 1 and shots[0] in world.all_sprites
+    assert shots[0].damage == int(world.projectile_styles[p1.projectile_type].damage * p1.power)
+    assert sounds == ["attack"] and events == [("attack", {"fighter": 0})]
+
+    p2.take_damage(10, hit_by=p1)
+    assert p2.health == p2.max_health - 10 and p1.hits_landed == 1
+    assert events[-1] == ("hit", {"fighter": 1, "attacker": 0, "damage": 10, "health": p2.health})
+
+    # The playing scene's tick, the AI decides in its update
+    for _ in range(30):
+        p1.handle_keys(IDLE)
+        for fighter in world.fighters:
+            fighter.apply_gravity()
+            fighter.handle_collision()
+        world.all_sprites.update(0)
+        for particle in world.particles:
+            particle.update()
+    # Both came to stand on the ground
+    assert all(abs(fighter.hurtbox().bottom - (HEIGHT - 30)) < 5 for fighter in world.fighters)
+
+
+def test_reset_empties_the_match_but_keeps_the_services():
+    world, characters = make_world()
+    fighter = Samurai(world, 100, 600, CONTROLS, characters[0])
+    world.all_sprites.add(Projectile(world, 0, 0, True, fighter))
+    world.create_particles(0, 0, 50)
+    assert world.particles
+    styles, effects = world.projectile_styles, world.effects
+    world.reset()
+    assert not world.all_sprites and not world.platforms and not world.particles
+    assert world.projectile_styles is styles and world.effects is effects